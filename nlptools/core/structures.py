@@ -1,4 +1,9 @@
 import re
+import threading
+from abc import ABCMeta
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 
 DEFAULT_SENTENCE_BOUNDARIES = [r'(?<=[0-9]|[^0-9.])(\.)(?=[^0-9.]|[^0-9.]|[\s]|$)(?![\n\r]+)',
                                r'\.{2,}', r'\!+', r'\:+', r'\?+', r'[\n\r]+']
@@ -15,22 +20,72 @@ class Document:
         The raw text string passed as input to be sentencized.
     sentences : list of Sentence
         The list of sentences after sentencizing.
+    lazy : boolean
+        Whether sentences are only found when first accessed and tokenized when their tokens are first accessed.
+    compact : boolean
+        Whether sentences store their tokens in a CompactTokens array storage.
 
     """
 
-    def __init__(self, document_text):
+    def __init__(self, document_text, lazy=False, compact=False, sentences=None):
         """
         Parameters
         ----------
         document_text : str
             Text to be sentencized. Initialization immediately sentencizes the input text based on the input parameters. The sentences are also immediately tokenized.
+        lazy : boolean, optional
+            Delays sentencizing until sentences are accessed, and tokenizing until each sentence tokens are accessed. Indexing or iterating only finds the sentences needed so far. Defaults to False.
+        compact : boolean, optional
+            Stores the tokens of each sentence in a CompactTokens array storage, which uses much less memory. Defaults to False.
+        sentences : list of Sentence, optional
+            The sentences of document_text, when they are already known. They are linked and used as they are, instead of sentencizing the text.
         """
 
+        if document_text is None or document_text == '':
+            raise AttributeError("Empty document string passed as input. Please, verify your input.")
         self.raw = document_text
-        self.sentences = sentencize(self.raw)
+        self.lazy = lazy
+        self.compact = compact
+        self._sentences = []
+        self._pending_spans = sentence_spans(self.raw)
+        if sentences is not None:
+            self._sentences = list(sentences)
+            self._pending_spans = None
+            _link(self._sentences, 'previous_sentence', 'next_sentence')
+        elif not lazy:
+            self._load_sentences()
         self._index = 0
 
+    @property
+    def sentences(self):
+        self._load_sentences()
+        return self._sentences
+
+    @sentences.setter
+    def sentences(self, sentences):
+        self._sentences = sentences
+        self._pending_spans = None
+
+    def _load_sentences(self, count=None):
+        """
+        Finds pending sentences until count sentences are available, or all of them if count is None. Only does work in lazy mode.
+        """
+        while self._pending_spans is not None and (count is None or len(self._sentences) < count):
+            span = next(self._pending_spans, None)
+            if span is None:
+                self._pending_spans = None
+                break
+            new_sentence = Sentence(span[0], span[1], self.raw, lazy=self.lazy, compact=self.compact)
+            if self._sentences:
+                previous = self._sentences[-1]
+                previous.next_sentence = new_sentence
+                new_sentence.previous_sentence = previous
+            self._sentences.append(new_sentence)
+
     def __getitem__(self, key):
+        if isinstance(key, int) and key >= 0:
+            self._load_sentences(key + 1)
+            return self._sentences[key]
         return self.sentences[key]
 
     def __repr__(self):
@@ -43,8 +98,9 @@ class Document:
         return self
 
     def __next__(self):
-        if self._index < len(self.sentences):
-            result = self.sentences[self._index]
+        self._load_sentences(self._index + 1)
+        if self._index < len(self._sentences):
+            result = self._sentences[self._index]
             self._index += 1
             return result
         raise StopIteration
@@ -52,6 +108,17 @@ class Document:
     def __len__(self):
         return len(self.sentences)
 
+    def __getstate__(self):
+        # Pending sentences are found before pickling, and the sentence links are restored on unpickling.
+        state = dict(self.__dict__)
+        state['_sentences'] = self.sentences
+        state['_pending_spans'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        _link(self._sentences, 'previous_sentence', 'next_sentence')
+
 
 class Sentence:
     """
@@ -66,8 +133,12 @@ class Sentence:
         A pointer to the previous Sentence in a linked list manner. Prepared for future navigation.
     next_sentence: Sentence or None
         A pointer to the next Sentence in a linked list manner. Prepared for future navigation.
-    tokens : list of Token
-        The list of Tokens after tokenizing.
+    tokens : list of Token or CompactTokens
+        The list of Tokens after tokenizing. Built on first access for lazy sentences.
+    lazy : boolean
+        Whether tokenization is delayed until tokens are first accessed.
+    compact : boolean
+        Whether tokens are stored in a CompactTokens array storage instead of a list of Token objects.
 
     Methods
     -------
@@ -76,7 +147,11 @@ class Sentence:
 
     """
 
-    def __init__(self, start_position, end_position, raw_document_reference):
+    __slots__ = ('start_pos', 'end_pos', '_document_string', '_reference_offset', 'next_sentence', 'previous_sentence',
+                 'lazy', 'compact', '_tokens', '_index')
+
+    def __init__(self, start_position, end_position, raw_document_reference, lazy=False, reference_offset=0,
+                 compact=False, tokens=None):
         """
         Parameters
         ----------
@@ -86,18 +161,46 @@ class Sentence:
             The ending position of the sentence in the raw Document. Includes punctuation position.
         raw_document_reference: string
             The raw document string where the sentence is localized.
+        lazy: boolean, optional
+            Delays tokenization until the tokens are first accessed. Defaults to False.
+        reference_offset: int, optional
+            Position of raw_document_reference in the whole document, when it only holds a part of it (e.g. when streaming). Defaults to 0.
+        compact: boolean, optional
+            Stores tokens in a CompactTokens array storage, which uses much less memory. Tokens are then created on access. Defaults to False.
+        tokens: list of Token, optional
+            The tokens of the sentence, when they are already known. They are used instead of tokenizing the sentence.
         """
 
         self.start_pos = int(start_position)
         self.end_pos = int(end_position)
         self._document_string = raw_document_reference
+        self._reference_offset = int(reference_offset)
         self.next_sentence = None
         self.previous_sentence = None
-        self.tokens = tokenize(self._document_string[self.start_pos:self.end_pos])
+        self.lazy = lazy
+        self.compact = compact
+        self._tokens = tokens
+        if tokens is None and not lazy:
+            self._tokens = self._tokenize()
         self._index = 0
 
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            self._tokens = self._tokenize()
+        return self._tokens
+
+    @tokens.setter
+    def tokens(self, tokens):
+        self._tokens = tokens
+
+    def _tokenize(self):
+        if self.compact:
+            return CompactTokens(self.get())
+        return tokenize(self.get())
+
     def get(self):
-        return self._document_string[self.start_pos:self.end_pos]
+        return self._document_string[self.start_pos - self._reference_offset:self.end_pos - self._reference_offset]
 
     def __getitem__(self, key):
         return self.tokens[key]
@@ -124,8 +227,160 @@ class Sentence:
     def __len__(self):
         return len(self.tokens)
 
+    def __getstate__(self):
+        # Sentence links are left out so long documents do not hit the recursion limit. Document restores them.
+        state = {slot: getattr(self, slot) for slot in self.__slots__}
+        state['next_sentence'] = None
+        state['previous_sentence'] = None
+        return state
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        if isinstance(self._tokens, list):
+            _link(self._tokens, 'previous_token', 'next_token')
+
+
+class DocumentStream:
+    """
+    The DocumentStream reads a document in chunks and yields its Sentences one at a time, so inputs larger than memory can be processed.
+    Partial sentences are carried across chunk boundaries. Sentence positions are absolute (in characters) in the whole input, but each Sentence only keeps its own text.
+    The stream can be iterated more than once if its source can be read more than once (e.g. a path).
+    Attributes
+    ----------
+    source : str, file object or iterable of str
+        A path to a text file, an open text file object or any iterable of text chunks.
+    chunk_size : int
+        Number of characters read at a time from paths and file objects.
+    sentence_boundaries : list of str
+        A list of regex used to delimit sentence boundaries, as in sentencize.
+    max_sentence_length : int
+        Longest piece of text kept waiting for a sentence boundary. Longer runs are yielded as a sentence, which keeps memory bounded.
+    lazy : boolean
+        Whether yielded sentences are only tokenized when their tokens are first accessed.
+    compact : boolean
+        Whether yielded sentences store their tokens in a CompactTokens array storage.
+    """
+
+    _lookahead = 16
+
+    def __init__(self, source, chunk_size=65536, sentence_boundaries=DEFAULT_SENTENCE_BOUNDARIES, encoding='utf-8',
+                 max_sentence_length=1000000, lazy=True, compact=False):
+        """
+        Parameters
+        ----------
+        source : str, file object or iterable of str
+            A path to a text file, an open text file object or any iterable of text chunks.
+        chunk_size : int, optional
+            Number of characters read at a time from paths and file objects. Defaults to 65536.
+        sentence_boundaries : list of str, optional
+            A list of regex used to delimit sentence boundaries. Defaults to DEFAULT_SENTENCE_BOUNDARIES.
+        encoding : str, optional
+            Encoding used when source is a path. Defaults to utf-8.
+        max_sentence_length : int, optional
+            Longest piece of text kept waiting for a sentence boundary. Defaults to 1000000 characters.
+        lazy : boolean, optional
+            Delays tokenization of yielded sentences until their tokens are accessed. Defaults to True.
+        compact : boolean, optional
+            Stores the tokens of yielded sentences in a CompactTokens array storage. Defaults to False.
+        """
+
+        self.source = source
+        self.chunk_size = chunk_size
+        self.sentence_boundaries = sentence_boundaries
+        self.encoding = encoding
+        self.max_sentence_length = max_sentence_length
+        self.lazy = lazy
+        self.compact = compact
+
+    def __iter__(self):
+        return self._generate_sentences()
+
+    def _read_chunks(self):
+        if isinstance(self.source, str):
+            # newline='' keeps line endings untouched, so positions match the text in the file.
+            with open(self.source, 'r', encoding=self.encoding, newline='') as f:
+                yield from self._read_file(f)
+        elif hasattr(self.source, 'read'):
+            yield from self._read_file(self.source)
+        else:
+            for chunk in self.source:
+                if chunk:
+                    yield chunk
+
+    def _read_file(self, file_object):
+        chunk = file_object.read(self.chunk_size)
+        while chunk:
+            yield chunk
+            chunk = file_object.read(self.chunk_size)
+
+    def _generate_sentences(self):
+        # The buffer holds the pending text plus a little already consumed text, which boundary lookbehinds may need.
+        buffer = ''
+        buffer_offset = 0
+        sentence_start = 0
+        scan_from = 0
+        for chunk in self._read_chunks():
+            buffer += chunk
+            # Boundaries close to the end of the buffer may still change with the next chunk.
+            safe_end = len(buffer) - self._lookahead
+            next_scan = max(scan_from, safe_end)
+            for boundary_start, boundary_end in _boundary_spans(buffer, self.sentence_boundaries, scan_from):
+                if boundary_end > safe_end:
+                    next_scan = max(sentence_start, min(boundary_start, safe_end))
+                    break
+                yield from self._emit(buffer, buffer_offset, sentence_start, boundary_end)
+                sentence_start = boundary_end
+                next_scan = max(boundary_end, safe_end)
+            scan_from = next_scan
+            if scan_from - sentence_start > self.max_sentence_length:
+                yield from self._emit(buffer, buffer_offset, sentence_start, scan_from)
+                sentence_start = scan_from
+            keep_from = max(0, sentence_start - self._lookahead)
+            buffer = buffer[keep_from:]
+            buffer_offset += keep_from
+            sentence_start -= keep_from
+            scan_from -= keep_from
+        for boundary_start, boundary_end in _boundary_spans(buffer, self.sentence_boundaries, scan_from):
+            yield from self._emit(buffer, buffer_offset, sentence_start, boundary_end)
+            sentence_start = boundary_end
+        yield from self._emit(buffer, buffer_offset, sentence_start, len(buffer))
+
+    def _emit(self, buffer, buffer_offset, start, end):
+        span = _strip_span(buffer, start, end)
+        if span is not None:
+            start_pos = buffer_offset + span[0]
+            end_pos = buffer_offset + span[1]
+            yield Sentence(start_pos, end_pos, buffer[span[0]:span[1]], lazy=self.lazy, reference_offset=start_pos,
+                           compact=self.compact)
+
 
-class Token:
+class _TokenBase:
+    """
+    The methods shared by Token and TokenView. It has no storage, so each kind of token only stores its own attributes.
+    """
+
+    __slots__ = ()
+
+    def get(self):
+        if self.SOS:
+            return '<SOS>'
+        elif self.EOS:
+            return '<EOS>'
+        else:
+            return self.repr
+
+    def __repr__(self):
+        return self.get()
+
+    def __str__(self):
+        return self.get()
+
+    def __eq__(self, other):
+        return self.get() == other
+
+
+class Token(_TokenBase, metaclass=ABCMeta):
     """
     Tokens are divisions of a Sentence. They are usually separated by whitespaces. Punctuations are also tokens.
     Attributes
@@ -144,12 +399,23 @@ class Token:
         Is the Token the end of a Sentence?
     PoS: string or None
         The token predicted Part of Speech.
+    lemma: string or None
+        The token lemma, once lemmatized.
+    stem: string or None
+        The token stem, once stemmed.
+    raw: str
+        The Token text in the Sentence. Setting it keeps the current representation.
+    repr: str
+        The Token representation. Defaults to raw, but may be changed (e.g. by normalization).
     Methods
     -------
     get: str
         Returns the string representation of the Token.
     """
 
+    __slots__ = ('start_pos', 'end_pos', '_sentence_string', 'next_token', 'previous_token', 'SOS', 'EOS', 'PoS',
+                 'lemma', 'stem', '_repr', '_raw')
+
     def __init__(self, start_position, end_position, raw_sentence_reference, SOS=False, EOS=False):
         """
         Parameters
@@ -174,25 +440,405 @@ class Token:
         self.SOS = SOS
         self.EOS = EOS
         self.PoS = None
-        self.raw = self._sentence_string[self.start_pos:self.end_pos]
-        self.repr = self.raw
+        self.lemma = None
+        self.stem = None
+        self._repr = None
+        self._raw = None
 
-    def get(self):
-        if self.SOS:
-            return '<SOS>'
-        elif self.EOS:
-            return '<EOS>'
-        else:
-            return self.repr
+    @property
+    def raw(self):
+        if self._raw is None:
+            return self._sentence_string[self.start_pos:self.end_pos]
+        return self._raw
+
+    @raw.setter
+    def raw(self, raw):
+        # The representation was a copy of raw taken at creation, so it stays the same.
+        if self._repr is None:
+            self._repr = self.raw
+        self._raw = raw
+
+    @property
+    def repr(self):
+        if self._repr is None:
+            return self.raw
+        return self._repr
+
+    @repr.setter
+    def repr(self, representation):
+        self._repr = representation
+
+    def __getstate__(self):
+        # Token links are left out so long sentences do not hit the recursion limit. Sentence restores them.
+        return (self.start_pos, self.end_pos, self._sentence_string, self.SOS, self.EOS, self.PoS, self.lemma,
+                self.stem, self._repr, self._raw)
+
+    def __setstate__(self, state):
+        (self.start_pos, self.end_pos, self._sentence_string, self.SOS, self.EOS, self.PoS, self.lemma, self.stem,
+         self._repr, self._raw) = state
+        self.next_token = None
+        self.previous_token = None
+
+
+class Alignment:
+    """
+    Maps spans of a normalized text back to the spans of the original text they were normalized from. It is a table of segments, each pairing
+    the span of a token in the normalized text with the span of the original text it comes from. Segments are kept in integer arrays, sorted
+    and without overlaps in the normalized text. Iterating gives the (start, end, original_start, original_end) of each segment.
+    Attributes
+    ----------
+    starts: array of int
+        The starting position of each segment in the normalized text.
+    ends: array of int
+        The ending position of each segment in the normalized text.
+    original_starts: array of int
+        The starting position of each segment in the original text.
+    original_ends: array of int
+        The ending position of each segment in the original text.
+    """
+
+    __slots__ = ('starts', 'ends', 'original_starts', 'original_ends')
+
+    def __init__(self, starts=(), ends=(), original_starts=(), original_ends=()):
+        """
+        Parameters
+        ----------
+        starts, ends, original_starts, original_ends: iterable of int, optional
+            The positions of the initial segments, see the attributes. Defaults to no segments.
+        """
+        self.starts = array('l', starts)
+        self.ends = array('l', ends)
+        self.original_starts = array('l', original_starts)
+        self.original_ends = array('l', original_ends)
+        if not len(self.starts) == len(self.ends) == len(self.original_starts) == len(self.original_ends):
+            raise AttributeError("Alignment positions of different lengths passed as input. Please, verify your input.")
+
+    def append(self, start, end, original_start, original_end):
+        """
+        Adds a segment. Segments must be added in order and must not be empty in the normalized text.
+        """
+        if end <= start or (len(self.ends) > 0 and start < self.ends[-1]):
+            raise AttributeError("Alignment segments must be non-empty and added in order. Please, verify your input.")
+        self.starts.append(start)
+        self.ends.append(end)
+        self.original_starts.append(original_start)
+        self.original_ends.append(original_end)
+
+    def to_original(self, start, end=None):
+        """
+        Maps a span of the normalized text to the span of the original text it comes from, from the first to the last segment it overlaps.
+        Inside segments that kept their length (e.g. unchanged tokens), positions are mapped exactly, otherwise to the bounds of the segment.
+        Returns a (start, end) tuple, or None if the span overlaps no segment (e.g. it only covers spaces).
+        Parameters
+        ----------
+        start: int
+            The starting position of the span in the normalized text.
+        end: int, optional
+            The ending position of the span in the normalized text. Defaults to start + 1, a single character.
+        """
+        if end is None:
+            end = start + 1
+        first = bisect_right(self.ends, start)
+        last = bisect_left(self.starts, end) - 1
+        if first > last:
+            return None
+        original_start = self.original_starts[first]
+        if start > self.starts[first] and self._kept_length(first):
+            original_start += start - self.starts[first]
+        original_end = self.original_ends[last]
+        if end < self.ends[last] and self._kept_length(last):
+            original_end -= self.ends[last] - end
+        return original_start, original_end
+
+    def _kept_length(self, index):
+        return self.ends[index] - self.starts[index] == self.original_ends[index] - self.original_starts[index]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        return self.starts[index], self.ends[index], self.original_starts[index], self.original_ends[index]
+
+    def __iter__(self):
+        return zip(self.starts, self.ends, self.original_starts, self.original_ends)
 
     def __repr__(self):
-        return self.get()
+        return "Alignment({})".format(list(self))
 
-    def __str__(self):
-        return self.get()
 
-    def __eq__(self, other):
-        return self.get() == other
+class CompactTokens:
+    """
+    Array-backed storage for the Tokens of a Sentence. Positions are kept in integer arrays and Parts of Speech in an array of interned tag ids, while
+    the SOS and EOS tokens are implicit. Tokens are only created when accessed, as TokenView objects that read and write through to the arrays.
+    It can be indexed, sliced and iterated like a list of Tokens.
+    Attributes
+    ----------
+    starts: array of int
+        The starting position of each (non SOS/EOS) Token in the Sentence.
+    ends: array of int
+        The ending position of each (non SOS/EOS) Token in the Sentence.
+    tags: array of int
+        The interned Part of Speech id of each Token, SOS and EOS included. 0 means no Part of Speech.
+    """
+
+    __slots__ = ('_sentence_string', 'starts', 'ends', 'tags', '_reprs', '_lemmas', '_stems')
+
+    def __init__(self, raw_input_sentence, **tokenize_arguments):
+        """
+        Parameters
+        ----------
+        raw_input_sentence : str
+            The Sentence string to be tokenized.
+        tokenize_arguments : optional
+            Same keyword arguments as token_spans.
+        """
+
+        if raw_input_sentence is None or raw_input_sentence == '':
+            raise AttributeError("Empty sentence string passed as input. Please, verify your input.")
+        self._sentence_string = raw_input_sentence
+        spans = list(token_spans(raw_input_sentence, **tokenize_arguments))
+        self.starts = array('i', [start_pos for start_pos, end_pos in spans])
+        self.ends = array('i', [end_pos for start_pos, end_pos in spans])
+        self.tags = array('H', bytes(2 * len(self)))
+        # Only changed representations are stored, keyed by token position.
+        self._reprs = None
+        self._lemmas = None
+        self._stems = None
+        if tokenize_arguments.get('join_split_text', True):
+            glue = _compile_glue(tokenize_arguments.get('split_text_char', r'\-'))
+            for index, (start_pos, end_pos) in enumerate(spans):
+                raw = raw_input_sentence[start_pos:end_pos]
+                if '\n' in raw and glue.search(raw):
+                    self.set_repr(index + 1, glue.sub('', raw))
+
+    def get_repr(self, index):
+        if self._reprs is not None and index in self._reprs:
+            return self._reprs[index]
+        return self.get_raw(index)
+
+    def set_repr(self, index, representation):
+        if self._reprs is None:
+            self._reprs = {}
+        self._reprs[index] = representation
+
+    def get_raw(self, index):
+        if index == 0 or index > len(self.starts):
+            return ''
+        return self._sentence_string[self.starts[index - 1]:self.ends[index - 1]]
+
+    def get_lemma(self, index):
+        if self._lemmas is None:
+            return None
+        return self._lemmas[index]
+
+    def set_lemma(self, index, lemma):
+        if self._lemmas is None:
+            self._lemmas = [None] * len(self)
+        self._lemmas[index] = lemma
+
+    def get_stem(self, index):
+        if self._stems is None:
+            return None
+        return self._stems[index]
+
+    def set_stem(self, index, stem):
+        if self._stems is None:
+            self._stems = [None] * len(self)
+        self._stems[index] = stem
+
+    def get_tag(self, index):
+        return _TAGS[self.tags[index]]
+
+    def set_tag(self, index, tag):
+        self.tags[index] = _intern_tag(tag)
+
+    def __len__(self):
+        if len(self.starts) == 0:
+            return 1
+        return len(self.starts) + 2
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [TokenView(self, index) for index in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("Token index out of range.")
+        return TokenView(self, key)
+
+    def __setitem__(self, key, token):
+        if key < 0:
+            key += len(self)
+        self.set_tag(key, token.PoS)
+        if token.lemma is not None or self._lemmas is not None:
+            self.set_lemma(key, token.lemma)
+        if token.stem is not None or self._stems is not None:
+            self.set_stem(key, token.stem)
+        if token.repr != self.get_raw(key):
+            self.set_repr(key, token.repr)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield TokenView(self, index)
+
+    def __getstate__(self):
+        # Tag ids are only valid in the current process, so tags are pickled by name.
+        tags = [_TAGS[tag_id] for tag_id in self.tags]
+        return self._sentence_string, self.starts, self.ends, tags, self._reprs, self._lemmas, self._stems
+
+    def __setstate__(self, state):
+        self._sentence_string, self.starts, self.ends, tags, self._reprs, self._lemmas, self._stems = state
+        self.tags = array('H', [_intern_tag(tag) for tag in tags])
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class TokenView(_TokenBase):
+    """
+    A lightweight Token backed by a CompactTokens storage. It only stores its storage and position, and is registered as a virtual subclass of
+    Token, which it behaves like. Changes to its PoS, lemma, stem or repr are written to the storage.
+    Tokens are linked by their position in the storage, so previous_token and next_token cannot point anywhere else: setting them to the
+    Token already there is allowed (e.g. when relinking a whole list), other values raise an AttributeError. To insert or remove tokens,
+    copy the tokens of the sentence into a list of Token objects first.
+    """
+
+    __slots__ = ('_tokens', '_index')
+
+    def __init__(self, compact_tokens, index):
+        self._tokens = compact_tokens
+        self._index = index
+
+    @property
+    def start_pos(self):
+        if self.SOS:
+            return 0
+        if self.EOS:
+            return len(self._tokens._sentence_string)
+        return self._tokens.starts[self._index - 1]
+
+    @property
+    def end_pos(self):
+        if self.SOS:
+            return 0
+        if self.EOS:
+            return len(self._tokens._sentence_string)
+        return self._tokens.ends[self._index - 1]
+
+    @property
+    def _sentence_string(self):
+        return self._tokens._sentence_string
+
+    @property
+    def SOS(self):
+        return self._index == 0
+
+    @property
+    def EOS(self):
+        return self._index == len(self._tokens.starts) + 1
+
+    @property
+    def PoS(self):
+        return self._tokens.get_tag(self._index)
+
+    @PoS.setter
+    def PoS(self, tag):
+        self._tokens.set_tag(self._index, tag)
+
+    @property
+    def lemma(self):
+        return self._tokens.get_lemma(self._index)
+
+    @lemma.setter
+    def lemma(self, lemma):
+        self._tokens.set_lemma(self._index, lemma)
+
+    @property
+    def stem(self):
+        return self._tokens.get_stem(self._index)
+
+    @stem.setter
+    def stem(self, stem):
+        self._tokens.set_stem(self._index, stem)
+
+    @property
+    def raw(self):
+        return self._tokens.get_raw(self._index)
+
+    @property
+    def repr(self):
+        return self._tokens.get_repr(self._index)
+
+    @repr.setter
+    def repr(self, representation):
+        self._tokens.set_repr(self._index, representation)
+
+    @property
+    def previous_token(self):
+        if self._index == 0:
+            return None
+        return TokenView(self._tokens, self._index - 1)
+
+    @previous_token.setter
+    def previous_token(self, token):
+        self._check_link(token, self._index - 1)
+
+    @property
+    def next_token(self):
+        if self._index == len(self._tokens) - 1:
+            return None
+        return TokenView(self._tokens, self._index + 1)
+
+    @next_token.setter
+    def next_token(self, token):
+        self._check_link(token, self._index + 1)
+
+    def _check_link(self, token, index):
+        if token is None and not 0 <= index < len(self._tokens):
+            return
+        if isinstance(token, TokenView) and token._tokens is self._tokens and token._index == index:
+            return
+        raise AttributeError("Tokens of a CompactTokens storage are linked by position and cannot be relinked. "
+                             "Please, copy the tokens into a list of Token objects to change them.")
+
+    def __reduce__(self):
+        return TokenView, (self._tokens, self._index)
+
+
+Token.register(TokenView)
+
+
+def _link(items, previous_attribute, next_attribute):
+    """
+    Links a list of Sentences or Tokens in a linked list manner.
+    """
+    previous = None
+    for item in items:
+        setattr(item, previous_attribute, previous)
+        setattr(item, next_attribute, None)
+        if previous is not None:
+            setattr(previous, next_attribute, item)
+        previous = item
+
+
+_TAGS = [None]
+_TAG_IDS = {None: 0}
+_TAG_LOCK = threading.Lock()
+
+
+def _intern_tag(tag):
+    """
+    Returns the id of a Part of Speech tag, registering it if it is new. Ids are shared by every CompactTokens.
+    """
+    tag_id = _TAG_IDS.get(tag)
+    if tag_id is None:
+        with _TAG_LOCK:
+            tag_id = _TAG_IDS.get(tag)
+            if tag_id is None:
+                tag_id = len(_TAGS)
+                _TAGS.append(tag)
+                _TAG_IDS[tag] = tag_id
+    return tag_id
 
 
 ## Static Functions
@@ -208,22 +854,15 @@ def sentencize(raw_input_document, sentence_boundaries=DEFAULT_SENTENCE_BOUNDARI
             A list of regex used to delimit sentence boundaries. Default regex includes correct period splitting, reticences, exclamation mark, question mark and colons.
             The default can be accessed by the global variable DEFAULT_SENTENCE_BOUNDARIES.
         delimiter_token: str, optional
-            The token used for document segmentation. Usually an "agnostic" token. Defaults to <SPLIT>.
+            Kept for backwards compatibility. The sentencizer no longer rewrites the document, so no delimiter is needed.
     Returns:
         list of Sentence: a list of sentences generated from raw_input_document.
     """
     if raw_input_document is None or raw_input_document == '':
         raise AttributeError("Empty document string passed as input. Please, verify your input.")
-    working_document = raw_input_document
-    punctuation_patterns = sentence_boundaries
-    for punct in punctuation_patterns:
-        working_document = re.sub(punct, r'\g<0>' + delimiter_token, working_document, flags=re.UNICODE)
-    list_of_string_sentences = [x.strip(" ") for x in working_document.split(delimiter_token) if x.strip(" ") != ""]
     list_of_sentences = []
     previous = None
-    for sent in list_of_string_sentences:
-        start_pos = raw_input_document.find(sent)
-        end_pos = start_pos + len(sent)
+    for start_pos, end_pos in sentence_spans(raw_input_document, sentence_boundaries):
         new_sentence = Sentence(start_pos, end_pos, raw_input_document)
         list_of_sentences.append(new_sentence)
         if previous == None:
@@ -235,6 +874,60 @@ def sentencize(raw_input_document, sentence_boundaries=DEFAULT_SENTENCE_BOUNDARI
     return list_of_sentences
 
 
+def sentence_spans(raw_input_document, sentence_boundaries=DEFAULT_SENTENCE_BOUNDARIES):
+    """
+    Scans a string once and yields the (start, end) position of each sentence, without creating Sentence objects.
+    The boundary patterns are compiled into a single scanner. Sentences include their boundary and are stripped of surrounding spaces.
+    Arguments are the same as in sentencize.
+
+    Yields:
+        tuple of int: the start and end position of each sentence in raw_input_document.
+    """
+    sentence_start = 0
+    for boundary_start, boundary_end in _boundary_spans(raw_input_document, sentence_boundaries):
+        span = _strip_span(raw_input_document, sentence_start, boundary_end)
+        if span is not None:
+            yield span
+        sentence_start = boundary_end
+    span = _strip_span(raw_input_document, sentence_start, len(raw_input_document))
+    if span is not None:
+        yield span
+
+
+def _boundary_spans(text, sentence_boundaries, start=0):
+    """
+    Yields the (start, end) position of every sentence boundary found in text, starting the scan at start.
+    """
+    scanner = _compile_boundary_scanner(tuple(sentence_boundaries))
+    for match in scanner.finditer(text, start):
+        if match.start() != match.end():
+            yield match.span()
+
+
+@lru_cache(maxsize=32)
+def _compile_boundary_scanner(sentence_boundaries):
+    """
+    Builds the single-pass scanner used by sentence_spans. With the default boundaries, a leading check on the boundary characters lets the scanner skip plain text quickly.
+    """
+    pattern = '|'.join('(?:' + boundary + ')' for boundary in sentence_boundaries)
+    if sentence_boundaries == tuple(DEFAULT_SENTENCE_BOUNDARIES):
+        pattern = r'(?=[.!:?\r\n])(?:' + pattern + ')'
+    return re.compile(pattern, flags=re.UNICODE)
+
+
+def _strip_span(text, start, end):
+    """
+    Shrinks a span so it does not start or end with spaces. Returns None if nothing is left.
+    """
+    while start < end and text[start] == ' ':
+        start += 1
+    while end > start and text[end - 1] == ' ':
+        end -= 1
+    if start == end:
+        return None
+    return start, end
+
+
 def tokenize(raw_input_sentence, join_split_text=True, split_text_char=r'\-',
              punctuation_patterns=DEFAULT_PUNCTUATIONS, split_characters=r'[ \t]+', delimiter_token='<SPLIT>'):
     """
@@ -245,6 +938,7 @@ def tokenize(raw_input_sentence, join_split_text=True, split_text_char=r'\-',
             The raw input Sentence in a string format.
         join_split_text: boolean, optional
             Whether to try to join multi-line text splits, like in the case of "sen-\ntence". Defaults to True.
+            Joined tokens span the whole split in the raw sentence, while their representation has the split removed.
         split_text_char: str, optional
             The split char used for checking and joining split strings. Defaults to hyphen.
         punctuation_patterns: list of str, optional
@@ -254,29 +948,21 @@ def tokenize(raw_input_sentence, join_split_text=True, split_text_char=r'\-',
             A string with regex for split characters. These are used to do tokenization after the sentence is preprocessed.
             Defaults to any whitespace (\s), any tab char (\t), newlines (\n) and carriage returns (\r).
         delimiter_token: str, optional
-            The token used for sentence segmentation. Usually a 'agnostic' token. Defaults to <SPLIT>.
+            Kept for backwards compatibility. The tokenizer no longer rewrites the sentence, so no delimiter is needed.
 
     Returns:
         list of Token: a list of tokens generated from raw_input_sentence, added by a starting SOS token and an ending EOS token.
     """
     if raw_input_sentence is None or raw_input_sentence == '':
         raise AttributeError("Empty sentence string passed as input. Please, verify your input.")
-    working_sentence = raw_input_sentence
-    # First deal with possible word splits:
-    if join_split_text:
-        working_sentence = re.sub(r'[a-z]+(' + split_text_char + r'[\n])[a-z]+', '', working_sentence)
-    # Escape punctuation
-    for punct in punctuation_patterns:
-        working_sentence = re.sub(punct, r" \g<0> ", working_sentence)
-    # Split at any split_characters
-    working_sentence = re.sub(split_characters, delimiter_token, working_sentence)
-    list_of_token_strings = [x.strip(" ") for x in working_sentence.split(delimiter_token) if x.strip(" ") != ""]
+    spans = token_spans(raw_input_sentence, join_split_text, split_text_char, punctuation_patterns, split_characters)
+    glue = _compile_glue(split_text_char) if join_split_text else None
     previous = Token(0, 0, raw_input_sentence, SOS=True)
     list_of_tokens = [previous]
-    for token in list_of_token_strings:
-        start_pos = raw_input_sentence.find(token)
-        end_pos = start_pos + len(token)
+    for start_pos, end_pos in spans:
         new_token = Token(start_pos, end_pos, raw_input_sentence)
+        if glue is not None and '\n' in new_token.raw and glue.search(new_token.raw):
+            new_token.repr = glue.sub('', new_token.raw)
         list_of_tokens.append(new_token)
         previous.next_token = new_token
         new_token.previous_token = previous
@@ -289,6 +975,57 @@ def tokenize(raw_input_sentence, join_split_text=True, split_text_char=r'\-',
     return list_of_tokens
 
 
+def token_spans(raw_input_sentence, join_split_text=True, split_text_char=r'\-',
+                punctuation_patterns=DEFAULT_PUNCTUATIONS, split_characters=r'[ \t]+'):
+    """
+    Scans a string once and yields the (start, end) position of each token, without creating Token objects.
+    Every punctuation pattern and the split characters are compiled into a single scanner, so the string is walked only once.
+    Arguments are the same as in tokenize.
+
+    Yields:
+        tuple of int: the start and end position of each token in raw_input_sentence.
+    """
+    scanner = _compile_token_scanner(tuple(punctuation_patterns), split_characters, join_split_text, split_text_char)
+    word_start = 0
+    for match in scanner.finditer(raw_input_sentence):
+        match_start, match_end = match.span()
+        # Word runs and split joins are part of the pending word, so it keeps going.
+        if match_start == match_end or match.lastgroup in ('word', 'join'):
+            continue
+        if match_start > word_start:
+            yield word_start, match_start
+        if match.lastgroup == 'punct':
+            yield match_start, match_end
+        word_start = match_end
+    if word_start < len(raw_input_sentence):
+        yield word_start, len(raw_input_sentence)
+
+
+@lru_cache(maxsize=32)
+def _compile_token_scanner(punctuation_patterns, split_characters, join_split_text, split_text_char):
+    """
+    Builds the single-pass scanner used by token_spans. Alternatives are tried in order: word splits, punctuations and split characters.
+    With the default patterns, runs of plain word characters are also matched at once instead of char by char.
+    """
+    alternatives = []
+    if join_split_text:
+        alternatives.append('(?P<join>' + _glue_pattern(split_text_char) + ')')
+    alternatives.append('(?P<punct>' + '|'.join('(?:' + punct + ')' for punct in punctuation_patterns) + ')')
+    alternatives.append('(?P<split>' + split_characters + ')')
+    if punctuation_patterns == tuple(DEFAULT_PUNCTUATIONS) and split_characters == r'[ \t]+':
+        alternatives.append(r'(?P<word>[^.!:?,()\[\]{}<>\r\n \t\-]+)')
+    return re.compile('|'.join(alternatives), flags=re.UNICODE)
+
+
+@lru_cache(maxsize=8)
+def _compile_glue(split_text_char):
+    return re.compile(_glue_pattern(split_text_char))
+
+
+def _glue_pattern(split_text_char):
+    return r'(?<=[a-z])' + split_text_char + r'[\n](?=[a-z])'
+
+
 def untokenize(token_list):
     """
     Untokenizes a token list, turning it back to a string. Deals with SOS and EOS tokens, plus helps with correct punctuation addition.
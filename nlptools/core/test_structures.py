@@ -1,7 +1,13 @@
+import io
+import os
+import pickle
+
 import pytest
 from pytest import raises
 
-from .structures import Document, sentencize, tokenize, untokenize
+from .structures import Alignment, Document, DocumentStream, CompactTokens, Sentence, Token, sentencize, tokenize, untokenize, token_spans, sentence_spans
+
+test_case_folder = os.path.join(os.path.dirname(__file__), "../test_cases/")
 
 def test_Document_Token_Sentence():
     """
@@ -38,6 +44,16 @@ def test_sentencize():
     text = 'The number of pi is usually summarized to 3.14 for the sake of simplicity. The greek letter pi was adopted by William Jones in 1706. Nice, right? All human beings are born free and equal in dignity and rights. .15 ... okay. All human beings are born free and equal in dignity and rights. ok . a'
     assert len(sentencize(text)) == 9
 
+def test_sentencize_repeated_sentences_offsets():
+    text = 'Hi there. Hi there. Hi there.'
+    sentences = sentencize(text)
+    assert [sentence.start_pos for sentence in sentences] == [0, 10, 20]
+    assert [sentence.end_pos for sentence in sentences] == [9, 19, 29]
+
+def test_sentence_spans():
+    text = 'Nice, right?  Yes... ok'
+    assert list(sentence_spans(text)) == [(0, 12), (14, 20), (21, 23)]
+
 def test_sentencize_empty():
     raises(AttributeError, sentencize, '')
 
@@ -54,6 +70,23 @@ def test_tokenize():
     assert tokens[4].previous_token == tokens[3]
     assert tokens[-2]=='.'
 
+def test_tokenize_repeated_words_offsets():
+    sentence = 'the cat saw the other cat.'
+    tokens = tokenize(sentence)
+    assert [token.start_pos for token in tokens[1:-1]] == [0, 4, 8, 12, 16, 22, 25]
+    for token in tokens[1:-1]:
+        assert sentence[token.start_pos:token.end_pos] == token.raw
+
+def test_tokenize_join_split_text():
+    tokens = tokenize('a long sen-\ntence')
+    assert tokens[3] == 'sentence'
+    assert tokens[3].raw == 'sen-\ntence'
+    assert len(tokenize('a long sen-\ntence', join_split_text=False)) == 7
+
+def test_token_spans():
+    sentence = 'Nice, right?'
+    assert list(token_spans(sentence)) == [(0, 4), (4, 5), (6, 11), (11, 12)]
+
 def test_tokenize_empty():
     raises(AttributeError, tokenize, '')
 
@@ -70,3 +103,114 @@ def test_emtpy_token_list_untokenize():
 def test_wrong_input_untokenize():
     case = 1
     raises(TypeError, untokenize, case)
+
+def test_lazy_document():
+    text = 'The number of pi is usually summarized to 3.14 for the sake of simplicity. The greek letter pi was adopted by William Jones in 1706. Nice, right?'
+    document = Document(text, lazy=True)
+    assert document[0] == 'The number of pi is usually summarized to 3.14 for the sake of simplicity.'
+    assert len(document._sentences) == 1
+    assert document[0]._tokens is None
+    assert len(document[0].tokens) == 17
+    assert len(document) == 3
+    assert document.sentences[0].next_sentence == document.sentences[1]
+    eager = Document(text)
+    for lazy_sentence, eager_sentence in zip(document, eager):
+        assert lazy_sentence.start_pos == eager_sentence.start_pos
+        assert [token.get() for token in lazy_sentence.tokens] == [token.get() for token in eager_sentence.tokens]
+
+def test_lazy_document_empty():
+    raises(AttributeError, Document, '', lazy=True)
+
+def test_document_stream():
+    text = open(test_case_folder + "test_normalize_document_file.txt", newline='').read()
+    expected = [(sentence.start_pos, sentence.end_pos, sentence.get()) for sentence in sentencize(text)]
+    from_path = [(sentence.start_pos, sentence.end_pos, sentence.get()) for sentence in
+                 DocumentStream(test_case_folder + "test_normalize_document_file.txt", chunk_size=7)]
+    assert from_path == expected
+    chunks = [text[i:i + 3] for i in range(0, len(text), 3)]
+    from_chunks = [(sentence.start_pos, sentence.end_pos, sentence.get()) for sentence in DocumentStream(chunks)]
+    assert from_chunks == expected
+    stream = DocumentStream(io.StringIO(text), chunk_size=5)
+    first = next(iter(stream))
+    assert first.tokens[1] == '@Reuters'
+
+def test_document_stream_max_sentence_length():
+    sentences = list(DocumentStream(['word ' * 10] * 10, max_sentence_length=40))
+    assert len(sentences) > 1
+    assert "".join(sentence.get() for sentence in sentences).replace(" ", "") == "word" * 100
+
+def test_compact_tokens():
+    text = 'The number of pi is usually summarized to 3.14 for the sake of simplicity. Nice, right?'
+    compact = Document(text, compact=True)
+    regular = Document(text)
+    for compact_sentence, regular_sentence in zip(compact, regular):
+        assert isinstance(compact_sentence.tokens, CompactTokens)
+        assert len(compact_sentence.tokens) == len(regular_sentence.tokens)
+        for compact_token, regular_token in zip(compact_sentence.tokens, regular_sentence.tokens):
+            assert isinstance(compact_token, Token)
+            assert compact_token.get() == regular_token.get()
+            assert (compact_token.start_pos, compact_token.end_pos) == (regular_token.start_pos, regular_token.end_pos)
+    tokens = compact[1].tokens
+    assert tokens[0].SOS and tokens[-1].EOS
+    assert tokens[1].next_token == ','
+    assert tokens[2].previous_token == 'Nice'
+    assert tokens[1:-1] == ['Nice', ',', 'right', '?']
+    tokens[1].PoS = 'UH'
+    tokens[3].repr = 'correct'
+    assert compact[1][1].PoS == 'UH'
+    assert compact[1][2].PoS is None
+    assert compact[1][3] == 'correct'
+    assert untokenize(tokens[:]) == 'Nice, correct?'
+
+def test_token_view_links():
+    tokens = CompactTokens('Nice, right?')
+    view = tokens[1]
+    assert isinstance(view, Token) and not hasattr(view, '__dict__')
+    view.next_token = tokens[2]
+    tokens[0].previous_token = None
+    with raises(AttributeError):
+        view.next_token = tokens[3]
+    with raises(AttributeError):
+        view.previous_token = Token(0, 4, 'Nice')
+
+def test_token_raw_setter():
+    token = tokenize('Nice, right?')[1]
+    token.raw = 'Good'
+    assert token.raw == 'Good'
+    assert token.repr == 'Nice'
+    restored = pickle.loads(pickle.dumps(token))
+    assert (restored.raw, restored.get()) == ('Good', 'Nice')
+
+def test_compact_tokens_pickle():
+    tokens = CompactTokens('Nice, right?')
+    tokens[1].PoS = 'UH'
+    restored = pickle.loads(pickle.dumps(tokens))
+    assert restored[1].PoS == 'UH'
+    assert restored[1:-1] == ['Nice', ',', 'right', '?']
+
+def test_compact_tokens_empty():
+    raises(AttributeError, CompactTokens, '')
+
+def test_document_from_sentences():
+    text = 'First sentence. Second one!'
+    sentences = [Sentence(0, 15, text), Sentence(16, 27, text, tokens=tokenize('Second one!'))]
+    document = Document(text, sentences=sentences)
+    assert document.sentences == ['First sentence.', 'Second one!']
+    assert document[0].next_sentence is document[1] and document[1].previous_sentence is document[0]
+    assert document[1].tokens is sentences[1].tokens
+
+def test_alignment():
+    # "Thiis  is!!!" normalized into "This is!"
+    alignment = Alignment([0, 5, 7], [4, 7, 8], [0, 7, 9], [5, 9, 12])
+    assert len(alignment) == 3
+    assert list(alignment) == [(0, 4, 0, 5), (5, 7, 7, 9), (7, 8, 9, 12)]
+    assert alignment.to_original(0, 4) == (0, 5)
+    assert alignment.to_original(5, 8) == (7, 12)
+    assert alignment.to_original(6) == (8, 9)
+    assert alignment.to_original(1, 2) == (0, 5)
+    assert alignment.to_original(4) is None
+    alignment.append(9, 12, 13, 16)
+    assert alignment[3] == (9, 12, 13, 16)
+    raises(AttributeError, alignment.append, 10, 11, 14, 15)
+    raises(AttributeError, Alignment, [0], [], [], [])
+
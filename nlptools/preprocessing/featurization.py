@@ -1,9 +1,16 @@
 import numpy as np
 import math
+import multiprocessing
 import string
 import pickle
+import zlib
+from array import array
+from collections import defaultdict
+from collections.abc import Iterator
 from functools import reduce
-from ..core.structures import Document, Sentence, Token
+from itertools import filterfalse, islice, repeat
+from ..core.structures import Document, DocumentStream, Sentence, Token
+from ..utils.data_structures import CSRMatrix
 
 class AbstractFeaturizer():
     """
@@ -41,7 +48,19 @@ class AbstractFeaturizer():
         if not (isinstance(data, Document) or isinstance(data, list)):
             raise(TypeError("Could not fit data because it is of wrong type. Type {} found. Please, insert it as a Document or list of strings".format(type(data))))
 
-    def transform(self, data):
+    def partial_fit(self, data):
+        """
+        Fits more data into the Featurizer, keeping what was fit before. New words are appended to the vocabulary, so the indexes already
+        assigned never change.
+        Abstract class only implements the exceptions.
+        Exceptions
+        ----------
+        TypeError
+            Related to data type. Expects Document or list of strings.
+        """
+        AbstractFeaturizer.fit(self, data)
+
+    def transform(self, data, sparse=False):
         """
         Transforms the data passed as input.
         Abstract class only implements the exceptions.
@@ -57,19 +76,79 @@ class AbstractFeaturizer():
         if len(self.word_indexes) == 0:
             raise(AttributeError("Vocabulary length is zero. Maybe you forgot to fit the Featurizer?"))
 
-    def fit_transform(self, data):
+    def fit_transform(self, data, sparse=False):
         """
         Fits and then transforms the data passed as input.
         """
         self.fit(data)
-        return self.transform(data)
+        return self.transform(data, sparse)
 
-    def _transform_document():
-        pass
+    def _transform_document(self, data, sparse=False):
+        if isinstance(data, Document):
+            to_transform = data.sentences
+        else:
+            to_transform = data
+        # Rows are built sparse, so the dense matrix is allocated only once.
+        matrix = CSRMatrix.from_rows((self._sentence_row(sentence) for sentence in to_transform), len(self.word_indexes))
+        return matrix if sparse else matrix.todense()
+
+    def _transform_sentence(self, data, sparse=False):
+        row = self._sentence_row(data)
+        if sparse:
+            return CSRMatrix.from_rows([row], len(self.word_indexes))
+        word_array = np.zeros(len(self.word_indexes))
+        word_array[np.fromiter(row.keys(), dtype=np.intp, count=len(row))] = np.fromiter(row.values(), dtype=np.float64, count=len(row))
+        return word_array
 
-    def _transform_sentence():
+    def _sentence_row(self, data):
+        """
+        Returns the non-zero features of a sentence as a dict of word index to value.
+        """
         pass
 
+    def _sentence_tokens(self, data):
+        if isinstance(data, Sentence):
+            return [token.get().lower() if self.lower_case else token.get() for token in data.tokens if token not in self.ignore_tokens]
+        return [token.lower() if self.lower_case else token for token in data.split()]
+
+    def _sentence_terms(self, data, ignore_tokens):
+        """
+        Returns an iterator over the terms of a sentence. As in term_frequency, ignored tokens are dropped before lowercasing.
+        """
+        if isinstance(data, Sentence):
+            words = [token.get() for token in data.tokens]
+        else:
+            words = data.split()
+        terms = filterfalse(ignore_tokens.__contains__, words)
+        return map(str.lower, terms) if self.lower_case else terms
+
+    def _encode(self, sentences, grow=False):
+        """
+        Encodes sentences into a flat array of word indexes, with the boundaries of each sentence in indptr (CSR style).
+        Out of vocabulary words are encoded as -1, unless grow is set, in which case they are added to the vocabulary in first seen order.
+        Returns
+        -------
+        tuple of numpy.ndarray: ids and indptr.
+        """
+        ignore_tokens = set(self.ignore_tokens)
+        if grow:
+            vocabulary = defaultdict(None, self.word_indexes)
+            # A missing word gets the next free index.
+            vocabulary.default_factory = vocabulary.__len__
+        ids = array('q')
+        indptr = array('q', [0])
+        for sentence in sentences:
+            terms = self._sentence_terms(sentence, ignore_tokens)
+            if grow:
+                ids.extend(map(vocabulary.__getitem__, terms))
+            else:
+                ids.extend(map(self.word_indexes.get, terms, repeat(-1)))
+            indptr.append(len(ids))
+        if grow:
+            self.word_indexes = dict(vocabulary)
+            self.index_to_word = {index: word for word, index in self.word_indexes.items()}
+        return np.asarray(ids, dtype=np.int64), np.asarray(indptr, dtype=np.int64)
+
     def save_to_file(self, filename):
         """
         Saves the current status of the Featurizer to a pickled file. Useful for deploying.
@@ -86,7 +165,8 @@ class AbstractFeaturizer():
         """
         with open(filename, 'rb') as f:
             tmp_dict = pickle.load(f)
-        self.__dict__.update(tmp_dict)
+        for attribute, value in tmp_dict.items():
+            setattr(self, attribute, value)
 
 class Bow(AbstractFeaturizer):
     """
@@ -98,7 +178,7 @@ class Bow(AbstractFeaturizer):
 
     def fit(self, data):
         """
-        Fits the data into the Featurizer.
+        Fits the data into the Featurizer, from scratch. The vocabulary indexes follow the order in which words are first seen.
         Arguments
         ---------
         data: Document or list of string.
@@ -109,18 +189,34 @@ class Bow(AbstractFeaturizer):
             Related to data type. Expects Document or list of strings.
         """
         super(Bow, self).fit(data)
-        document_words = list(set(global_term_frequency(data, self.ignore_tokens, self.lower_case).keys()))
-        for word_position in range(len(document_words)):
-            word = document_words[word_position]
-            self.word_indexes[word] = word_position
+        self.word_indexes = {}
+        self.index_to_word = {}
+        self.partial_fit(data)
+
+    def partial_fit(self, data):
+        """
+        Fits more data into the Featurizer. New words are appended to the vocabulary, so the indexes already assigned never change.
+        Arguments
+        ---------
+        data: Document or list of string.
+            The data to fit the featurizer.
+        Exceptions
+        ----------
+        TypeError
+            Related to data type. Expects Document or list of strings.
+        """
+        super(Bow, self).partial_fit(data)
+        self._encode(data.sentences if isinstance(data, Document) else data, grow=True)
 
-    def transform(self, data):
+    def transform(self, data, sparse=False):
         """
         Transforms the data passed as input into a Bag of Words vector/matrix, depending on the input.
         Arguments
         ---------
         data: Document, Sentence, list of string or string.
             The data to fit the featurizer.
+        sparse: boolean, optional
+            Whether to return a CSRMatrix instead of a dense numpy array/matrix. A sentence becomes a single row matrix. Defaults to False.
         Exceptions
         ----------
         TypeError
@@ -130,32 +226,18 @@ class Bow(AbstractFeaturizer):
         """
         super(Bow, self).transform(data)
         if isinstance(data, Document) or isinstance(data, list):
-            return self._transform_document(data)
+            return self._transform_document(data, sparse)
         elif isinstance(data, Sentence) or isinstance(data, str):
-            return self._transform_sentence(data)
-
-    def _transform_document(self, data):
-        if isinstance(data, Document):
-            to_transform = data.sentences
-        else:
-            to_transform = data
-        sentence_arrays = []
-        for sentence in data:
-            sentence_arrays.append(self._transform_sentence(sentence))
-        return np.matrix(sentence_arrays)
+            return self._transform_sentence(data, sparse)
 
-    def _transform_sentence(self, data):
-        if isinstance(data, Sentence):
-            tokens = [token.get().lower() if self.lower_case else token.get() for token in data.tokens if token not in self.ignore_tokens]
-        else:
-            tokens = [token.lower() if self.lower_case else token for token in data.split()]
-        word_array = np.zeros(len(self.word_indexes))
-        for token in tokens:
+    def _sentence_row(self, data):
+        row = {}
+        for token in self._sentence_tokens(data):
             # Dismisses out of vocabulary tokens
             if token in self.word_indexes:
                 token_index = self.word_indexes[token]
-                word_array[token_index]+=1
-        return word_array
+                row[token_index] = row.get(token_index, 0) + 1
+        return row
 
 
 class Tfidf(AbstractFeaturizer):
@@ -164,19 +246,20 @@ class Tfidf(AbstractFeaturizer):
     Attributes:
     -----------
     idf_dict: dict of int.
-        Dictionary containing the idf score for each word (available after fitting).
+        Dictionary containing the idf score for each word (available after fitting). Computed on demand from the document frequencies.
     num_documents: int.
         Number of documents used to fit the featurizer (important feature for score calculation).
+    document_frequencies: numpy.ndarray of int.
+        Number of documents each word (by index) appears in.
     """
 
     def __init__(self, ignore_tokens=["<SOS>","<EOS>"], ignore_punctuation=True, lower_case=False):
         super().__init__(ignore_tokens, ignore_punctuation, lower_case)
-        self.idf_dict = {}
-        self.num_documents = 0
+        self._reset()
 
     def fit(self, data):
         """
-        Fits the data into the Featurizer.
+        Fits the data into the Featurizer, from scratch. The vocabulary indexes follow the order in which words are first seen.
         Arguments
         ---------
         data: Document or list of string.
@@ -187,22 +270,88 @@ class Tfidf(AbstractFeaturizer):
             Related to data type. Expects Document or list of strings.
         """
         super(Tfidf, self).fit(data)
-        self.num_documents = len(data) if isinstance(data, list) else len(data.sentences)
-        word_freq_per_document = self._compute_global_tf(data)
-        self._compute_idf(word_freq_per_document)
-        document_words = list(set(global_term_frequency(data, self.ignore_tokens, self.lower_case)))
-        for word_position in range(len(document_words)):
-            word = document_words[word_position]
-            self.word_indexes[word] = word_position
-            self.index_to_word[word_position] = word
+        self._reset()
+        self._fit_encoded(data)
 
-    def transform(self, data):
+    def partial_fit(self, data):
+        """
+        Fits more data into the Featurizer. New words are appended to the vocabulary, so the indexes already assigned never change. The
+        document frequencies and number of documents are updated, and the idf scores are recomputed the next time they are needed.
+        Arguments
+        ---------
+        data: Document or list of string.
+            The data to fit the featurizer.
+        Exceptions
+        ----------
+        TypeError
+            Related to data type. Expects Document or list of strings.
+        """
+        super(Tfidf, self).partial_fit(data)
+        self._fit_encoded(data)
+
+    def fit_transform(self, data, sparse=False):
+        """
+        Fits and then transforms the data passed as input. The data is only encoded once.
+        """
+        super(Tfidf, self).fit(data)
+        self._reset()
+        word_counts, indptr = self._fit_encoded(data)
+        matrix = self._tf_idf_matrix(word_counts, indptr)
+        return matrix if sparse else matrix.todense()
+
+    @property
+    def idf_dict(self):
+        if self._idf_dict is None:
+            idf = self._idf_vector().tolist()
+            self._idf_dict = {word: idf[index] for word, index in self.word_indexes.items()}
+        return self._idf_dict
+
+    @idf_dict.setter
+    def idf_dict(self, idf_dict):
+        # An explicit idf_dict (e.g. from a featurizer saved by an older version) takes the place of the document frequencies.
+        self._idf_dict = idf_dict
+        self._idf = None
+        self.document_frequencies = None
+
+    def _reset(self):
+        self.word_indexes = {}
+        self.index_to_word = {}
+        self.num_documents = 0
+        self.document_frequencies = np.zeros(0, dtype=np.int64)
+        self._idf = None
+        self._idf_dict = None
+
+    def _fit_encoded(self, data):
+        sentences = data.sentences if isinstance(data, Document) else data
+        previous_frequencies = self._document_frequencies()
+        ids, indptr = self._encode(sentences, grow=True)
+        word_counts = sentence_word_counts(ids, indptr, len(self.word_indexes))
+        document_frequencies = np.zeros(len(self.word_indexes), dtype=np.int64)
+        document_frequencies[:len(previous_frequencies)] = previous_frequencies
+        document_frequencies += np.bincount(word_counts[1], minlength=len(self.word_indexes))
+        self.document_frequencies = document_frequencies
+        self.num_documents += len(indptr) - 1
+        # The idf scores are recomputed lazily.
+        self._idf = None
+        self._idf_dict = None
+        return word_counts, indptr
+
+    def _document_frequencies(self):
+        if self.document_frequencies is None:
+            # Featurizers saved by older versions only have the idf scores, which are inverted back to document frequencies.
+            idf = self._idf_vector()
+            self.document_frequencies = np.rint((1 + self.num_documents) / np.exp(idf) - 1).astype(np.int64)
+        return self.document_frequencies
+
+    def transform(self, data, sparse=False):
         """
         Transforms the data passed as input into a tdf-idf vector/matrix, depending on the input.
         Arguments
         ---------
         data: Document, Sentence, list of string or string.
             The data to fit the featurizer.
+        sparse: boolean, optional
+            Whether to return a CSRMatrix instead of a dense numpy array/matrix. A sentence becomes a single row matrix. Defaults to False.
         Exceptions
         ----------
         TypeError
@@ -212,54 +361,57 @@ class Tfidf(AbstractFeaturizer):
         """
         super(Tfidf, self).transform(data)
         if isinstance(data, Document) or isinstance(data, list):
-            return self._transform_document(data)
+            return self._transform_document(data, sparse)
         elif isinstance(data, Sentence) or isinstance(data, str):
-            return self._transform_sentence(data)
+            return self._transform_sentence(data, sparse)
 
-    def _transform_document(self, data):
-        if isinstance(data, Document):
-            to_transform = data.sentences
-        else:
-            to_transform = data
-        sentence_arrays = []
-        for sentence in data:
-            sentence_arrays.append(self._transform_sentence(sentence))
-        return np.matrix(sentence_arrays)
+    def _transform_document(self, data, sparse=False):
+        sentences = data.sentences if isinstance(data, Document) else data
+        ids, indptr = self._encode(sentences)
+        matrix = self._tf_idf_matrix(sentence_word_counts(ids, indptr, len(self.word_indexes)), indptr)
+        return matrix if sparse else matrix.todense()
 
-    def _transform_sentence(self, data):
-        if isinstance(data, Sentence):
-            tokens = [token.get().lower() if self.lower_case else token.get() for token in data.tokens if token not in self.ignore_tokens]
-        else:
-            tokens = [token.lower() if self.lower_case else token for token in data.split()]
-        word_array = np.zeros(len(self.word_indexes))
-        sentence_tf_idf = self._compute_sentence_tf_idf(data)
-        for token in tokens:
-            # Dismisses out of vocabulary tokens
-            if token in self.word_indexes:
-                token_index = self.word_indexes[token]
-                word_array[token_index] = sentence_tf_idf[token]
-        return word_array
+    def _transform_sentence(self, data, sparse=False):
+        matrix = self._transform_document([data], sparse=True)
+        return matrix if sparse else matrix.toarray()[0]
 
-    def _compute_global_tf(self, data):
+    def _tf_idf_matrix(self, word_counts, indptr):
         """
-        Computes global term frequency from data.
+        Computes the tf-idf matrix from the word counts of each sentence. The term frequency of a word is its count divided by the number of
+        words in the sentence, out of vocabulary words included. Out of vocabulary words get no column.
         """
-        word_freq_per_document = {}
-        if isinstance(data, Document):
-            list_of_sentences = data.sentences
-        else:
-            list_of_sentences = data
-        for sentence in list_of_sentences:
-            words_in_sent = set()
-            document_frequency = term_frequency(sentence, self.ignore_tokens, self.lower_case)
-            for word in document_frequency:
-                if not word in words_in_sent:
-                    word_freq_per_document[word] = word_freq_per_document.get(word, 0)+1
-                    words_in_sent.add(word)
-        return word_freq_per_document
+        rows, columns, counts = word_counts
+        data = counts / np.diff(indptr)[rows] * self._idf_vector()[columns]
+        return _counts_matrix(rows, columns, data, len(indptr) - 1, len(self.word_indexes))
+
+    def _idf_vector(self):
+        """
+        The idf scores as an array aligned with word_indexes.
+        """
+        if self._idf is None or len(self._idf) != len(self.word_indexes):
+            if self.document_frequencies is None:
+                idf = np.zeros(len(self.word_indexes))
+                for word, index in self.word_indexes.items():
+                    idf[index] = self._idf_dict.get(word, 0)
+            else:
+                idf = np.array([math.log(float(1 + self.num_documents) / (1 + frequency)) for frequency in self.document_frequencies.tolist()])
+            self._idf = idf
+        return self._idf
 
     def explain(self, tf_idf_array, summary=False):
         explained_results = {}
+        if isinstance(tf_idf_array, CSRMatrix):
+            if not summary:
+                return self.explain(tf_idf_array.toarray())
+            for sent_id in range(tf_idf_array.shape[0]):
+                explained_results[sent_id]={}
+                for position in range(tf_idf_array.indptr[sent_id], tf_idf_array.indptr[sent_id+1]):
+                    idf = tf_idf_array.data[position]
+                    if idf == 0.0:
+                        continue
+                    word = self.index_to_word[int(tf_idf_array.indices[position])]
+                    explained_results[sent_id][word]=idf
+            return explained_results
         if len(tf_idf_array.shape)>1:
             for sent_id, sent_scores in enumerate(tf_idf_array):
                 explained_results[sent_id]={}
@@ -280,43 +432,444 @@ class Tfidf(AbstractFeaturizer):
         return explained_results
 
 
-    def _compute_idf(self, word_freq_per_document):
+class HashingBow(AbstractFeaturizer):
+    """
+    Bag of Words implementation based on the hashing trick. Each term is mapped to one of n_features columns by a stable hash (CRC32)
+    instead of a vocabulary, so memory does not grow with the vocabulary and transforming needs no fit. Workers can vectorize in parallel
+    without sharing any state. Distinct terms may collide in the same column. Unlike the other featurizers, the output is sparse by default,
+    since a dense row has n_features columns. Based on AbstractFeaturizer class.
+    Attributes
+    ----------
+    n_features: int
+        Number of columns (hash buckets).
+    ngram_range: tuple of int
+        The smallest and largest n of the word n-grams used as terms. Defaults to (1, 1) (single words).
+    batch_size: int
+        Number of sentences encoded at a time when fitting or transforming in batches.
+    """
+
+    def __init__(self, ignore_tokens=["<SOS>","<EOS>"], ignore_punctuation=True, lower_case=False, n_features=2**20, ngram_range=(1, 1), batch_size=4096):
+        super().__init__(ignore_tokens, ignore_punctuation, lower_case)
+        if n_features < 1:
+            raise(AttributeError("n_features must be positive. Got {}.".format(n_features)))
+        if not 1 <= ngram_range[0] <= ngram_range[1]:
+            raise(AttributeError("Invalid ngram_range {}. Expected (min_n, max_n) with 1 <= min_n <= max_n.".format(ngram_range)))
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.batch_size = batch_size
+
+    def fit(self, data):
         """
-        Computes sentence(document) idf.
+        Hashing needs no fit. Only checks the data type.
+        Exceptions
+        ----------
+        TypeError
+            Related to data type. Expects Document, DocumentStream, list of strings or an iterator of sentences.
+        """
+        self._check_data(data)
+
+    def partial_fit(self, data):
+        self._check_data(data)
+
+    def transform(self, data, sparse=True):
+        """
+        Transforms the data passed as input into a hashed Bag of Words vector/matrix, depending on the input. Streams are consumed once.
+        Arguments
+        ---------
+        data: Document, DocumentStream, Sentence, list of string, iterator of sentences or string.
+            The data to transform.
+        sparse: boolean, optional
+            Whether to return a CSRMatrix instead of a dense numpy array/matrix. A sentence becomes a single row matrix. Defaults to True.
+            Dense output has n_features columns (8 MB per row with the default n_features), so it is only sensible for a small n_features.
+        Exceptions
+        ----------
+        TypeError
+            Related to data type. Expects Document, DocumentStream, Sentence, list of strings, an iterator of sentences or string.
         """
-        for word, frequency in word_freq_per_document.items():
-            idf = math.log(float(1 + self.num_documents) / (1 + frequency))
-            self.idf_dict[word]=idf
+        if isinstance(data, Sentence) or isinstance(data, str):
+            matrix = self._matrix([data])
+            return matrix if sparse else matrix.toarray()[0]
+        self._check_data(data)
+        matrix = self._matrix(data.sentences if isinstance(data, Document) else data)
+        return matrix if sparse else matrix.todense()
 
-    def _compute_sentence_tf_idf(self, sentence):
+    def transform_batches(self, data, sparse=True):
         """
-        Computes the tf_idf for a single sentence(document).
+        Transforms a stream of sentences batch by batch, yielding one matrix per batch_size sentences. Memory stays bounded however long
+        the stream is.
         """
-        sentence_tf_idf = {}
-        document_frequency = term_frequency(sentence, self.ignore_tokens, self.lower_case)
-        total_words = sum(document_frequency.values())
-        averaged_frequency = {k:(float(v)/total_words) for k,v in document_frequency.items()}
-        for term, tf in averaged_frequency.items():
-            # Out of vocabulary words are simply zeroed. They are going to be removed later either way.
-            sentence_tf_idf[term] = tf*self.idf_dict.get(term, 0)
-        return sentence_tf_idf
+        self._check_data(data)
+        for batch in self._batches(data):
+            matrix = self._matrix(batch)
+            yield matrix if sparse else matrix.todense()
+
+    def fit_transform(self, data, sparse=True):
+        return self.transform(data, sparse)
+
+    def _check_data(self, data):
+        if not (isinstance(data, Document) or isinstance(data, list) or isinstance(data, DocumentStream) or isinstance(data, Iterator)):
+            raise(TypeError("Wrong data type. Type {} found. Please, insert it as a Document, DocumentStream, list of strings or an iterator of sentences.".format(type(data))))
+
+    def _batches(self, data):
+        sentences = iter(data.sentences if isinstance(data, Document) else data)
+        batch = list(islice(sentences, self.batch_size))
+        while batch:
+            yield batch
+            batch = list(islice(sentences, self.batch_size))
+
+    def _matrix(self, sentences):
+        ids, indptr = self._hash_encode(sentences)
+        word_counts = sentence_word_counts(ids, indptr, self.n_features)
+        return _counts_matrix(word_counts[0], word_counts[1], self._weights(word_counts, indptr), len(indptr) - 1, self.n_features)
+
+    def _weights(self, word_counts, indptr):
+        return word_counts[2].astype(np.float64)
+
+    def _hash_encode(self, sentences):
+        """
+        Encodes sentences into a flat array of hash buckets, with the boundaries of each sentence in indptr (CSR style).
+        """
+        ignore_tokens = set(self.ignore_tokens)
+        ids = array('q')
+        indptr = array('q', [0])
+        for sentence in sentences:
+            ids.extend(map(self._bucket, self._terms(sentence, ignore_tokens)))
+            indptr.append(len(ids))
+        return np.asarray(ids, dtype=np.int64), np.asarray(indptr, dtype=np.int64)
+
+    def _terms(self, sentence, ignore_tokens):
+        words = self._sentence_terms(sentence, ignore_tokens)
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return words
+        words = list(words)
+        terms = list(words) if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            terms.extend(" ".join(words[position:position + n]) for position in range(len(words) - n + 1))
+        return terms
+
+    def _bucket(self, term):
+        return zlib.crc32(term.encode('utf-8')) % self.n_features
+
+
+class HashingTfidf(HashingBow):
+    """
+    TF-IDF implementation based on the hashing trick. Document frequencies are kept per hash bucket, in an array of n_features integers,
+    so memory is fixed whatever the vocabulary. Based on HashingBow class.
+    Attributes:
+    -----------
+    num_documents: int.
+        Number of documents used to fit the featurizer.
+    document_frequencies: numpy.ndarray of int.
+        Number of documents each bucket appears in.
+    """
+
+    def __init__(self, ignore_tokens=["<SOS>","<EOS>"], ignore_punctuation=True, lower_case=False, n_features=2**20, ngram_range=(1, 1), batch_size=4096):
+        super().__init__(ignore_tokens, ignore_punctuation, lower_case, n_features, ngram_range, batch_size)
+        self._reset()
+
+    def fit(self, data):
+        """
+        Fits the data into the Featurizer, from scratch. Streams are read batch by batch.
+        Exceptions
+        ----------
+        TypeError
+            Related to data type. Expects Document, DocumentStream, list of strings or an iterator of sentences.
+        """
+        self._check_data(data)
+        self._reset()
+        self.partial_fit(data)
+
+    def partial_fit(self, data):
+        """
+        Fits more data into the Featurizer, updating the document frequencies. Streams are read batch by batch.
+        """
+        self._check_data(data)
+        for batch in self._batches(data):
+            self._fit_batch(batch)
+
+    def transform(self, data, sparse=True):
+        """
+        Transforms the data passed as input into a hashed tf-idf vector/matrix, depending on the input. See HashingBow.transform.
+        Exceptions
+        ----------
+        AttributeError
+            Happens if not fit.
+        """
+        if self.num_documents == 0:
+            raise(AttributeError("No document was fit. Maybe you forgot to fit the Featurizer?"))
+        return super(HashingTfidf, self).transform(data, sparse)
+
+    def transform_batches(self, data, sparse=True):
+        if self.num_documents == 0:
+            raise(AttributeError("No document was fit. Maybe you forgot to fit the Featurizer?"))
+        return super(HashingTfidf, self).transform_batches(data, sparse)
+
+    def fit_transform(self, data, sparse=True):
+        """
+        Fits and then transforms the data passed as input, reading it only once (streams included). Batches are fit as they are read, like
+        in partial_fit, and only their (sentence, bucket, count) entries are kept until the final document frequencies are known.
+        """
+        self._check_data(data)
+        self._reset()
+        rows, columns, counts, lengths = [], [], [], []
+        num_sentences = 0
+        for batch in self._batches(data):
+            word_counts, indptr = self._fit_batch(batch)
+            rows.append(word_counts[0] + num_sentences)
+            columns.append(word_counts[1])
+            counts.append(word_counts[2])
+            lengths.append(np.diff(indptr))
+            num_sentences += len(indptr) - 1
+        if not lengths:
+            matrix = _counts_matrix(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), 0, self.n_features)
+            return matrix if sparse else matrix.todense()
+        word_counts = (np.concatenate(rows), np.concatenate(columns), np.concatenate(counts))
+        indptr = np.concatenate([[0], np.cumsum(np.concatenate(lengths))])
+        matrix = _counts_matrix(word_counts[0], word_counts[1], self._weights(word_counts, indptr), len(indptr) - 1, self.n_features)
+        return matrix if sparse else matrix.todense()
+
+    def _fit_batch(self, batch):
+        ids, indptr = self._hash_encode(batch)
+        word_counts = sentence_word_counts(ids, indptr, self.n_features)
+        self._update(word_counts, indptr)
+        return word_counts, indptr
+
+    def _reset(self):
+        self.num_documents = 0
+        self.document_frequencies = np.zeros(self.n_features, dtype=np.int64)
+        self._idf = None
+
+    def _update(self, word_counts, indptr):
+        self.document_frequencies += np.bincount(word_counts[1], minlength=self.n_features)
+        self.num_documents += len(indptr) - 1
+        self._idf = None
+
+    def _weights(self, word_counts, indptr):
+        if self._idf is None:
+            self._idf = np.log((1.0 + self.num_documents) / (1.0 + self.document_frequencies))
+        rows, columns, counts = word_counts
+        return counts / np.diff(indptr)[rows] * self._idf[columns]
 
 
 class Word2VecTransformer(AbstractFeaturizer):
-    def fit():
-        pass
+    """
+    Word2Vec implementation for featurization, trained with negative sampling (SGNS) in NumPy. Sentences are transformed into the average of
+    their word vectors. Based on AbstractFeaturizer class.
+    Training is vectorized over minibatches of (center, context) pairs. With workers > 1, the corpus is split among processes that update
+    the same shared vectors without locks (Hogwild).
+    Attributes
+    ----------
+    vector_size: int
+        Dimension of the word vectors.
+    window: int
+        Maximum distance between the center word and a context word. The actual window of each center word is drawn between 1 and window.
+    negative: int
+        Number of negative samples per positive pair.
+    skip_gram: boolean
+        Whether to train skip-gram (predicting each context word from the center word) or CBOW (predicting the center word from the average
+        of its context words).
+    min_count: int
+        Words seen fewer times than this while fitting are left out of the vocabulary.
+    epochs: int
+        Number of passes over the corpus.
+    learning_rate: float
+        The initial learning rate, linearly decayed to min_learning_rate.
+    min_learning_rate: float
+        The final learning rate.
+    subsample: float
+        Threshold for the random downsampling of frequent words. 0 disables it.
+    batch_size: int
+        Number of pairs (skip-gram) or center words (CBOW) per vectorized update. Updates within a batch add up, so large batches over a
+        tiny vocabulary can diverge.
+    workers: int
+        Number of training processes. They update the shared vectors without locks, so updates to the same word may be lost. This is
+        negligible over a real vocabulary, but a tiny one needs smaller batches.
+    seed: int
+        Seed of the random generators.
+    vectors: numpy.ndarray of float32
+        The word vectors (available after fitting), one row per word index.
+    word_counts: numpy.ndarray of int
+        How many times each word was seen while fitting.
+    """
 
-    def transform():
-        pass
+    def __init__(self, ignore_tokens=["<SOS>","<EOS>"], ignore_punctuation=True, lower_case=False, vector_size=100, window=5, negative=5,
+                 skip_gram=True, min_count=1, epochs=5, learning_rate=0.025, min_learning_rate=0.0001, subsample=1e-3, batch_size=256,
+                 workers=1, seed=1):
+        super().__init__(ignore_tokens, ignore_punctuation, lower_case)
+        self.vector_size = vector_size
+        self.window = window
+        self.negative = negative
+        self.skip_gram = skip_gram
+        self.min_count = min_count
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.min_learning_rate = min_learning_rate
+        self.subsample = subsample
+        self.batch_size = batch_size
+        self.workers = workers
+        self.seed = seed
+        self.vectors = None
+        self.word_counts = None
 
-    def fit_transform():
-        pass
+    def fit(self, data):
+        """
+        Builds the vocabulary and trains the word vectors, from scratch.
+        Arguments
+        ---------
+        data: Document or list of string or list of list of string.
+            The data to fit the featurizer. Sentences can also be given as lists of tokens.
+        Exceptions
+        ----------
+        TypeError
+            Related to data type. Expects Document or list of strings.
+        """
+        super(Word2VecTransformer, self).fit(data)
+        sentences = data.sentences if isinstance(data, Document) else data
+        self.word_indexes = {}
+        ids, indptr = self._encode(sentences, grow=True)
+        counts = np.bincount(ids, minlength=len(self.word_indexes))
+        ids, indptr = self._apply_min_count(ids, indptr, counts)
+        self.word_counts = counts[counts >= self.min_count]
+        rng = np.random.default_rng(self.seed)
+        vectors = ((rng.random((len(self.word_indexes), self.vector_size)) - 0.5) / self.vector_size).astype(np.float32)
+        output_vectors = np.zeros((len(self.word_indexes), self.vector_size), dtype=np.float32)
+        if self.workers > 1 and len(indptr) > self.workers:
+            vectors = _train_hogwild(vectors, output_vectors, ids, indptr, self.word_counts, self._training_config(), self.seed, self.workers)
+        else:
+            _train_sgns(vectors, output_vectors, ids, indptr, self.word_counts, self._training_config(), self.seed)
+        self.vectors = vectors
 
-    def _transform_document():
-        pass
+    def transform(self, data, sparse=False):
+        """
+        Transforms the data passed as input into the average of its word vectors: a vector for a sentence, a matrix for many.
+        Out of vocabulary words are skipped. A sentence without known words becomes a zero vector.
+        Arguments
+        ---------
+        data: Document, Sentence, list of string, list of list of string or string.
+            The data to transform.
+        Exceptions
+        ----------
+        TypeError
+            Related to data type. Expects Document, Sentence, list of strings or string.
+        AttributeError
+            Related to the vocabulary lenght. Happens if fit with empty data or not fit. Also raised for sparse output, which is not supported.
+        """
+        super(Word2VecTransformer, self).transform(data)
+        if sparse:
+            raise(AttributeError("Word2VecTransformer only produces dense vectors."))
+        if isinstance(data, Document) or isinstance(data, list):
+            return self._transform_document(data)
+        elif isinstance(data, Sentence) or isinstance(data, str):
+            return self._transform_sentence(data)
 
-    def _transform_sentence():
-        pass
+    def _transform_document(self, data, sparse=False):
+        sentences = data.sentences if isinstance(data, Document) else data
+        ids, indptr = self._encode(sentences)
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        known = ids >= 0
+        sums = np.zeros((len(indptr) - 1, self.vector_size), dtype=np.float32)
+        _scatter_add(sums, rows[known], self.vectors[ids[known]])
+        lengths = np.bincount(rows[known], minlength=len(indptr) - 1)
+        return np.matrix(sums / np.maximum(lengths, 1)[:, None])
+
+    def _transform_sentence(self, data, sparse=False):
+        return np.asarray(self._transform_document([data]))[0]
+
+    def most_similar(self, word, topn=10):
+        """
+        Returns the topn words closest to a word, by cosine similarity, as a list of (word, similarity) pairs.
+        """
+        if self.lower_case:
+            word = word.lower()
+        if word not in self.word_indexes:
+            raise(KeyError("'{}' is out of vocabulary.".format(word)))
+        norms = np.linalg.norm(self.vectors, axis=1)
+        norms[norms == 0] = 1
+        similarities = self.vectors.dot(self.vectors[self.word_indexes[word]]) / (norms * norms[self.word_indexes[word]])
+        ranking = [index for index in np.argsort(-similarities) if index != self.word_indexes[word]][:topn]
+        return [(self.index_to_word[index], float(similarities[index])) for index in ranking]
+
+    def save_to_file(self, filename):
+        """
+        Saves the featurizer to two files: filename.npy with the word vectors, and filename.p with everything else.
+        """
+        if filename.endswith(".p"):
+            filename = filename[:-2]
+        np.save(filename + ".npy", np.asarray(self.vectors))
+        state = dict(self.__dict__)
+        state['vectors'] = None
+        with open(filename + ".p", 'wb') as f:
+            pickle.dump(state, f)
+
+    def load_from_file(self, filename, mmap=True):
+        """
+        Loads a featurizer saved with save_to_file. By default the vectors are memory-mapped (read-only), so processes loading the same
+        file share its memory.
+        """
+        if filename.endswith(".p"):
+            filename = filename[:-2]
+        super(Word2VecTransformer, self).load_from_file(filename + ".p")
+        self.vectors = np.load(filename + ".npy", mmap_mode='r' if mmap else None)
+
+    def _sentence_terms(self, data, ignore_tokens):
+        if isinstance(data, list) or isinstance(data, tuple):
+            terms = filterfalse(ignore_tokens.__contains__, data)
+            return map(str.lower, terms) if self.lower_case else terms
+        return super(Word2VecTransformer, self)._sentence_terms(data, ignore_tokens)
+
+    def _apply_min_count(self, ids, indptr, counts):
+        """
+        Drops the words seen fewer than min_count times from the vocabulary and from the encoded corpus, keeping the order of the others.
+        """
+        kept = counts >= self.min_count
+        if kept.all():
+            return ids, indptr
+        new_indexes = np.cumsum(kept) - 1
+        sentence_ids = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        kept_tokens = kept[ids]
+        self.word_indexes = {word: int(new_indexes[index]) for word, index in self.word_indexes.items() if kept[index]}
+        self.index_to_word = {index: word for word, index in self.word_indexes.items()}
+        indptr = np.zeros(len(indptr), dtype=np.int64)
+        np.cumsum(np.bincount(sentence_ids[kept_tokens], minlength=len(indptr) - 1), out=indptr[1:])
+        return new_indexes[ids[kept_tokens]], indptr
+
+    def _training_config(self):
+        return {'window': self.window, 'negative': self.negative, 'skip_gram': self.skip_gram, 'epochs': self.epochs,
+                'learning_rate': self.learning_rate, 'min_learning_rate': self.min_learning_rate, 'subsample': self.subsample,
+                'batch_size': self.batch_size}
+
+def sentence_word_counts(ids, indptr, num_words):
+    """
+    Counts how many times each word appears in each sentence (document) of an encoded corpus. Used as auxiliary for other methods.
+    Arguments:
+    ----------
+    ids: numpy.ndarray of int
+        The word index of every token in the corpus, sentence after sentence. Negative indexes (out of vocabulary words) are skipped.
+    indptr: numpy.ndarray of int
+        Where each sentence starts in ids, plus the total length.
+    num_words: int
+        The vocabulary length.
+    Returns
+    -------
+    tuple of numpy.ndarray: the sentence, word index and count of every distinct (sentence, word) pair, in CSR order.
+    """
+    rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(indptr))
+    known = ids >= 0
+    pairs = rows[known] * num_words + ids[known]
+    pairs.sort()
+    starts = np.flatnonzero(np.concatenate(([True], pairs[1:] != pairs[:-1]))) if len(pairs) else np.zeros(0, dtype=np.int64)
+    counts = np.diff(np.append(starts, len(pairs)))
+    rows, columns = np.divmod(pairs[starts], max(num_words, 1))
+    return rows, columns, counts
+
+def _counts_matrix(rows, columns, data, num_sentences, num_columns):
+    """
+    Builds a CSRMatrix from (row, column, value) entries that are already in CSR order.
+    """
+    indptr = np.zeros(num_sentences + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_sentences), out=indptr[1:])
+    return CSRMatrix(data, columns, indptr, (num_sentences, num_columns))
 
 def global_term_frequency(document, ignore_tokens=["<SOS>","<EOS>"], lower_case = False):
     """
@@ -376,3 +929,146 @@ def reduce_term_frequency(list_of_word_dict):
         return accumulator
     total_frequencies = reduce(reducer, list_of_word_dict, {})
     return total_frequencies
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-np.clip(x, -6, 6)))
+
+def _train_sgns(vectors, output_vectors, ids, indptr, word_counts, config, seed):
+    """
+    Trains word vectors with negative sampling over an encoded corpus, updating vectors and output_vectors in place.
+    """
+    rng = np.random.default_rng(seed)
+    total_words = len(ids) * config['epochs']
+    if total_words == 0 or len(word_counts) == 0:
+        return
+    noise = np.cumsum(word_counts.astype(np.float64) ** 0.75)
+    if config['subsample'] > 0:
+        threshold = config['subsample'] * word_counts.sum()
+        keep_probability = np.minimum(1.0, (np.sqrt(word_counts / threshold) + 1) * threshold / word_counts)
+    else:
+        keep_probability = np.ones(len(word_counts))
+    sentence_ids = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    # The corpus is processed in chunks of whole sentences, so the pairs of a chunk fit in memory.
+    chunk_bounds = np.unique(np.searchsorted(indptr, np.arange(0, len(ids), 10000), side='right') - 1)
+    chunk_starts = np.append(indptr[chunk_bounds], len(ids))
+    processed = 0
+    for epoch in range(config['epochs']):
+        for start, end in zip(chunk_starts[:-1], chunk_starts[1:]):
+            chunk = ids[start:end]
+            kept = rng.random(len(chunk)) < keep_probability[chunk]
+            words, sentences = chunk[kept], sentence_ids[start:end][kept]
+            learning_rate = max(config['min_learning_rate'], config['learning_rate'] * (1 - processed / total_words))
+            centers, contexts = _context_pairs(sentences, config['window'], rng)
+            if config['skip_gram']:
+                _skip_gram_step(vectors, output_vectors, words[centers], words[contexts], noise, config, learning_rate, rng)
+            else:
+                _cbow_step(vectors, output_vectors, words, centers, contexts, noise, config, learning_rate, rng)
+            processed += end - start
+
+def _context_pairs(sentences, window, rng):
+    """
+    Returns the (center, context) position pairs of a chunk. Each center has a window drawn between 1 and window, and pairs never cross
+    sentences. The pairs are sorted by center.
+    """
+    reduced_windows = rng.integers(1, window + 1, len(sentences))
+    positions = np.arange(len(sentences))
+    centers = []
+    contexts = []
+    for distance in range(1, window + 1):
+        same_sentence = sentences[:-distance] == sentences[distance:]
+        forward = same_sentence & (reduced_windows[:-distance] >= distance)
+        centers.append(positions[:-distance][forward])
+        contexts.append(positions[distance:][forward])
+        backward = same_sentence & (reduced_windows[distance:] >= distance)
+        centers.append(positions[distance:][backward])
+        contexts.append(positions[:-distance][backward])
+    centers = np.concatenate(centers)
+    contexts = np.concatenate(contexts)
+    order = np.argsort(centers, kind='stable')
+    return centers[order], contexts[order]
+
+def _negative_step(output_vectors, hidden, targets, noise, config, learning_rate, rng):
+    """
+    One negative sampling update: scores each hidden vector against its target word and config['negative'] noise words, updates the output
+    vectors, and returns the gradient of the hidden vectors.
+    """
+    negatives = np.searchsorted(noise, rng.random((len(targets), config['negative'])) * noise[-1])
+    words = np.concatenate([targets[:, None], negatives], axis=1)
+    labels = np.zeros(words.shape, dtype=np.float32)
+    labels[:, 0] = 1
+    outputs = output_vectors[words]
+    gradients = (labels - _sigmoid(np.einsum('bd,bkd->bk', hidden, outputs))) * learning_rate
+    # Noise words that happen to be the target are not used as negatives.
+    gradients[:, 1:][negatives == targets[:, None]] = 0
+    gradients = gradients.astype(np.float32)
+    hidden_gradients = np.einsum('bk,bkd->bd', gradients, outputs)
+    _scatter_add(output_vectors, words, gradients[:, :, None] * hidden[:, None, :])
+    return hidden_gradients
+
+def _scatter_add(rows, indices, values):
+    """
+    Adds each row of values to rows[index], accumulating repeated indexes. Much faster than numpy.add.at for whole rows.
+    """
+    indices = indices.ravel()
+    if len(indices) == 0:
+        return
+    values = values.reshape(len(indices), -1)
+    order = np.argsort(indices, kind='stable')
+    sorted_indices = indices[order]
+    starts = np.flatnonzero(np.concatenate(([True], sorted_indices[1:] != sorted_indices[:-1])))
+    rows[sorted_indices[starts]] += np.add.reduceat(values[order], starts, axis=0)
+
+def _skip_gram_step(vectors, output_vectors, centers, contexts, noise, config, learning_rate, rng):
+    order = rng.permutation(len(centers))
+    for start in range(0, len(order), config['batch_size']):
+        batch = order[start:start + config['batch_size']]
+        hidden = vectors[centers[batch]]
+        _scatter_add(vectors, centers[batch], _negative_step(output_vectors, hidden, contexts[batch], noise, config, learning_rate, rng))
+
+def _cbow_step(vectors, output_vectors, words, centers, contexts, noise, config, learning_rate, rng):
+    # Pairs are sorted by center, so each center owns a contiguous run of pairs.
+    pair_starts = np.flatnonzero(np.concatenate(([True], centers[1:] != centers[:-1]))) if len(centers) else np.zeros(0, dtype=np.int64)
+    center_positions = centers[pair_starts]
+    context_counts = np.diff(np.append(pair_starts, len(centers)))
+    for start in range(0, len(center_positions), config['batch_size']):
+        end = min(start + config['batch_size'], len(center_positions))
+        pairs = slice(pair_starts[start], pair_starts[end] if end < len(center_positions) else len(centers))
+        local_centers = np.repeat(np.arange(end - start), context_counts[start:end])
+        context_words = words[contexts[pairs]]
+        hidden = np.zeros((end - start, vectors.shape[1]), dtype=np.float32)
+        _scatter_add(hidden, local_centers, vectors[context_words])
+        hidden /= context_counts[start:end, None]
+        hidden_gradients = _negative_step(output_vectors, hidden, words[center_positions[start:end]], noise, config, learning_rate, rng)
+        _scatter_add(vectors, context_words, hidden_gradients[local_centers])
+
+def _train_hogwild(vectors, output_vectors, ids, indptr, word_counts, config, seed, workers):
+    """
+    Trains with one process per shard of the corpus. The processes update the same shared vectors without locks.
+    Raises a RuntimeError if any of them fails.
+    """
+    shared_vectors = multiprocessing.RawArray('f', vectors.size)
+    shared_output_vectors = multiprocessing.RawArray('f', output_vectors.size)
+    np.frombuffer(shared_vectors, dtype=np.float32)[:] = vectors.ravel()
+    np.frombuffer(shared_output_vectors, dtype=np.float32)[:] = output_vectors.ravel()
+    bounds = np.searchsorted(indptr, np.linspace(0, len(ids), workers + 1)[1:-1])
+    bounds = np.concatenate([[0], bounds, [len(indptr) - 1]])
+    processes = []
+    for worker in range(workers):
+        shard_indptr = indptr[bounds[worker]:bounds[worker + 1] + 1]
+        shard_ids = ids[shard_indptr[0]:shard_indptr[-1]]
+        process = multiprocessing.Process(target=_hogwild_worker, args=(shared_vectors, shared_output_vectors, vectors.shape, shard_ids,
+                                          shard_indptr - shard_indptr[0], word_counts, config, seed + worker))
+        process.start()
+        processes.append(process)
+    for process in processes:
+        process.join()
+    failed = [worker for worker, process in enumerate(processes) if process.exitcode != 0]
+    if failed:
+        raise RuntimeError("Training failed in the worker process of corpus shard(s) {}.".format(", ".join(str(worker) for worker in failed)))
+    return np.frombuffer(shared_vectors, dtype=np.float32).reshape(vectors.shape).copy()
+
+def _hogwild_worker(shared_vectors, shared_output_vectors, shape, ids, indptr, word_counts, config, seed):
+    vectors = np.frombuffer(shared_vectors, dtype=np.float32).reshape(shape)
+    output_vectors = np.frombuffer(shared_output_vectors, dtype=np.float32).reshape(shape)
+    _train_sgns(vectors, output_vectors, ids, indptr, word_counts, config, seed)
@@ -1,17 +1,63 @@
-import pickle, os
+import os
+import pickle
 
+from ..utils.data_structures import MappedStringTable
+from ..utils.resources import get_resource
+from ..utils.tagsets import to_ud
 from ..utils.word_utils import inflect_noun_singular
 
 class AbstractLemmatizer:
     def lemmatize():
         pass
 
+    def lemmatize_sentence(self, sentence, lemmatize_plurals=True):
+        """
+        Lemmatizes every token of a tagged Sentence (see MLTagger), storing the results in the lemma attribute of each Token. Penn Treebank
+        tags are converted to UD tags. Each distinct (word, Part of Speech) pair is lemmatized only once. Returns the Sentence.
+        Parameters
+        ----------
+        sentence: Sentence
+            The tagged sentence to be lemmatized.
+        lemmatize_plurals: boolean, optional
+            Same as in lemmatize. Defaults to True.
+        """
+        self._lemmatize_tokens(sentence.tokens[1:-1], lemmatize_plurals)
+        return sentence
+
+    def lemmatize_document(self, document, lemmatize_plurals=True):
+        """
+        Lemmatizes every token of a tagged Document, storing the results in the lemma attribute of each Token. See lemmatize_sentence.
+        Returns the Document.
+        """
+        self._lemmatize_tokens([token for sentence in document.sentences for token in sentence.tokens[1:-1]], lemmatize_plurals)
+        return document
+
+    def _lemmatize_tokens(self, tokens, lemmatize_plurals):
+        # Lookups are case-insensitive, so the words are lowercased to find the distinct pairs.
+        keys = [(token.get().lower(), to_ud(token.PoS)) for token in tokens]
+        lemmas = {key: self.lemmatize(key[0], key[1], lemmatize_plurals) for key in set(keys)}
+        for token, key in zip(tokens, keys):
+            token.lemma = lemmas[key]
+
 class DictionaryLemmatizer(AbstractLemmatizer):
 
     dict_directory = os.path.join(os.path.dirname(__file__), "../preloaded/dictionaries/lemmas/word_lemma_dict.p")
+    table_directory = os.path.join(os.path.dirname(__file__), "../preloaded/dictionaries/lemmas/word_lemma_table.bin")
 
-    def __init__(self):
-        self.lemma_dict = pickle.load(open(self.dict_directory,'rb'))
+    def __init__(self, mapped=False):
+        """
+        Parameters
+        ----------
+        mapped: boolean, optional
+            Queries a memory-mapped lemma table instead of loading the pickled dictionary. Startup is almost free and forked workers share
+            the table memory, at the cost of slower lookups. Defaults to False.
+        """
+        self.mapped = mapped
+        # The dictionary (or table) is shared by every DictionaryLemmatizer.
+        if mapped:
+            self.lemma_table = get_resource('word_lemma_table')
+        else:
+            self.lemma_dict = get_resource('word_lemma_dict')
 
     def lemmatize(self, word, pos, lemmatize_plurals=True):
         if word is None:
@@ -20,9 +66,36 @@ class DictionaryLemmatizer(AbstractLemmatizer):
             pos = ''
         word = str(word).lower()
         pos = str(pos).upper()
-        if word in self.lemma_dict:
+        if self.mapped:
+            lemma = self.lemma_table.get(lemma_table_key(word, pos))
+            if lemma is not None:
+                return lemma
+        elif word in self.lemma_dict:
             if pos in self.lemma_dict[word]:
                 return self.lemma_dict[word][pos]
         if pos == "NOUN" and lemmatize_plurals:
             return inflect_noun_singular(word)
         return word
+
+
+def lemma_table_key(word, pos):
+    """
+    The lemma table key of a word and Part of Speech pair.
+    """
+    return word + '\x00' + pos
+
+
+def build_lemma_table(lemma_dict_path=DictionaryLemmatizer.dict_directory, table_path=DictionaryLemmatizer.table_directory):
+    """
+    Converts a pickled lemma dictionary (word -> Part of Speech -> lemma) into the memory-mapped table used by DictionaryLemmatizer(mapped=True).
+    Arguments:
+    ----------
+    lemma_dict_path: str (path), optional
+        The pickled dictionary. Defaults to the preloaded dictionary.
+    table_path: str (path), optional
+        Where to write the table. Defaults to the preloaded table.
+    """
+    with open(lemma_dict_path, 'rb') as f:
+        lemma_dict = pickle.load(f)
+    items = ((lemma_table_key(word, pos), lemma) for word, lemmas in lemma_dict.items() for pos, lemma in lemmas.items())
+    MappedStringTable.write(items, table_path)
@@ -1,13 +1,23 @@
-import json
+import argparse
+import bisect
+import collections
+import glob
+import hashlib
+import multiprocessing
 import os
+import pickle
 import re
 import string
+import time
 import warnings
 
 import pkg_resources
 from symspellpy.symspellpy import SymSpell, Verbosity
+from tqdm import tqdm
 
-from ..core.structures import sentencize, tokenize, Sentence, Document, untokenize
+from ..core.structures import sentencize, tokenize, Alignment, Sentence, Document, DocumentStream, Token, untokenize
+from ..utils.data_structures import LRUCache
+from ..utils.resources import get_resource
 
 contractions_file = os.path.join(os.path.dirname(__file__),
                                  "../preloaded/dictionaries/contractions/english_contractions.json")
@@ -43,81 +53,306 @@ def normalize_whitespace(input_string):
     return corrected.strip(" ")
 
 
+# The pre-tokenization steps as (first characters, pattern, replacement template) rules, which compiled Normalizers fuse into a single
+# regular expression pass. Matches of different rules never overlap and replacements never create new matches, so one pass gives the same
+# result as the steps in sequence. '//t' is turned into a tab before tabs are collapsed, so it is part of the tab runs.
+pre_tokenization_rules = {'simplify_punctuation': [('!?,;', r'(?P<punctuation>[!?,;])(?P=punctuation)+', r'\g<punctuation>'),
+                                                   ('.', r'\.{2,}', '...')],
+                          'normalize_whitespace': [('\t/', r'(?:\t|//t)+', '\t'),
+                                                   (' \n\r', r'(?P<space>[ \n\r])(?P=space)+', r'\g<space>')]}
+
+
+class FusedSubstitution:
+    """
+    Runs the rules of several pre-tokenization steps as a single regular expression pass over the string. A lookahead on the first
+    characters of the rules lets the scan skip quickly over the text in between, and strings without any match are returned untouched.
+    Attributes
+    ----------
+    steps: list of str
+        The names of the fused steps, keys of pre_tokenization_rules.
+    """
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+        rules = [rule for step in self.steps for rule in pre_tokenization_rules[step]]
+        first_characters = re.escape(''.join(characters for characters, pattern, template in rules))
+        self.pattern = re.compile('(?=[{}])(?:{})'.format(first_characters, '|'.join(
+            '(?P<rule{}>{})'.format(index, pattern) for index, (characters, pattern, template) in enumerate(rules))))
+        # Templates without group references are used as they are.
+        self.replacements = {'rule{}'.format(index): (template, '\\' in template) for index, (characters, pattern, template) in enumerate(rules)}
+        self.strip = 'normalize_whitespace' in self.steps
+
+    def __call__(self, text):
+        if text is None:
+            return ''
+        corrected = str(text)
+        if self.pattern.search(corrected) is not None:
+            corrected = self.pattern.sub(self._replace, corrected)
+        return corrected.strip(" ") if self.strip else corrected
+
+    def substitute(self, text):
+        """
+        Runs the substitution without stripping the result, and also returns the replaced regions, so positions in the result can be mapped
+        back to text. Returns the substituted string and a list of (start, end, original_start, original_end) spans of the replaced regions,
+        in the substituted string and in text. The text in between is unchanged.
+        """
+        parts = []
+        regions = []
+        position = 0
+        length = 0
+        for match in self.pattern.finditer(text):
+            replacement = self._replace(match)
+            parts.append(text[position:match.start()])
+            length += match.start() - position
+            regions.append((length, length + len(replacement), match.start(), match.end()))
+            parts.append(replacement)
+            length += len(replacement)
+            position = match.end()
+        parts.append(text[position:])
+        return ''.join(parts), regions
+
+    def _replace(self, match):
+        template, expand = self.replacements[match.lastgroup]
+        return match.expand(template) if expand else template
+
+
+def _original_position(regions, region_starts, position, end=False):
+    """
+    Maps a position of a string substituted by FusedSubstitution.substitute back to the original string. Positions inside a replaced region
+    map to its start, or to its end for end positions.
+    """
+    index = (bisect.bisect_left(region_starts, position) if end else bisect.bisect_right(region_starts, position)) - 1
+    if index < 0:
+        return position
+    start, region_end, original_start, original_end = regions[index]
+    if position < region_end or (end and position == region_end):
+        return original_end if end else original_start
+    return position + original_end - region_end
+
+
 #### Post-tokenization functions ####
 
 def normalize_contractions(token_list):
     """
     This function normalizes english contractions.
+    The contractions lexicon is loaded once and shared, see the english_contractions_lexicon resource.
     """
-    contractions = json.loads(open(contractions_file, 'r').read())
+    contractions = get_resource('english_contractions_lexicon')
     new_token_list = []
     for word_pos in range(1, len(token_list[:-1])):
-        word_token = token_list[word_pos]
-        word = word_token.get()
-        first_upper = False
-        if word[0].isupper():
-            first_upper = True
-        if word.lower() in contractions:
-            replacement = contractions[word.lower()]
-            if first_upper:
-                replacement = replacement[0].upper() + replacement[1:]
-            replacement_tokens = replacement.split()
-            if len(replacement_tokens) > 1:
-                new_token_list.append(replacement_tokens[0])
-                new_token_list.append(replacement_tokens[1])
-            else:
-                new_token_list.append(replacement_tokens[0])
+        word = token_list[word_pos].get()
+        replacement_tokens = contractions.get(word)
+        if replacement_tokens is not None:
+            new_token_list.extend(replacement_tokens[:2])
         else:
-            new_token_list.append(word_token.get())
-    tokens = tokenize(" ".join(new_token_list).strip(" "))
-    return tokens
+            new_token_list.append(word)
+    normalized_sentence = " ".join(new_token_list).strip(" ")
+    if not normalized_sentence:
+        # No word is left to tokenize, e.g. in a whitespace only sentence or after stopword removal.
+        return [token for token in token_list if token.SOS or token.EOS]
+    return tokenize(normalized_sentence)
 
 
 def remove_stopwords(token_list):
     """
     This function does simple stopword removal over a token List. The token is actually not removed, but its representation blanked.
-    Uses https://www.ranks.nl/stopwords stopword list.
+    Uses https://www.ranks.nl/stopwords stopword list, loaded once and shared as the english_stopwords_lexicon resource.
     """
-    stopwords = [line.replace('\n', '') for line in open(stopwords_file, 'r').readlines()]
-    for word_pos in range(1, len(token_list[:-1])):
-        word_token = token_list[word_pos]
-        word = word_token.get()
-        if word in stopwords:
-            word_token.repr = ""
-            token_list[word_pos] = word_token
-    return token_list
+    return batch_remove_stopwords([token_list])[0]
+
+
+def batch_normalize_contractions(token_lists):
+    """
+    Normalizes english contractions over many token lists in place, replacing each contraction Token with the Tokens of its expansion,
+    without untokenizing and tokenizing the sentence again. The new Tokens span the contraction in the sentence. Returns the token lists.
+    """
+    contractions = get_resource('english_contractions_lexicon')
+    for token_list in token_lists:
+        words = [word_token.get() for word_token in token_list[1:-1]]
+        replacements = contractions.find(words)
+        if not any(replacements):
+            continue
+        new_tokens = []
+        for word_token, replacement_words in zip(token_list[1:-1], replacements):
+            if replacement_words is None:
+                new_tokens.append(word_token)
+                continue
+            # As in normalize_contractions, at most two words of the expansion are kept.
+            for replacement_word in replacement_words[:2]:
+                replacement_token = Token(word_token.start_pos, word_token.end_pos, word_token._sentence_string)
+                replacement_token.repr = replacement_word
+                new_tokens.append(replacement_token)
+        token_list[1:-1] = new_tokens
+        for previous, token in zip(token_list, token_list[1:]):
+            previous.next_token = token
+            token.previous_token = previous
+    return token_lists
+
+
+def batch_remove_stopwords(token_lists):
+    """
+    Stopword removal over many token lists in place, blanking the representation of stopword Tokens like remove_stopwords.
+    Returns the token lists.
+    """
+    stopwords = get_resource('english_stopwords_lexicon')
+    for token_list in token_lists:
+        for word_pos, is_stopword in enumerate(stopwords.find(word_token.get() for word_token in token_list[1:-1]), 1):
+            if is_stopword:
+                word_token = token_list[word_pos]
+                word_token.repr = ""
+                token_list[word_pos] = word_token
+    return token_lists
 
 
 def spell_correction(token_list):
     """
     This function does very simple spell correction normalization using pyspellchecker module. It works over a tokenized sentence and only the token representations are changed.
+    Corrections are cached across calls, see batch_spell_correction.
     """
-    # Spell checker config
-    spellchecker = SysmspellSingleton()
-    max_edit_distance_lookup = 2
-    suggestion_verbosity = Verbosity.TOP  # TOP, CLOSEST, ALL
-    # End of Spell checker config
-    for word_pos in range(1, len(token_list[:-1])):
-        word_token = token_list[word_pos]
-        word = word_token.get()
-        if not '\n' in word and word not in string.punctuation and not is_numeric(word) and not (
-                word.lower() in spellchecker.words.keys()):
-            suggestions = spellchecker.lookup(word.lower(), suggestion_verbosity, max_edit_distance_lookup)
-            # Checks first uppercase to conserve the case.
-            upperfirst = word[0].isupper()
-            # Checks for correction suggestions.
-            if len(suggestions) > 0:
-                correction = suggestions[0].term
-                replacement = correction
-            # We call our _reduce_exaggerations function if no suggestion is found. Maybe there are repeated chars.
+    return batch_spell_correction([token_list])[0]
+
+
+def batch_spell_correction(token_lists):
+    """
+    Spell correction over many tokenized sentences at once, such as the sentences of a Document. Each distinct misspelled word is corrected
+    only once, and corrections are kept in a cache shared by every call. Only the token representations are changed.
+    """
+    global _spell_corrector
+    if _spell_corrector is None:
+        _spell_corrector = BatchSpellCorrector()
+    return _spell_corrector.correct_token_lists(token_lists)
+
+
+class BatchSpellCorrector:
+    """
+    SymSpell based spell correction over batches of tokenized sentences. The words to correct are collected across the whole batch, each
+    distinct word is looked up once (optionally in worker processes), and the corrections are written back to every token with that word.
+    Corrections are kept in a bounded least recently used cache, so words seen in earlier batches are not looked up again.
+    The worker processes are started on first use and reused by later batches. They are stopped by close, or at the end of a with block.
+    """
+
+    def __init__(self, max_edit_distance=2, cache_size=65536, processes=1, chunksize=256):
+        """
+        Parameters
+        ----------
+        max_edit_distance: int, optional
+            The maximum edit distance of the SymSpell lookups. Defaults to 2.
+        cache_size: int, optional
+            Number of words whose corrections are cached. Defaults to 65536.
+        processes: int, optional
+            Number of worker processes used to look up the words missing from the cache. Each worker loads the SymSpell dictionary once,
+            when the pool is started. Defaults to 1 (no workers).
+        chunksize: int, optional
+            Number of words sent to a worker at a time. Defaults to 256.
+        """
+        self.max_edit_distance = max_edit_distance
+        self.processes = processes
+        self.chunksize = chunksize
+        self.cache = LRUCache(cache_size)
+        self._pool = None
+
+    def correct_token_lists(self, token_lists):
+        """
+        Corrects the misspelled words of many token lists in place. SOS and EOS tokens are skipped. Returns the token lists.
+        Parameters
+        ----------
+        token_lists: list of list of Token
+            The tokenized sentences to be corrected.
+        """
+        vocabulary = SysmspellSingleton().words
+        positions = {}
+        for list_index, token_list in enumerate(token_lists):
+            for word_pos in range(1, len(token_list) - 1):
+                word = token_list[word_pos].get()
+                if _needs_correction(word, vocabulary):
+                    positions.setdefault(word, []).append((list_index, word_pos))
+        corrections = self.correct_words(positions)
+        for word, word_positions in positions.items():
+            for list_index, word_pos in word_positions:
+                word_token = token_lists[list_index][word_pos]
+                word_token.repr = corrections[word]
+                token_lists[list_index][word_pos] = word_token
+        return token_lists
+
+    def correct_words(self, words):
+        """
+        Corrects misspelled words. Returns a dict of word to correction.
+        Parameters
+        ----------
+        words: iterable of str
+            Words known to be misspelled, as selected by correct_token_lists.
+        """
+        corrections = {}
+        missing = []
+        for word in set(words):
+            correction = self.cache.get(word)
+            if correction is None:
+                missing.append(word)
             else:
-                replacement = _reduce_exaggerations(word)
-            # Takes the case back to the word.
-            if upperfirst:
-                replacement = replacement[0].upper() + replacement[1:]
-            word_token.repr = replacement
-            token_list[word_pos] = word_token
-    return token_list
+                corrections[word] = correction
+        if self.processes > 1 and len(missing) > self.chunksize:
+            if self._pool is None:
+                self._pool = multiprocessing.Pool(self.processes, initializer=SysmspellSingleton)
+            found = self._pool.starmap(_correct_word, [(word, self.max_edit_distance) for word in missing], self.chunksize)
+        else:
+            found = [_correct_word(word, self.max_edit_distance) for word in missing]
+        for word, correction in zip(missing, found):
+            self.cache[word] = correction
+            corrections[word] = correction
+        return corrections
+
+    def cache_info(self):
+        """
+        Returns the hits, misses, maxsize and currsize statistics of the correction cache.
+        """
+        return self.cache.cache_info()
+
+    def clear_cache(self):
+        self.cache.clear()
+
+    def close(self):
+        """
+        Stops the worker processes, if they were started. They are started again if needed by a later batch.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        # Worker pools cannot be pickled. A copy starts its own when needed.
+        state = dict(self.__dict__)
+        state['_pool'] = None
+        return state
+
+
+_spell_corrector = None
+
+
+def _needs_correction(word, vocabulary):
+    return not '\n' in word and word not in string.punctuation and not is_numeric(word) and not (word.lower() in vocabulary)
+
+
+def _correct_word(word, max_edit_distance):
+    suggestions = SysmspellSingleton().lookup(word.lower(), Verbosity.TOP, max_edit_distance)
+    # Checks first uppercase to conserve the case.
+    upperfirst = word[0].isupper()
+    # Checks for correction suggestions.
+    if len(suggestions) > 0:
+        replacement = suggestions[0].term
+    # We call our _reduce_exaggerations function if no suggestion is found. Maybe there are repeated chars.
+    else:
+        replacement = _reduce_exaggerations(word)
+    # Takes the case back to the word.
+    if upperfirst:
+        replacement = replacement[0].upper() + replacement[1:]
+    return replacement
 
 
 def _reduce_exaggerations(text):
@@ -145,20 +380,66 @@ class SysmspellSingleton:
 
     def __new__(cls):
         if cls._instance is None:
-            ##Symspell configuration
-            max_edit_distance_dictionary = 3
-            prefix_length = 4
-            spellchecker = SymSpell(max_edit_distance_dictionary, prefix_length)
-            dictionary_path = pkg_resources.resource_filename(
-                "symspellpy", "frequency_dictionary_en_82_765.txt")
-            bigram_path = pkg_resources.resource_filename(
-                "symspellpy", "frequency_bigramdictionary_en_243_342.txt")
-            spellchecker.load_dictionary(dictionary_path, term_index=0, count_index=1)
-            spellchecker.load_bigram_dictionary(dictionary_path, term_index=0, count_index=2)
-            cls._instance = spellchecker
+            cls._instance = load_symspell()
         return cls._instance
 
 
+symspell_cache_directory = os.environ.get('NLPTOOLS_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'nlptools'))
+
+
+def load_symspell(max_edit_distance_dictionary=3, prefix_length=4, cache_directory=None):
+    """
+    Loads a SymSpell spell checker with the symspellpy english unigram and bigram dictionaries.
+    Building the delete index from the dictionaries takes seconds, so the built index is saved to a cache file the first time, and later
+    calls (in this or any other process) load it from there instead. The cache file name holds a hash of the dictionaries, the parameters
+    and the symspellpy data version, so a change to any of them builds a new index.
+    Parameters
+    ----------
+    max_edit_distance_dictionary: int, optional
+        The maximum edit distance of the delete index. Defaults to 3.
+    prefix_length: int, optional
+        The length of the word prefixes the index is built from. Defaults to 4.
+    cache_directory: str, optional
+        Where the cache files are kept. Defaults to symspell_cache_directory, which is the NLPTOOLS_CACHE_DIR environment variable or
+        ~/.cache/nlptools. If the directory is not writable, the index is built without being cached.
+    """
+    dictionary_path = pkg_resources.resource_filename(
+        "symspellpy", "frequency_dictionary_en_82_765.txt")
+    bigram_path = pkg_resources.resource_filename(
+        "symspellpy", "frequency_bigramdictionary_en_243_342.txt")
+    spellchecker = SymSpell(max_edit_distance_dictionary, prefix_length)
+    cache_path = os.path.join(cache_directory or symspell_cache_directory, "symspell_{}.pickle".format(
+        _symspell_cache_key([dictionary_path, bigram_path], max_edit_distance_dictionary, prefix_length, spellchecker.data_version)))
+    if os.path.exists(cache_path):
+        try:
+            if spellchecker.load_pickle(cache_path, compressed=False):
+                return spellchecker
+        except Exception as error:
+            # A damaged or incompatible cache can fail in many ways, e.g. after a symspellpy upgrade. It is rebuilt and overwritten.
+            warnings.warn("Could not load the SymSpell index cached in {}, rebuilding it: {!r}".format(cache_path, error))
+        spellchecker = SymSpell(max_edit_distance_dictionary, prefix_length)
+    spellchecker.load_dictionary(dictionary_path, term_index=0, count_index=1)
+    spellchecker.load_bigram_dictionary(bigram_path, term_index=0, count_index=2)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Written under a temporary name first, so other processes never load a partial file.
+        temporary_path = "{}.{}.tmp".format(cache_path, os.getpid())
+        spellchecker.save_pickle(temporary_path, compressed=False)
+        os.replace(temporary_path, cache_path)
+    except OSError as error:
+        warnings.warn("Could not cache the SymSpell index in {}: {}".format(cache_path, error))
+    return spellchecker
+
+
+def _symspell_cache_key(paths, max_edit_distance_dictionary, prefix_length, data_version):
+    digest = hashlib.sha1("{} {} {}".format(max_edit_distance_dictionary, prefix_length, data_version).encode('utf-8'))
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()[:16]
+
+
 class Normalizer:
     """
     The basic Normalizer object. It houses many different normalizer methods for different inputs.
@@ -176,19 +457,52 @@ class Normalizer:
     post_tokenization_functions = {'normalize_contractions': normalize_contractions,
                                    'spell_correction': spell_correction,
                                    'remove_stopwords': remove_stopwords}
+    # Post-tokenization steps that can process many token lists at once.
+    post_tokenization_batch_functions = {'spell_correction': batch_spell_correction}
+    # Post-tokenization steps used by compiled Normalizers. They transform the token lists in place.
+    compiled_post_tokenization_functions = {'normalize_contractions': batch_normalize_contractions,
+                                            'spell_correction': batch_spell_correction,
+                                            'remove_stopwords': batch_remove_stopwords}
 
     def __init__(self, pre_tokenization_steps=['simplify_punctuation', 'normalize_whitespace'],
-                 post_tokenization_steps=['normalize_contractions', 'spell_correction']):
+                 post_tokenization_steps=['normalize_contractions', 'spell_correction'], compiled=False):
         """
         -----------
         Attributes:
         -----------
         steps: list of function
             A list of normalization functions - order matters. Default: simplify_punctuation, normalize_whitespace, normalize_contractions, spell_correction.
+        compiled: boolean, optional
+            Whether to compile the steps into a fused pipeline. Consecutive pre-tokenization steps with rules in pre_tokenization_rules run
+            as a single regular expression pass, and post-tokenization steps transform the token lists in place, so each string is
+            tokenized and untokenized only once. Gives the same results. Defaults to False.
         """
 
         self.pre_tokenization_steps = [self.pre_tokenization_functions[step] for step in pre_tokenization_steps]
         self.post_tokenization_steps = [self.post_tokenization_functions[step] for step in post_tokenization_steps]
+        self.pre_tokenization_step_names = list(pre_tokenization_steps)
+        self.post_tokenization_step_names = list(post_tokenization_steps)
+        self.compiled = compiled
+        if compiled:
+            self.pre_tokenization_steps = self._fuse_pre_tokenization_steps(pre_tokenization_steps)
+            self._post_tokenization_batch_steps = [self.compiled_post_tokenization_functions.get(step) for step in post_tokenization_steps]
+        else:
+            self._post_tokenization_batch_steps = [self.post_tokenization_batch_functions.get(step) for step in post_tokenization_steps]
+
+    def _fuse_pre_tokenization_steps(self, step_names):
+        steps = []
+        fusable = []
+        for step in step_names:
+            if step in pre_tokenization_rules:
+                fusable.append(step)
+                continue
+            if fusable:
+                steps.append(FusedSubstitution(fusable))
+                fusable = []
+            steps.append(self.pre_tokenization_functions[step])
+        if fusable:
+            steps.append(FusedSubstitution(fusable))
+        return steps
 
     def normalize_string(self, input_string):
         """
@@ -201,17 +515,38 @@ class Normalizer:
 
         """
 
-        if input_string is None:
-            return ''
-        normalized_string = str(input_string)
-        for pre_tokenization_step in self.pre_tokenization_steps:
-            normalized_string = pre_tokenization_step(normalized_string)
-        tokens = tokenize(normalized_string)
-        for post_tokenization_step in self.post_tokenization_steps:
-            tokens = post_tokenization_step(tokens)
-        return untokenize(tokens)
-
-    def normalize_document(self, input_document):
+        return self.normalize_strings([input_string])[0]
+
+    def normalize_strings(self, input_strings):
+        """
+        Normalizes many strings at once, returning a list of strings. Post-tokenization steps that support batches, like spell_correction, run
+        once over the tokens of every string, so each distinct misspelled word is corrected only once. None and strings left without any word,
+        like whitespace only strings, are normalized to an empty string.
+        -----------
+        Attributes:
+        -----------
+        input_strings: iterable of string
+            strings to be normalized.
+        """
+
+        pre_normalized_strings = []
+        for input_string in input_strings:
+            normalized_string = ''
+            if input_string is not None:
+                normalized_string = str(input_string)
+                for pre_tokenization_step in self.pre_tokenization_steps:
+                    normalized_string = pre_tokenization_step(normalized_string)
+            pre_normalized_strings.append(normalized_string)
+        token_lists = [tokenize(normalized_string) for normalized_string in pre_normalized_strings if normalized_string]
+        for post_tokenization_step, batch_step in zip(self.post_tokenization_steps, self._post_tokenization_batch_steps):
+            if batch_step is not None:
+                token_lists = batch_step(token_lists)
+            else:
+                token_lists = [post_tokenization_step(tokens) for tokens in token_lists]
+        normalized_strings = iter([_untokenize_words(tokens) for tokens in token_lists])
+        return [next(normalized_strings) if normalized_string else '' for normalized_string in pre_normalized_strings]
+
+    def normalize_document(self, input_document, alignment=False):
         """
         Does basic normalization on Document objects. This should not be used after tagging since it loses all tags.
         -----------
@@ -219,6 +554,11 @@ class Normalizer:
         -----------
         input_document: Document
             Document to be normalized.
+        alignment: boolean, optional
+            Whether to also map the normalized Document back to input_document. The normalized Document is then built directly from the
+            sentences of input_document and their normalized tokens, instead of sentencizing and tokenizing the normalized text again, and
+            a (Document, Alignment) pair is returned. The Alignment maps spans of the normalized text to spans of the original text, e.g.
+            to find where an entity found in the normalized text comes from. The normalized text is the same. Defaults to False.
         """
 
         warnings.warn(
@@ -226,13 +566,71 @@ class Normalizer:
         if not isinstance(input_document, Document):
             raise TypeError(
                 message="Wrong argument provided. Please, ensure that the input is of type core.structures.Document")
-        sentences = input_document.sentences
-        new_sentences = []
-        for sentence in sentences:
-            new_sentences.append(self.normalize_string(sentence))
+        if alignment:
+            return self._normalize_document_aligned(input_document)
+        new_sentences = self.normalize_strings(input_document.sentences)
         new_raw_document = " ".join(new_sentences)
         return Document(new_raw_document.strip(" "))
 
+    def _normalize_document_aligned(self, input_document):
+        """
+        Normalizes a Document keeping the positions of every token, see normalize_document. The pre-tokenization steps run as a
+        FusedSubstitution that records the replaced regions, and the post-tokenization steps are the compiled ones, which keep the spans
+        of the tokens they change. Both give the same results as the other modes.
+        """
+        substitution = FusedSubstitution(self.pre_tokenization_step_names) if self.pre_tokenization_step_names else None
+        token_lists = []
+        substitutions = []
+        for sentence in input_document.sentences:
+            normalized_string, regions = substitution.substitute(sentence.get()) if substitution is not None else (sentence.get(), [])
+            leading_spaces = 0
+            stripped_string = normalized_string
+            if substitution is not None and substitution.strip:
+                stripped_string = normalized_string.strip(" ")
+                leading_spaces = len(normalized_string) - len(normalized_string.lstrip(" "))
+            token_lists.append(tokenize(stripped_string))
+            substitutions.append((regions, [region[0] for region in regions], leading_spaces))
+        for step in self.post_tokenization_step_names:
+            token_lists = self.compiled_post_tokenization_functions[step](token_lists)
+
+        sentence_strings = []
+        sentence_tokens = []
+        for token_list in token_lists:
+            sentence_string, token_spans = _untokenize_spans(token_list)
+            sentence_strings.append(sentence_string)
+            sentence_tokens.append(token_spans)
+        joined_document = " ".join(sentence_strings)
+        new_raw_document = joined_document.strip(" ")
+        # Position of the next sentence in the normalized text, which is stripped like in the other modes.
+        position = len(joined_document.lstrip(" ")) - len(joined_document)
+        new_sentences = []
+        starts, ends, original_starts, original_ends = [], [], [], []
+        for sentence, sentence_string, token_spans, (regions, region_starts, leading_spaces) in zip(
+                input_document.sentences, sentence_strings, sentence_tokens, substitutions):
+            if sentence_string:
+                new_tokens = [Token(0, 0, sentence_string, SOS=True)]
+                # Without replaced regions, tokens are only shifted by the sentence position and the stripped spaces.
+                original_offset = sentence.start_pos + leading_spaces
+                for token, start, end in token_spans:
+                    new_tokens.append(Token(start, end, sentence_string))
+                    starts.append(position + start)
+                    ends.append(position + end)
+                    if regions:
+                        original_starts.append(
+                            sentence.start_pos + _original_position(regions, region_starts, token.start_pos + leading_spaces))
+                        original_ends.append(
+                            sentence.start_pos + _original_position(regions, region_starts, token.end_pos + leading_spaces, end=True))
+                    else:
+                        original_starts.append(original_offset + token.start_pos)
+                        original_ends.append(original_offset + token.end_pos)
+                new_tokens.append(Token(len(sentence_string), len(sentence_string), sentence_string, EOS=True))
+                for previous, token in zip(new_tokens, new_tokens[1:]):
+                    previous.next_token = token
+                    token.previous_token = previous
+                new_sentences.append(Sentence(position, position + len(sentence_string), new_raw_document, tokens=new_tokens))
+            position += len(sentence_string) + 1
+        return Document(new_raw_document, sentences=new_sentences), Alignment(starts, ends, original_starts, original_ends)
+
     def normalize_sentence(self, input_sentence):
         """
         Does basic normalization on Sentence objects. Should only be used on standalone sentences, since it breaks relation with parent Document.
@@ -268,3 +666,224 @@ class Normalizer:
         normalized_document = self.normalize_document(document_to_normalize)
 
         return normalized_document.raw
+
+    def normalize_files(self, inputs, output_directory, pattern='*.txt', processes=None, max_in_flight=None, batch_size=256,
+                        encoding='utf-8', show_progress=True):
+        """
+        Normalizes many text files in a process pool, writing one normalized file per input file. Each file is read as a DocumentStream
+        and normalized in batches of sentences, and the output is written as it is produced, so memory stays bounded however large the
+        files are. The output of a file is the same as normalize_raw_document. Outputs are written under a temporary name and renamed
+        when complete.
+        Returns a dict with the number of files, sentences and bytes processed, and the elapsed seconds.
+        -----------
+        Attributes:
+        -----------
+        inputs: str or list of str
+            Files, directories or glob patterns. Directories are searched recursively for files matching pattern.
+        output_directory: str
+            Where the normalized files are written, keeping their path relative to the input directory (or glob base).
+        pattern: str, optional
+            The glob pattern of the files taken from directories. Defaults to '*.txt'.
+        processes: int, optional
+            Number of worker processes. Each worker loads the normalization resources once. With 1, files are normalized in the calling
+            process. Defaults to the number of CPUs.
+        max_in_flight: int, optional
+            Maximum number of files submitted to the pool and not yet finished. Defaults to twice the number of processes.
+        batch_size: int, optional
+            Number of sentences normalized at a time. Defaults to 256.
+        encoding: str, optional
+            Encoding of the input and output files. Defaults to utf-8.
+        show_progress: boolean, optional
+            Whether to show a tqdm progress bar with the file and byte throughput. Defaults to True.
+        """
+
+        processes = processes or os.cpu_count() or 1
+        max_in_flight = max(1, max_in_flight or 2 * processes)
+        jobs = [(path, os.path.join(output_directory, relative_path), batch_size, encoding)
+                for path, relative_path in _expand_input_files(inputs, pattern)]
+        if 'spell_correction' in self.post_tokenization_step_names:
+            # Loaded before the pool starts, so forked workers share it instead of each loading their own.
+            SysmspellSingleton()
+        summary = {'files': 0, 'sentences': 0, 'bytes': 0, 'seconds': 0.0}
+        start = time.time()
+        with tqdm(total=len(jobs), unit='file', disable=not show_progress) as progress:
+            for sentences, size in self._run_file_jobs(jobs, processes, max_in_flight):
+                summary['files'] += 1
+                summary['sentences'] += sentences
+                summary['bytes'] += size
+                progress.update(1)
+                progress.set_postfix(MBps='{:.2f}'.format(summary['bytes'] / 1e6 / max(time.time() - start, 1e-9)), refresh=False)
+        summary['seconds'] = time.time() - start
+        return summary
+
+    def _run_file_jobs(self, jobs, processes, max_in_flight):
+        """
+        Yields the result of each file job, in order. At most max_in_flight jobs are pending in the pool at any time.
+        """
+        if processes == 1:
+            for job in jobs:
+                yield _normalize_file(self, *job)
+            return
+        with multiprocessing.Pool(processes, initializer=_init_file_worker, initargs=(self,)) as pool:
+            pending = collections.deque()
+            for job in jobs:
+                if len(pending) >= max_in_flight:
+                    yield pending.popleft().get()
+                pending.append(pool.apply_async(_normalize_file_in_worker, job))
+            while pending:
+                yield pending.popleft().get()
+
+
+def _untokenize_words(token_list):
+    """
+    Untokenizes a token list like untokenize, but token lists without any word token, only SOS and EOS, give an empty string.
+    """
+    if all(token.SOS or token.EOS for token in token_list):
+        return ''
+    return untokenize(token_list)
+
+
+def _untokenize_spans(token_list):
+    """
+    Untokenizes a token list like _untokenize_words, also returning the (token, start, end) span of each word token in the resulting string.
+    Blanked tokens, like removed stopwords, add nothing to the string and are left out of the spans.
+    """
+    if all(token.SOS or token.EOS for token in token_list):
+        return '', []
+    if len(token_list) < 3:
+        return untokenize(token_list), []
+    punctuation = "!:?.;,\n"
+    parts = []
+    token_spans = []
+    length = 0
+    for token in token_list[1:-1]:
+        word = token.get()
+        if not word in punctuation:
+            parts.append(" ")
+            length += 1
+        parts.append(word)
+        if word:
+            token_spans.append((token, length, length + len(word)))
+        length += len(word)
+    joined = "".join(parts)
+    stripped = joined.strip(" ")
+    leading_spaces = len(joined) - len(joined.lstrip(" "))
+    return stripped, [(token, start - leading_spaces, end - leading_spaces) for token, start, end in token_spans]
+
+
+def _expand_input_files(inputs, pattern):
+    """
+    Lists the (path, relative output path) pairs of the files given as files, directories or glob patterns.
+    """
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    files = []
+    for input_path in inputs:
+        if os.path.isdir(input_path):
+            base = input_path
+            paths = glob.glob(os.path.join(glob.escape(input_path), '**', pattern), recursive=True)
+        elif glob.has_magic(input_path):
+            base = input_path
+            while glob.has_magic(base):
+                base = os.path.dirname(base)
+            paths = glob.glob(input_path, recursive=True)
+        else:
+            base = os.path.dirname(input_path)
+            paths = [input_path]
+        files.extend((path, os.path.relpath(path, base or '.')) for path in sorted(paths) if os.path.isfile(path))
+    return files
+
+
+def _normalize_file(normalizer, path, output_path, batch_size, encoding):
+    """
+    Normalizes one file into output_path, streaming both. Returns the number of sentences and the size of the input file in bytes.
+    """
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    temporary_path = "{}.{}.tmp".format(output_path, os.getpid())
+    sentences = 0
+    with open(path, 'r', encoding=encoding) as input_file, open(temporary_path, 'w', encoding=encoding) as output_file:
+        writer = _StrippedWriter(output_file)
+        batch = []
+        for sentence in DocumentStream(input_file):
+            batch.append(sentence)
+            if len(batch) >= batch_size:
+                writer.write_sentences(normalizer.normalize_strings(batch))
+                sentences += len(batch)
+                batch = []
+        if batch:
+            writer.write_sentences(normalizer.normalize_strings(batch))
+            sentences += len(batch)
+    os.replace(temporary_path, output_path)
+    return sentences, os.path.getsize(path)
+
+
+class _StrippedWriter:
+    """
+    Writes sentences joined by spaces to a file, leaving out the leading and trailing spaces of the whole text, as str.strip(" ") would.
+    """
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.started = False
+        self.pending_spaces = ''
+
+    def write_sentences(self, sentences):
+        for sentence in sentences:
+            self.write(" " + sentence if self.started else sentence)
+
+    def write(self, text):
+        if not self.started:
+            text = text.lstrip(" ")
+            if not text:
+                return
+            self.started = True
+        body = text.rstrip(" ")
+        if body:
+            self.output_file.write(self.pending_spaces + body)
+            self.pending_spaces = text[len(body):]
+        else:
+            self.pending_spaces += text
+
+
+_file_worker_normalizer = None
+
+
+def _init_file_worker(normalizer):
+    global _file_worker_normalizer
+    _file_worker_normalizer = normalizer
+
+
+def _normalize_file_in_worker(path, output_path, batch_size, encoding):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return _normalize_file(_file_worker_normalizer, path, output_path, batch_size, encoding)
+
+
+def main(argv=None):
+    """
+    Console entry point: normalizes the text files given as files, directories or glob patterns into an output directory.
+    """
+    parser = argparse.ArgumentParser(prog='nlptools-normalize', description=main.__doc__.strip())
+    parser.add_argument('inputs', nargs='+', help="Text files, directories or glob patterns.")
+    parser.add_argument('-o', '--output-directory', required=True, help="Where the normalized files are written.")
+    parser.add_argument('--pattern', default='*.txt', help="Glob pattern of the files taken from directories. Defaults to '*.txt'.")
+    parser.add_argument('--pre-tokenization-steps', nargs='*', default=['simplify_punctuation', 'normalize_whitespace'],
+                        choices=sorted(Normalizer.pre_tokenization_functions))
+    parser.add_argument('--post-tokenization-steps', nargs='*', default=['normalize_contractions', 'spell_correction'],
+                        choices=sorted(Normalizer.post_tokenization_functions))
+    parser.add_argument('--compiled', action='store_true', help="Use a compiled Normalizer, which fuses the normalization steps.")
+    parser.add_argument('-p', '--processes', type=int, default=None, help="Number of worker processes. Defaults to the number of CPUs.")
+    parser.add_argument('--max-in-flight', type=int, default=None, help="Maximum number of files pending in the pool.")
+    parser.add_argument('--batch-size', type=int, default=256, help="Number of sentences normalized at a time.")
+    parser.add_argument('--encoding', default='utf-8')
+    parser.add_argument('-q', '--quiet', action='store_true', help="Do not show the progress bar.")
+    arguments = parser.parse_args(argv)
+    normalizer = Normalizer(arguments.pre_tokenization_steps, arguments.post_tokenization_steps, compiled=arguments.compiled)
+    summary = normalizer.normalize_files(arguments.inputs, arguments.output_directory, pattern=arguments.pattern,
+                                         processes=arguments.processes, max_in_flight=arguments.max_in_flight,
+                                         batch_size=arguments.batch_size, encoding=arguments.encoding, show_progress=not arguments.quiet)
+    print("Normalized {files} files ({sentences} sentences, {megabytes:.2f} MB) in {seconds:.2f}s: {rate:.2f} files/s, {throughput:.2f} MB/s.".format(
+        megabytes=summary['bytes'] / 1e6, rate=summary['files'] / max(summary['seconds'], 1e-9),
+        throughput=summary['bytes'] / 1e6 / max(summary['seconds'], 1e-9), **summary))
+    return 0
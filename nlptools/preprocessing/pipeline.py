@@ -0,0 +1,140 @@
+import multiprocessing
+import os
+import warnings
+
+from ..core.structures import Document
+from .lemmatization import DictionaryLemmatizer
+from .normalization import Normalizer, SysmspellSingleton
+from .tagging import MLTagger
+
+
+class BatchPipeline:
+    """
+    Runs the sentencize -> normalize -> tag -> lemmatize pipeline over many texts, fanning the work out over a process pool.
+    Each worker process loads the heavy resources (the CRF model, the lemma dictionary and the SymSpell dictionary) only once, when it starts.
+    Results are yielded as Documents, in the same order as the input texts. Lemmas are stored in the lemma attribute of each Token.
+    Attributes
+    ----------
+    normalize: boolean
+        Whether to normalize the texts.
+    tag: boolean
+        Whether to tag the sentences with MLTagger.
+    lemmatize: boolean
+        Whether to lemmatize the tokens with DictionaryLemmatizer. Requires tag.
+    pre_tokenization_steps: list of str
+        The Normalizer pre-tokenization steps.
+    post_tokenization_steps: list of str
+        The Normalizer post-tokenization steps.
+    compiled_normalization: boolean
+        Whether to use a compiled Normalizer, which fuses the normalization steps.
+    tagger_model: str
+        The MLTagger model name.
+    force_ud: boolean
+        Whether the tags stored in the tokens are converted to UD. Lemmatization always uses UD tags.
+    processes: int
+        Number of worker processes. With 1, texts are processed in the calling process.
+    chunksize: int
+        Number of texts sent to a worker at a time. The sentences of a chunk are tagged in a single batch.
+    """
+
+    def __init__(self, normalize=True, tag=True, lemmatize=True,
+                 pre_tokenization_steps=['simplify_punctuation', 'normalize_whitespace'],
+                 post_tokenization_steps=['normalize_contractions', 'spell_correction'], tagger_model='penn_crf',
+                 force_ud=False, processes=None, chunksize=16, compiled_normalization=False):
+        if lemmatize and not tag:
+            raise AttributeError("Lemmatization needs tagged tokens. Please, enable tagging or disable lemmatization.")
+        self.normalize = normalize
+        self.tag = tag
+        self.lemmatize = lemmatize
+        self.pre_tokenization_steps = list(pre_tokenization_steps)
+        self.post_tokenization_steps = list(post_tokenization_steps)
+        self.compiled_normalization = compiled_normalization
+        self.tagger_model = tagger_model
+        self.force_ud = force_ud
+        self.processes = processes if processes is not None else os.cpu_count() or 1
+        self.chunksize = chunksize
+
+    def process(self, texts):
+        """
+        Processes an iterable of raw texts. Returns a generator of Documents, in the same order as the input.
+        Arguments:
+        ----------
+        texts: iterable of str
+            The raw texts to be processed.
+        """
+        if self.processes == 1:
+            worker = _PipelineWorker(self._config())
+            for chunk in _chunks(texts, self.chunksize):
+                for document in worker.process_many(chunk):
+                    yield document
+            return
+        with multiprocessing.Pool(self.processes, initializer=_init_worker, initargs=(self._config(),)) as pool:
+            for documents in pool.imap(_process_texts, _chunks(texts, self.chunksize)):
+                for document in documents:
+                    yield document
+
+    def __call__(self, texts):
+        return self.process(texts)
+
+    def _config(self):
+        return {'normalize': self.normalize, 'tag': self.tag, 'lemmatize': self.lemmatize,
+                'pre_tokenization_steps': self.pre_tokenization_steps,
+                'post_tokenization_steps': self.post_tokenization_steps, 'compiled_normalization': self.compiled_normalization,
+                'tagger_model': self.tagger_model, 'force_ud': self.force_ud}
+
+
+class _PipelineWorker:
+    """
+    Holds the resources of one worker and processes a chunk of texts at a time.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.normalizer = None
+        self.tagger = None
+        self.lemmatizer = None
+        if config['normalize']:
+            self.normalizer = Normalizer(config['pre_tokenization_steps'], config['post_tokenization_steps'],
+                                         compiled=config['compiled_normalization'])
+            if 'spell_correction' in config['post_tokenization_steps']:
+                SysmspellSingleton()
+        if config['tag']:
+            self.tagger = MLTagger(config['tagger_model'], force_ud=config['force_ud'])
+        if config['lemmatize']:
+            self.lemmatizer = DictionaryLemmatizer()
+
+    def process_many(self, texts):
+        documents = [Document(text) for text in texts]
+        if self.normalizer is not None:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                documents = [self.normalizer.normalize_document(document) for document in documents]
+        if self.tagger is not None:
+            self.tagger.tag_many([sentence for document in documents for sentence in document.sentences])
+        if self.lemmatizer is not None:
+            for document in documents:
+                self.lemmatizer.lemmatize_document(document)
+        return documents
+
+
+_worker = None
+
+
+def _init_worker(config):
+    global _worker
+    _worker = _PipelineWorker(config)
+
+
+def _process_texts(texts):
+    return _worker.process_many(texts)
+
+
+def _chunks(texts, chunksize):
+    chunk = []
+    for text in texts:
+        chunk.append(text)
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
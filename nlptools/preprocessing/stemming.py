@@ -1,7 +1,9 @@
+import re
 import sys
+from functools import lru_cache
 
 sys.path.append('../../')
-from ..core.structures import Token
+from ..core.structures import Document, Sentence, Token
 
 class AbstractStemmer:
     """An Interface to allow for other stemmers to be built. If you want to implement your stemmer, inherit from this class and implement the stem method."""
@@ -9,6 +11,40 @@ class AbstractStemmer:
     def stem(self, word):
         pass
 
+    def stem_sentence(self, sentence):
+        """
+        Stems every token of a Sentence, storing the results in the stem attribute of each Token. Each distinct word is stemmed only once.
+        Returns the Sentence.
+        Parameters
+        ----------
+        sentence: Sentence or str
+            The sentence to be stemmed.
+        """
+        if not isinstance(sentence, Sentence):
+            sentence = Sentence(0, len(sentence), sentence)
+        self._stem_tokens(sentence.tokens[1:-1])
+        return sentence
+
+    def stem_document(self, document):
+        """
+        Stems every token of a Document, storing the results in the stem attribute of each Token. Each distinct word is stemmed only once.
+        Returns the Document.
+        Parameters
+        ----------
+        document: Document or str
+            The document to be stemmed.
+        """
+        if not isinstance(document, Document):
+            document = Document(document)
+        self._stem_tokens([token for sentence in document.sentences for token in sentence.tokens[1:-1]])
+        return document
+
+    def _stem_tokens(self, tokens):
+        words = [token.get() for token in tokens]
+        stems = {word: self.stem(word) for word in set(words)}
+        for token, word in zip(tokens, words):
+            token.stem = stems[word]
+
 class PorterStemmer(AbstractStemmer):
     """One of the most famous implementations of stemmers. Simple and straightforward, it gets the work done.
     It is based on a measure named {m} and have 5 consecutive steps to achieve the desired output.
@@ -28,6 +64,36 @@ class PorterStemmer(AbstractStemmer):
     special_case = "y"
     vowels = "aeiou"
 
+    # Suffix tables, in the order they are tested, compiled below into lookups indexed by the last letter of the suffix.
+    step_2_suffixes = [('ational','ate'), ('tional','tion'), ('enci','ence'), ('anci','ance'), ('izer', 'ize'),
+                       ('abli','able'), ('alli','al'), ('entli', 'ent'), ('eli', 'e'), ('ousli', 'ous'), ('ization', 'ize'),
+                       ('ation', 'ate'), ('ator', 'ate'), ('alism', 'al'), ('iveness', 'ive'), ('fulness', 'ful'),
+                       ('ousness', 'ous'), ('aliti','al'), ('ivit', 'ive'), ('biliti','ble')]
+    step_3_suffixes = [('icate','ic'),('ative',''),('alize','al'),('iciti','ic'),('ical','ic'),('ful',''),('ness','')]
+    # 'ion' is only removed after 's' or 't'.
+    step_4_suffixes = [('al',''),('ance',''),('ence',''),('er',''),('ic',''),('able',''),('ible',''),('ant',''),('ement',''),
+                       ('ment',''),('ent',''),('ion','st'),('ou',''),('ism',''),('ate',''),('iti',''),('ous',''),('ive',''),('ize','')]
+
+    def __init__(self, cache_size=65536):
+        """
+        Parameters
+        ----------
+        cache_size: int, optional
+            Number of words whose stems are kept in a least recently used cache. Defaults to 65536.
+        """
+        self.cache_size = cache_size
+        self._cached_stem = lru_cache(maxsize=cache_size)(self._stem)
+
+    def __getstate__(self):
+        # The stem cache wraps a bound method, which cannot be pickled. It is rebuilt empty on unpickling.
+        state = dict(self.__dict__)
+        del state['_cached_stem']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cached_stem = lru_cache(maxsize=self.cache_size)(self._stem)
+
     def stem(self, word):
         """
         Applies stemming to a word.
@@ -39,6 +105,18 @@ class PorterStemmer(AbstractStemmer):
 
         if isinstance(word, Token):
             word = word.get()
+        return self._cached_stem(word)
+
+    def cache_info(self):
+        """
+        Returns the hits, misses, maxsize and currsize statistics of the stem cache.
+        """
+        return self._cached_stem.cache_info()
+
+    def clear_cache(self):
+        self._cached_stem.cache_clear()
+
+    def _stem(self, word):
         stem = word.lower().strip()
         stem = self._porter_step_1(stem)
         stem = self._porter_step_2(stem)
@@ -47,76 +125,6 @@ class PorterStemmer(AbstractStemmer):
         stem = self._porter_step_5(stem)
         return stem
 
-    def _divide_into_groups(self, word):
-        """
-        Divides a string into groups of consonants or vowels. Outputs a list of strings with the letters grouped.
-        Parameters
-        ----------
-        word: str
-            Word to be divided into groups.
-        """
-
-        groups = []
-        preceding = ""
-        for idx, letter in enumerate(word.lower()):
-            if preceding == "":
-                preceding = letter
-            else:
-                if self._compare_same_class(preceding, letter):
-                    preceding+= letter
-                    if idx == len(word)-1:
-                        groups.append(preceding)
-                else:
-                    groups.append(preceding)
-                    preceding = letter
-                    if idx == len(word)-1:
-                        groups.append(letter)
-        return groups
-
-    def _compare_same_class(self, l1, l2):
-        """
-        Compares two letters (characters) to see if the belong to the same class (consonant or vowel). Outputs a boolean with the result of the comparison.
-        Parameters
-        ----------
-        l1: str
-            First letter.
-        l2: str
-            Second letter.
-        """
-
-        if l1 in self.consonants and l2 in self.consonants:
-            return True
-        elif l1 in self.vowels and l2 in self.vowels:
-            return True
-        else:
-            return False
-        return False
-
-    def _determine_class(self, group):
-        """
-        Determines a class of a group of letters (string). Outputs either 'C' or 'V'.
-        Parameters
-        ----------
-        group: str or list of char
-            The letter group to be checked. Usually a substring derived from a word composed of all consonants or all vowels.
-        """
-
-        if group[0] in self.consonants:
-            return 'C'
-        return 'V'
-
-    def _encode_word(self, word):
-        """
-        Takes an entire word and encodes it into a list of 'C' (consonat) and 'V' (vowel) groups.
-        Parameters
-        ----------
-        word: str
-            Word to be encoded.
-        """
-        encoded = self._divide_into_groups(word)
-        classified = [self._determine_class(group) for group in encoded]
-        return classified
-
     def _det_m(self, word):
         """
         Determinse the number of {m} or the number of times the grouping CV repeats in the word. If there's less than one CV between the first consonant and last vowel, the number is 0.
@@ -124,20 +132,19 @@ class PorterStemmer(AbstractStemmer):
         * Tree, by: m = 0
         * Trouble, oats, trees, ivy: m = 1
         * Troubles, private, oaten: m = 2
+        The word is split into letter groups by a single compiled regular expression. A group goes on while its letters are consecutive in consonants (or vowels),
+        and takes at most one more letter of the same class. Any other character ('y' included) is a group of its own, counted as a vowel.
+        m is half the number of groups, leaving out a leading consonant group and a trailing vowel group.
         Parameters
         ----------
         word: str
             Word to have {m} calculated.
         """
-        classes = self._encode_word(word)
-        if len(classes) < 2:
+        groups = _letter_groups.findall(word)
+        if len(groups) < 2:
             return 0
-        if classes[0] == 'C':
-            classes = classes[1:]
-        if classes[-1] == 'V':
-            classes = classes[:len(classes)-1]
-        m = len(classes)//2 if (len(classes)/2) >= 1 else 0
-        return m
+        # Each group is a pair of strings, the first being non-empty for consonant groups.
+        return (len(groups) - bool(groups[0][0]) - (not groups[-1][0])) // 2
 
     def _chk_LT(self, stem, lt):
         """
@@ -164,10 +171,7 @@ class PorterStemmer(AbstractStemmer):
             The stem to check the condition.
         """
 
-        for letter in stem:
-            if letter in self.vowels:
-                return True
-        return False
+        return not _vowel_set.isdisjoint(stem)
 
     def _chk_d(self, stem):
         """
@@ -254,14 +258,8 @@ class PorterStemmer(AbstractStemmer):
             The stem to be further stemmed.
         """
 
-        pair_tests = [('ational','ate'), ('tional','tion'), ('enci','ence'), ('anci','ance'), ('izer', 'ize'),
-                      ('abli','able'), ('alli','al'), ('entli', 'ent'), ('eli', 'e'), ('ousli', 'ous'), ('ization', 'ize'),
-                      ('ation', 'ate'), ('ator', 'ate'), ('alism', 'al'), ('iveness', 'ive'), ('fulness', 'ful'),
-                      ('ousness', 'ous'), ('aliti','al'), ('ivit', 'ive'), ('biliti','ble')]
         if self._det_m(stem) > 0:
-            for term, subs in pair_tests:
-                if stem.endswith(term):
-                    return stem[:-len(term)]+subs
+            return _replace_suffix(stem, _step_2_table)
         return stem
 
     def _porter_step_3(self, stem):
@@ -273,11 +271,8 @@ class PorterStemmer(AbstractStemmer):
             The stem to be further stemmed.
         """
 
-        pair_tests = [('icate','ic'),('ative',''),('alize','al'),('iciti','ic'),('ical','ic'),('ful',''),('ness','')]
         if self._det_m(stem) > 0:
-            for term, subs in pair_tests:
-                if stem.endswith(term):
-                    return stem[:-len(term)]+subs
+            return _replace_suffix(stem, _step_3_table)
         return stem
 
     def _porter_step_4(self, stem):
@@ -289,20 +284,12 @@ class PorterStemmer(AbstractStemmer):
             The stem to be further stemmed.
         """
 
-        suffixes_1 = ['al','ance','ence','er','ic','able','ible','ant','ement','ment','ent']
-        special_case = 'ion'
-        suffixes_2 = ['ou','ism','ate','iti','ous','ive','ize']
         if self._det_m(stem)>1:
-            for suffix in suffixes_1:
-                if stem.endswith(suffix):
-                    return stem[:-len(suffix)]
-            if stem.endswith(special_case):
-                temp = stem[:-len(special_case)]
-                if self._chk_LT(temp, 'st'):
-                    return temp
-            for suffix in suffixes_2:
+            for suffix, preceding in _step_4_table.get(stem[-1], ()):
                 if stem.endswith(suffix):
-                    return stem[:-len(suffix)]
+                    temp = stem[:-len(suffix)]
+                    if not preceding or self._chk_LT(temp, preceding):
+                        return temp
         return stem
 
     def _porter_step_5(self, stem):
@@ -315,12 +302,58 @@ class PorterStemmer(AbstractStemmer):
         """
 
         temp = stem
+        m = self._det_m(temp)
         #Step 5a
-        if self._det_m(temp)>1 and temp.endswith('e'):
+        if m>1 and temp.endswith('e'):
             temp = temp[:-1]
-        elif self._det_m(temp) == 1 and (not self._chk_o(temp)) and temp.endswith('e') and len(temp) > 4:
+            m = self._det_m(temp)
+        elif m == 1 and (not self._chk_o(temp)) and temp.endswith('e') and len(temp) > 4:
             temp = temp[:-1]
+            m = self._det_m(temp)
         #Step 5b
-        if self._det_m(temp) > 1 and self._chk_d(temp) and self._chk_LT(temp, 'l'):
+        if m > 1 and self._chk_d(temp) and self._chk_LT(temp, 'l'):
             temp = temp[:-1]
         return temp
+
+
+def _letter_run(letters):
+    """
+    A pattern matching a run of letters that are consecutive in letters, followed by at most one more of them.
+    """
+    alternatives = []
+    for start in range(len(letters)):
+        run = ""
+        for letter in reversed(letters[start:]):
+            run = letter + ("(?:" + run + ")?" if run else "")
+        alternatives.append(run)
+    return "(?:" + "|".join(alternatives) + ")[" + letters + "]?"
+
+
+# One match per letter group, as split by PorterStemmer._det_m. Any character other than consonants and vowels is a group of its own.
+_letter_groups = re.compile("(" + _letter_run(PorterStemmer.consonants) + ")|(" + _letter_run(PorterStemmer.vowels) + ")|.", re.DOTALL)
+_vowel_set = frozenset(PorterStemmer.vowels)
+
+
+def _compile_suffix_table(pairs):
+    """
+    Indexes (suffix, value) pairs by the last letter of the suffix, keeping their order.
+    """
+    table = {}
+    for suffix, value in pairs:
+        table.setdefault(suffix[-1], []).append((suffix, value))
+    return table
+
+
+def _replace_suffix(stem, table):
+    """
+    Replaces the first suffix of the table that the stem ends with.
+    """
+    for suffix, replacement in table.get(stem[-1], ()):
+        if stem.endswith(suffix):
+            return stem[:-len(suffix)]+replacement
+    return stem
+
+
+_step_2_table = _compile_suffix_table(PorterStemmer.step_2_suffixes)
+_step_3_table = _compile_suffix_table(PorterStemmer.step_3_suffixes)
+_step_4_table = _compile_suffix_table(PorterStemmer.step_4_suffixes)
@@ -1,9 +1,15 @@
+import multiprocessing
 import os
-import pickle
 import re
+from functools import lru_cache
+from types import MappingProxyType
 
 # sys.path.append('../')
 from ..core.structures import Sentence
+from ..utils.resources import get_resource
+from ..utils.tagsets import penn_to_ud, ud_tags
+
+_alphanumeric = re.compile('^(?=.*[0-9]$)(?=.*[a-zA-Z])')
 
 
 class AbstractTagger:
@@ -14,88 +20,152 @@ class AbstractTagger:
 class MLTagger(AbstractTagger):
     models_directory = os.path.join(os.path.dirname(__file__), "../preloaded/models/pos_tagging/")
     models = {'penn_crf': ('penn_treebank_crf_postagger.sav', 'sklearn'), 'ud_crf': ('ud_crf_postagger.sav', 'sklearn')}
+    ud_tags = ud_tags
 
-    def __init__(self, model='penn_crf', force_ud=False):
+    def __init__(self, model='penn_crf', force_ud=False, feature_cache_size=65536):
+        """
+        Parameters
+        ----------
+        model: str, optional
+            The model name, one of the keys of models. Models are loaded once and shared by every MLTagger. Defaults to 'penn_crf'.
+        force_ud: boolean, optional
+            Whether to convert the predicted tags to UD tags. Defaults to False.
+        feature_cache_size: int, optional
+            Number of words whose features are kept in a least recently used cache. Only positional and context features are computed per position. Defaults to 65536.
+        """
         self.model_name = model
-        self.model = TaggerWrapper(pickle.load(open(self.models_directory + self.models[model][0], 'rb')),
-                                   self.models[model][1])
+        self.model = TaggerWrapper(get_resource(model), self.models[model][1])
         self.force_ud = force_ud
+        self.feature_cache_size = feature_cache_size
+        self._cached_word_features = lru_cache(maxsize=feature_cache_size)(self._word_features)
+        self._pool = None
+        self._pool_processes = None
 
     def tag(self, sentence):
         input_sentence = sentence
         if not isinstance(sentence, Sentence):
             input_sentence = Sentence(0, len(sentence), sentence)
         reformed_sentence = [token.get() for token in input_sentence.tokens[1:-1]]
-        features = [self._extract_features(reformed_sentence, idx) for idx in range(len(reformed_sentence))]
-        tags = self.model.predict(features)
+        tags = self.model.predict(self._sentence_features(reformed_sentence))
+        self._set_tags(input_sentence, tags)
+        return input_sentence
+
+    def tag_many(self, sentences, processes=1, chunksize=256):
+        """
+        Tags many sentences at once. Features are extracted for the whole batch, which then goes through the model batch prediction.
+        Parameters
+        ----------
+        sentences: iterable of Sentence or str
+            The sentences to be tagged.
+        processes: int, optional
+            Number of worker processes used for feature extraction and prediction. Each worker loads the model once, when the pool is started.
+            The pool is reused by later calls with the same number of processes, until close is called. Defaults to 1 (no workers).
+        chunksize: int, optional
+            Number of sentences sent to a worker at a time. Defaults to 256.
+        Returns
+        -------
+        list of Sentence: the tagged sentences, in the same order as the input.
+        """
+        input_sentences = [sentence if isinstance(sentence, Sentence) else Sentence(0, len(sentence), sentence)
+                           for sentence in sentences]
+        reformed_sentences = [[token.get() for token in sentence.tokens[1:-1]] for sentence in input_sentences]
+        if processes > 1:
+            tags_per_sentence = self._worker_pool(processes).map(_predict_tags, reformed_sentences, chunksize)
+        else:
+            tags_per_sentence = self.model.predict_many(
+                [self._sentence_features(reformed_sentence) for reformed_sentence in reformed_sentences])
+        for input_sentence, tags in zip(input_sentences, tags_per_sentence):
+            self._set_tags(input_sentence, tags)
+        return input_sentences
+
+    def _worker_pool(self, processes):
+        if self._pool is not None and self._pool_processes != processes:
+            self.close()
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(processes, initializer=_init_tag_worker, initargs=(self.model_name,))
+            self._pool_processes = processes
+        return self._pool
+
+    def close(self):
+        """
+        Stops the worker processes started by tag_many, if any.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._pool_processes = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _sentence_features(self, reformed_sentence):
+        return [self._extract_features(reformed_sentence, idx) for idx in range(len(reformed_sentence))]
+
+    def _set_tags(self, input_sentence, tags):
         if self.force_ud and "ud" not in self.model_name:
             tags = [self._penn_to_ud(tag) for tag in tags]
         for token_idx in range(1, len(input_sentence.tokens) - 1):
             input_sentence.tokens[token_idx].PoS = tags[token_idx - 1]
-        return input_sentence
 
-    @staticmethod
-    def _extract_features(sentence, index):
-        return {
-            'word': sentence[index],
-            'is_first': index == 0,
-            'is_last': index == len(sentence) - 1,
-            'is_capitalized': sentence[index][0].upper() == sentence[index][0],
-            'is_all_caps': sentence[index].upper() == sentence[index],
-            'is_all_lower': sentence[index].lower() == sentence[index],
-            'is_alphanumeric': int(bool((re.match('^(?=.*[0-9]$)(?=.*[a-zA-Z])', sentence[index])))),
-            'prefix-1': sentence[index][0],
-            'prefix-2': sentence[index][:2],
-            'prefix-3': sentence[index][:3],
-            'prefix-4': sentence[index][:4],
-            'suffix-1': sentence[index][-1],
-            'suffix-2': sentence[index][-2:],
-            'suffix-3': sentence[index][-3:],
-            'suffix-4': sentence[index][-4:],
-            'prev_word': '' if index == 0 else sentence[index - 1],
-            'next_word': '' if index < len(sentence) else sentence[index + 1],
-            'has_hyphen': '-' in sentence[index],
-            'is_numeric': sentence[index].isdigit(),
-            'capitals_inside': sentence[index][1:].lower() != sentence[index][1:]
-        }
+    def feature_cache_info(self):
+        """
+        Returns the hits, misses, maxsize and currsize statistics of the word feature cache.
+        """
+        return self._cached_word_features.cache_info()
+
+    def clear_feature_cache(self):
+        self._cached_word_features.cache_clear()
+
+    def __getstate__(self):
+        # The feature cache wraps a bound method and worker pools cannot be pickled. The cache is rebuilt empty on unpickling.
+        state = dict(self.__dict__)
+        del state['_cached_word_features']
+        state['_pool'] = None
+        state['_pool_processes'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cached_word_features = lru_cache(maxsize=self.feature_cache_size)(self._word_features)
+
+    def _extract_features(self, sentence, index):
+        # The cached word features are shared, so they are copied into the features of the position.
+        features = dict(self._cached_word_features(sentence[index]))
+        features['is_first'] = index == 0
+        features['is_last'] = index == len(sentence) - 1
+        features['prev_word'] = '' if index == 0 else sentence[index - 1]
+        features['next_word'] = '' if index < len(sentence) else sentence[index + 1]
+        return features
 
     @staticmethod
-    def _penn_to_ud(tag):
-        """Simple function mapping penn treebank tags to UD tags. Imply in data loss. UD is more human readable.
-        Source: https://universaldependencies.org/tagset-conversion/en-penn-uposf.html
+    def _word_features(word):
         """
-        if tag in ["NN", "NNS"]:
-            return "NOUN"
-        elif tag in ["NNP", "NNPS"]:
-            return "PROPN"
-        elif "JJ" in tag or tag == "AFX":
-            return "ADJ"
-        elif tag in ["#", "$", "SYM"]:
-            return "SYM"
-        elif tag in "\",-LRB--RRB-.:\'\'" or tag == "HYPH":
-            return "PUNCT"
-        elif tag == "CC":
-            return "CCONJ"
-        elif tag == "CD":
-            return "NUM"
-        elif tag in ["EX", "PRP", "WP"]:
-            return "PRON"
-        elif tag in ["FW", "LS", "NIL"]:
-            return "X"
-        elif tag in ["IN", "RP"]:
-            return "ADP"
-        elif tag in ["DT", "PDT", "PRP$", "WDT", "WP$"]:
-            return "DET"
-        elif tag in ["POS", "TO"]:
-            return "PART"
-        elif "RB" in tag or tag == "WBR":
-            return "ADV"
-        elif tag == "UH":
-            return "INTJ"
-        elif "VB" in tag or tag == "MD":
-            return "VERB"
-        else:
-            return "X"
+        Features that only depend on the word itself, as a read-only mapping, since it is cached and shared.
+        """
+        return MappingProxyType({
+            'word': word,
+            'is_capitalized': word[0].upper() == word[0],
+            'is_all_caps': word.upper() == word,
+            'is_all_lower': word.lower() == word,
+            'is_alphanumeric': int(bool((_alphanumeric.match(word)))),
+            'prefix-1': word[0],
+            'prefix-2': word[:2],
+            'prefix-3': word[:3],
+            'prefix-4': word[:4],
+            'suffix-1': word[-1],
+            'suffix-2': word[-2:],
+            'suffix-3': word[-3:],
+            'suffix-4': word[-4:],
+            'has_hyphen': '-' in word,
+            'is_numeric': word.isdigit(),
+            'capitals_inside': word[1:].lower() != word[1:]
+        })
+
+    _penn_to_ud = staticmethod(penn_to_ud)
 
 
 class TaggerWrapper:
@@ -108,3 +178,19 @@ class TaggerWrapper:
     def predict(self, feature_list):
         if self.type == "sklearn":
             return self.tagger.predict_single(feature_list)
+
+    def predict_many(self, feature_lists):
+        if self.type == "sklearn":
+            return self.tagger.predict(feature_lists)
+
+
+_worker_tagger = None
+
+
+def _init_tag_worker(model_name):
+    global _worker_tagger
+    _worker_tagger = MLTagger(model_name)
+
+
+def _predict_tags(reformed_sentence):
+    return _worker_tagger.model.predict(_worker_tagger._sentence_features(reformed_sentence))
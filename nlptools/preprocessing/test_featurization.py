@@ -3,6 +3,8 @@ from ..core.structures import Document, Sentence
 import os
 from pathlib import Path
 from .featurization import *
+from ..utils.data_structures import CSRMatrix
+import zlib
 
 EXAMPLE_DOCUMENT="This is an example document made out of many sentences. This is the second sentence. This is the third sentence. Finally, another sentence with another another is. Very good to have some interesting sentences, isn't it? Adding another sentence can be tedious, but it is necessary. And, finally, another one! Should I continue? Maybe it is important that I keep adding sentences for testing. Good that you feel it amazing!"
 
@@ -80,3 +82,193 @@ def test_load_file():
     sentence = "This is good, actually, it is amazing! Please, give me more!"
     array = tfidf.transform(Sentence(0, len(sentence), sentence))
     assert array.shape == (len(tfidf.word_indexes),)
+
+def test_bow_sparse():
+    document = Document(EXAMPLE_DOCUMENT)
+    bow = Bow()
+    dense = bow.fit_transform(document)
+    sparse = bow.transform(document, sparse=True)
+    assert isinstance(sparse, CSRMatrix)
+    assert sparse.shape == dense.shape
+    assert sparse.nnz == np.count_nonzero(dense)
+    assert (sparse.todense() == dense).all()
+    sentence = "This is another sentence used to test the bow vectorizer."
+    assert (bow.transform(sentence, sparse=True).toarray()[0] == bow.transform(sentence)).all()
+
+def test_tf_idf_sparse():
+    document = Document(EXAMPLE_DOCUMENT)
+    tfidf = Tfidf(lower_case = True)
+    dense = tfidf.fit_transform(document)
+    sparse = tfidf.fit_transform(document, sparse=True)
+    assert (sparse.toarray() == dense).all()
+    assert tfidf.explain(sparse, summary=True) == tfidf.explain(np.asarray(dense), summary=True)
+
+def test_csr_matrix():
+    matrix = CSRMatrix.from_rows([{2: 1.0, 0: 3.0}, {}, {1: 2.0}], 4)
+    assert list(matrix.indptr) == [0, 2, 2, 3]
+    assert list(matrix.indices) == [0, 2, 1]
+    assert (matrix.toarray() == np.array([[3, 0, 1, 0], [0, 0, 0, 0], [0, 2, 0, 0]])).all()
+    raises(ValueError, CSRMatrix, [1.0], [0], [0, 0], (1, 2))
+
+def test_tf_idf_values():
+    tfidf = Tfidf()
+    matrix = tfidf.fit_transform(["b a a", "a c", "c ."])
+    assert tfidf.word_indexes == {"b": 0, "a": 1, "c": 2}
+    assert tfidf.idf_dict == {"b": math.log(4 / 2), "a": math.log(4 / 3), "c": math.log(4 / 3)}
+    expected = np.array([[math.log(2) / 3, 2 * math.log(4 / 3) / 3, 0], [0, math.log(4 / 3) / 2, math.log(4 / 3) / 2], [0, 0, math.log(4 / 3)]])
+    assert np.allclose(matrix, expected)
+    # Out of vocabulary words count in the sentence length.
+    assert np.allclose(tfidf.transform("a zebra"), [0, math.log(4 / 3) / 2, 0])
+
+def test_sentence_word_counts():
+    ids = np.array([0, 1, 1, 1, 2, -1, 2])
+    indptr = np.array([0, 3, 5, 7])
+    rows, columns, counts = sentence_word_counts(ids, indptr, 3)
+    assert list(rows) == [0, 0, 1, 1, 2]
+    assert list(columns) == [0, 1, 1, 2, 2]
+    assert list(counts) == [1, 2, 1, 1, 1]
+
+def test_bow_partial_fit():
+    bow = Bow()
+    bow.fit(["a b", "b c"])
+    assert bow.word_indexes == {"a": 0, "b": 1, "c": 2}
+    bow.partial_fit(["d a", "e"])
+    assert bow.word_indexes == {"a": 0, "b": 1, "c": 2, "d": 3, "e": 4}
+    assert (bow.transform("a d d") == [1, 0, 0, 2, 0]).all()
+    bow.fit(["z"])
+    assert bow.word_indexes == {"z": 0}
+
+def test_tf_idf_partial_fit():
+    first = ["the cat sat", "the dog"]
+    second = ["a new cat", "the bird", "dog dog"]
+    incremental = Tfidf()
+    incremental.fit(first)
+    indexes = dict(incremental.word_indexes)
+    idf_before = incremental.idf_dict["cat"]
+    incremental.partial_fit(second)
+    full = Tfidf()
+    full.fit(first + second)
+    for word, index in indexes.items():
+        assert incremental.word_indexes[word] == index
+    assert incremental.word_indexes == full.word_indexes
+    assert incremental.num_documents == 5
+    assert incremental.idf_dict == full.idf_dict
+    assert incremental.idf_dict["cat"] != idf_before
+    assert (incremental.transform(first + second) == full.transform(first + second)).all()
+
+def test_tf_idf_partial_fit_from_old_save(tmpdir):
+    file = str(tmpdir.join("old_tfidf.p"))
+    tfidf = Tfidf()
+    tfidf.fit(["the cat sat", "the dog"])
+    # Featurizers saved by older versions only kept the idf scores.
+    old_state = {'ignore_tokens': tfidf.ignore_tokens, 'lower_case': False, 'word_indexes': tfidf.word_indexes,
+                 'index_to_word': tfidf.index_to_word, 'idf_dict': tfidf.idf_dict, 'num_documents': 2}
+    with open(file, 'wb') as f:
+        pickle.dump(old_state, f)
+    loaded = Tfidf()
+    loaded.load_from_file(file)
+    assert (loaded.transform("the cat") == tfidf.transform("the cat")).all()
+    loaded.partial_fit(["a cat"])
+    tfidf.partial_fit(["a cat"])
+    assert loaded.idf_dict == tfidf.idf_dict
+
+def test_hashing_bow():
+    bow = HashingBow(n_features=64)
+    matrix = bow.transform(["the cat", "the the dog"], sparse=True)
+    assert matrix.shape == (2, 64)
+    assert matrix.toarray().sum(axis=1).tolist() == [2, 3]
+    the = zlib.crc32("the".encode('utf-8')) % 64
+    assert matrix.toarray()[1, the] >= 2
+    assert (bow.transform("the cat", sparse=False) == matrix.toarray()[0]).all()
+    # Stateless: a fresh featurizer gives the same features.
+    assert (HashingBow(n_features=64).transform(["the cat", "the the dog"], sparse=False) == matrix.todense()).all()
+    assert (bow.transform(["the cat", "the the dog"]).toarray() == matrix.toarray()).all()
+    raises(TypeError, bow.transform, {'dict': 'fake'})
+    raises(AttributeError, HashingBow, n_features=0)
+
+def test_hashing_ngrams():
+    bow = HashingBow(n_features=2**20, ngram_range=(1, 2))
+    assert bow.transform("a b c", sparse=True).nnz == 5
+    bow = HashingBow(n_features=2**20, ngram_range=(2, 3))
+    assert bow.transform("a b c", sparse=True).nnz == 3
+
+def test_hashing_stream():
+    sentences = ["sentence number {}".format(i) for i in range(10)]
+    bow = HashingBow(n_features=128, batch_size=4)
+    batches = list(bow.transform_batches(iter(sentences)))
+    assert [batch.shape[0] for batch in batches] == [4, 4, 2]
+    assert (np.vstack([batch.toarray() for batch in batches]) == bow.transform(sentences, sparse=False)).all()
+    assert (bow.transform(iter(sentences), sparse=False) == bow.transform(sentences, sparse=False)).all()
+
+def test_hashing_tf_idf():
+    data = ["b a a", "a c", "c ."]
+    hashing = HashingTfidf(n_features=2**16, batch_size=2)
+    raises(AttributeError, hashing.transform, data)
+    tfidf = Tfidf()
+    expected = np.asarray(tfidf.fit_transform(data))
+    matrix = hashing.fit_transform(iter(data))
+    columns = [zlib.crc32(word.encode('utf-8')) % 2**16 for word in ["b", "a", "c"]]
+    assert np.allclose(matrix.toarray()[:, columns], expected)
+    assert hashing.num_documents == 3
+    # fit_transform reads the data in batches, fitting all of them before weighting any row.
+    assert np.allclose(HashingTfidf(n_features=2**16, batch_size=1).fit_transform(data, sparse=False)[:, columns], expected)
+    assert HashingTfidf(n_features=2**16).fit_transform(iter([])).shape == (0, 2**16)
+    hashing.fit(iter(data))
+    assert hashing.num_documents == 3
+    assert np.allclose(hashing.transform(data, sparse=False)[:, columns], expected)
+    hashing.partial_fit(["d"])
+    assert hashing.num_documents == 4
+
+def _clustered_sentences():
+    animals = "cat dog horse cow sheep goat pig mouse".split()
+    tools = "hammer saw drill wrench screwdriver pliers chisel file".split()
+    rng = np.random.RandomState(0)
+    sentences = [list(rng.choice(animals if i % 2 else tools, 8)) for i in range(2000)]
+    return sentences, animals
+
+def test_word2vec_skip_gram():
+    sentences, animals = _clustered_sentences()
+    word2vec = Word2VecTransformer(vector_size=16, window=3, subsample=0)
+    word2vec.fit(sentences)
+    assert word2vec.vectors.shape == (16, 16)
+    assert all(word in animals for word, similarity in word2vec.most_similar("cat", 5))
+    matrix = word2vec.transform([" ".join(sentence) for sentence in sentences[:3]])
+    assert matrix.shape == (3, 16)
+    assert np.allclose(word2vec.transform("cat dog"), (word2vec.vectors[word2vec.word_indexes["cat"]] + word2vec.vectors[word2vec.word_indexes["dog"]]) / 2)
+    assert (word2vec.transform("unknown words") == 0).all()
+    raises(AttributeError, word2vec.transform, "cat", True)
+
+def test_word2vec_cbow_workers():
+    sentences, animals = _clustered_sentences()
+    word2vec = Word2VecTransformer(vector_size=16, window=3, subsample=0, skip_gram=False, batch_size=64, workers=2)
+    word2vec.fit(sentences)
+    assert all(word in animals for word, similarity in word2vec.most_similar("cat", 5))
+
+def _failing_training(*args):
+    raise ValueError("Training failure")
+
+def test_word2vec_workers_failure(monkeypatch):
+    from . import featurization
+    monkeypatch.setattr(featurization, "_train_sgns", _failing_training)
+    sentences, animals = _clustered_sentences()
+    word2vec = Word2VecTransformer(vector_size=16, window=3, subsample=0, epochs=1, workers=2)
+    with raises(RuntimeError, match="shard"):
+        word2vec.fit(sentences)
+
+def test_word2vec_min_count():
+    word2vec = Word2VecTransformer(vector_size=8, min_count=2, epochs=1)
+    word2vec.fit(["a b a", "c b d"])
+    assert word2vec.word_indexes == {"a": 0, "b": 1}
+    assert list(word2vec.word_counts) == [2, 2]
+    assert word2vec.transform(Document("a c. b d.")).shape == (2, 8)
+
+def test_word2vec_save_load(tmpdir):
+    file = str(tmpdir.join("word2vec"))
+    word2vec = Word2VecTransformer(vector_size=8, epochs=1)
+    word2vec.fit(Document(EXAMPLE_DOCUMENT))
+    word2vec.save_to_file(file)
+    loaded = Word2VecTransformer()
+    loaded.load_from_file(file + ".p")
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.word_indexes == word2vec.word_indexes
+    assert (loaded.transform("This is good") == word2vec.transform("This is good")).all()
@@ -1,5 +1,9 @@
+import pickle
+
 import pytest
-from .lemmatization import DictionaryLemmatizer
+from ..core.structures import Document, Sentence
+from .lemmatization import DictionaryLemmatizer, build_lemma_table, lemma_table_key
+from ..utils.data_structures import MappedStringTable
 
 def test_dictionary_lemmatizer_basic():
     lemmatizer = DictionaryLemmatizer()
@@ -77,3 +81,48 @@ def test_dictionary_lemmatizer_noun():
     pos = "NOUN"
     result = "cat"
     assert lemmatizer.lemmatize(word, pos) == result
+
+def test_mapped_dictionary_lemmatizer():
+    lemmatizer = DictionaryLemmatizer()
+    mapped_lemmatizer = DictionaryLemmatizer(mapped=True)
+    cases = [("living", "VERB"), ("", ""), ("", "NOUN"), ("Butterfly", ""), ("Butterfly", "DOG"), (3, "NUM"), (3, 9),
+             ("purchases", "verb"), (None, "verb"), ("this is a multiword string", "NOUN"), ("cats", "NOUN"), ("better", "ADJ")]
+    for word, pos in cases:
+        assert mapped_lemmatizer.lemmatize(word, pos) == lemmatizer.lemmatize(word, pos)
+
+def test_mapped_table_matches_dictionary():
+    lemmatizer = DictionaryLemmatizer()
+    table = DictionaryLemmatizer(mapped=True).lemma_table
+    assert len(table) == sum(len(lemmas) for lemmas in lemmatizer.lemma_dict.values())
+    for word in list(lemmatizer.lemma_dict)[::97]:
+        for pos, lemma in lemmatizer.lemma_dict[word].items():
+            assert table[lemma_table_key(word, pos)] == lemma
+
+def test_build_lemma_table(tmpdir):
+    dict_path = str(tmpdir.join("lemmas.p"))
+    table_path = str(tmpdir.join("lemmas.bin"))
+    with open(dict_path, 'wb') as f:
+        pickle.dump({"geese": {"NOUN": "goose"}, "ran": {"VERB": "run"}, "été": {"VERB": "être", "NOUN": "été"}}, f)
+    build_lemma_table(dict_path, table_path)
+    table = MappedStringTable(table_path)
+    assert len(table) == 4
+    assert table[lemma_table_key("geese", "NOUN")] == "goose"
+    assert table.get(lemma_table_key("été", "VERB")) == "être"
+    assert lemma_table_key("ran", "NOUN") not in table
+    assert table.get("missing", "default") == "default"
+    table.close()
+
+def test_lemmatize_sentence_and_document():
+    lemmatizer = DictionaryLemmatizer()
+    text = "The cars are running"
+    sentence = Sentence(0, len(text), text)
+    for token, tag in zip(sentence.tokens[1:-1], ["DT", "NNS", "VBP", "VBG"]):
+        token.PoS = tag
+    lemmatizer.lemmatize_sentence(sentence)
+    assert [token.lemma for token in sentence.tokens[1:-1]] == ["the", "car", "are", "run"]
+    document = Document("Cats sleep. Cats run.", compact=True)
+    for sentence in document.sentences:
+        for token, tag in zip(sentence.tokens[1:-1], ["NOUN", "VERB", "PUNCT"]):
+            token.PoS = tag
+    lemmatizer.lemmatize_document(document)
+    assert [token.lemma for token in document[1].tokens[1:-1]] == ["cat", "run", "."]
@@ -1,6 +1,8 @@
 import pytest
 from pytest import raises
 import os, sys
+import pickle
+import warnings
 
 from .normalization import *
 from ..core.structures import Document, Sentence, untokenize
@@ -14,6 +16,77 @@ def test_spell_correction():
         tokenized = tokenize(cases[case_num])
         assert untokenize(spell_correction(tokenized))==expected[case_num]
 
+def test_batch_spell_correction():
+    corrector = BatchSpellCorrector(cache_size=16)
+    token_lists = [tokenize(case) for case in ['i ate a bsnana', 'Bsnana and bsnana', 'my friind 42 !']]
+    corrector.correct_token_lists(token_lists)
+    assert [untokenize(tokens) for tokens in token_lists] == ['i ate a banana', 'Banana and banana', 'my friend 42!']
+    assert corrector.cache_info().currsize == 3
+    corrector.correct_token_lists([tokenize('bsnana friind')])
+    assert corrector.cache_info().hits == 2
+
+def test_batch_spell_correction_pool():
+    words = ["bsnana", "friind", "goood"]
+    with BatchSpellCorrector(processes=2, chunksize=1) as corrector:
+        assert corrector.correct_words(words) == {"bsnana": "banana", "friind": "friend", "goood": "good"}
+        pool = corrector._pool
+        assert pool is not None
+        corrector.clear_cache()
+        corrector.correct_words(words)
+        assert corrector._pool is pool
+    assert corrector._pool is None
+
+def test_normalize_strings():
+    normalizer = Normalizer()
+    cases = ["Thiis is a normalized  sentence.", "Yaaaaaay!!!!!", None]
+    expected = ["This is a normalized sentence.", "Yay!", ""]
+    assert normalizer.normalize_strings(cases) == expected
+    assert [normalizer.normalize_string(case) for case in cases] == expected
+    assert normalizer.normalize_strings(["\t\t", "   ", "//t"]) == ["", "", ""]
+
+def test_fused_pre_tokenization_steps():
+    cases = ["", "a  b\t\t//tc", "!!!??,,;; ....", "  x\n\n\r\ry  ", "///t//t\t.", None]
+    for steps in [['simplify_punctuation', 'normalize_whitespace'], ['normalize_whitespace', 'simplify_punctuation'], ['normalize_whitespace']]:
+        fused = FusedSubstitution(steps)
+        for case in cases:
+            expected = case
+            for step in steps:
+                expected = Normalizer.pre_tokenization_functions[step](expected)
+            assert fused(case) == expected
+
+def test_compiled_normalizer():
+    cases = ["Thiis is a normalized  sentence. Yaaaaaay!!!!!", "I'm sure you've seen it,, y'all'd've known...", "Isn't  it his thiing??",
+             "this is really bad of course", "\t\t", "//t", "   ", "this is", "a \t\t \n //t "]
+    for post_tokenization_steps in [['normalize_contractions', 'spell_correction'], ['normalize_contractions', 'remove_stopwords'],
+                                    ['remove_stopwords', 'normalize_contractions'], ['spell_correction']]:
+        normalizer = Normalizer(post_tokenization_steps=post_tokenization_steps)
+        compiled_normalizer = Normalizer(post_tokenization_steps=post_tokenization_steps, compiled=True)
+        assert compiled_normalizer.normalize_strings(cases) == [normalizer.normalize_string(case) for case in cases]
+
+def test_batch_normalize_contractions():
+    token_lists = batch_normalize_contractions([tokenize("I'm here"), tokenize("no contraction")])
+    assert [token.get() for token in token_lists[0]] == ['<SOS>', 'I', 'am', 'here', '<EOS>']
+    assert [(token.start_pos, token.end_pos) for token in token_lists[0][1:3]] == [(0, 3), (0, 3)]
+    assert token_lists[0][1].next_token is token_lists[0][2] and token_lists[0][3].previous_token is token_lists[0][2]
+    assert untokenize(token_lists[1]) == "no contraction"
+
+def test_symspell_cache(tmpdir):
+    spellchecker = load_symspell(cache_directory=str(tmpdir))
+    cache_files = tmpdir.listdir()
+    assert len(cache_files) == 1 and cache_files[0].basename.startswith("symspell_")
+    assert len(spellchecker.bigrams) > 0
+    cached_spellchecker = load_symspell(cache_directory=str(tmpdir))
+    assert cached_spellchecker.words == spellchecker.words
+    assert cached_spellchecker.bigrams == spellchecker.bigrams
+    assert cached_spellchecker.lookup("bsnana", Verbosity.TOP, 2)[0].term == "banana"
+    # Truncated, corrupt and incompatible caches are rebuilt.
+    for damaged in [b"", b"not a pickle", pickle.dumps([1, 2])]:
+        cache_files[0].write_binary(damaged)
+        with pytest.warns(UserWarning):
+            rebuilt_spellchecker = load_symspell(cache_directory=str(tmpdir))
+        assert rebuilt_spellchecker.words == spellchecker.words
+        assert load_symspell(cache_directory=str(tmpdir)).words == spellchecker.words
+
 """ This test takes too long
 def test_spell_correction_no_spaces():
     normalizer = Normalizer()
@@ -69,6 +142,48 @@ def test_document_normalization():
     document = normalizer.normalize_document(document)
     assert document.raw == expected_raw
 
+def test_aligned_document_normalization():
+    normalizer = Normalizer()
+    doc_string = "Thiis is  a test!!!! I'm here. Good."
+    document, alignment = normalizer.normalize_document(Document(doc_string), alignment=True)
+    assert document.raw == normalizer.normalize_document(Document(doc_string)).raw == "This is a test! I am here. Good."
+    assert document.sentences == ["This is a test!", "I am here.", "Good."]
+    assert [token.get() for token in document[1].tokens] == ['<SOS>', 'I', 'am', 'here', '.', '<EOS>']
+    assert document[1][2].start_pos == 2 and document[1][2].next_token is document[1][3]
+    for start, end, original_start, original_end in alignment:
+        assert document.raw[start:end] in ("This", "!", "I", "am") or document.raw[start:end] == doc_string[original_start:original_end]
+    assert alignment.to_original(0, 4) == (0, 5)
+    assert alignment.to_original(14) == (16, 20)
+    assert alignment.to_original(16, 20) == (21, 24)
+    assert alignment.to_original(27, 31) == (31, 35)
+
+def test_aligned_document_normalization_whitespace_sentence():
+    normalizer = Normalizer()
+    doc_string = "a \t\t \n //t "
+    document, alignment = normalizer.normalize_document(Document(doc_string), alignment=True)
+    assert document.raw == normalizer.normalize_document(Document(doc_string)).raw == "a\n"
+    assert document.sentences == ["a\n"]
+    assert list(alignment) == [(0, 1, 0, 1), (1, 2, 5, 6)]
+
+def test_aligned_document_normalization_leading_stopword():
+    normalizer = Normalizer(post_tokenization_steps=['remove_stopwords'])
+    doc_string = "the cat sat on the mat."
+    document, alignment = normalizer.normalize_document(Document(doc_string), alignment=True)
+    assert document.raw == normalizer.normalize_document(Document(doc_string)).raw == "cat sat mat."
+    assert [(token.get(), token.start_pos, token.end_pos) for token in document[0].tokens] == \
+           [('<SOS>', 0, 0), ('cat', 0, 3), ('sat', 4, 7), ('mat', 8, 11), ('.', 11, 12), ('<EOS>', 12, 12)]
+    assert list(alignment) == [(0, 3, 4, 7), (4, 7, 8, 11), (8, 11, 19, 22), (11, 12, 22, 23)]
+
+def test_aligned_document_normalization_file():
+    normalizer = Normalizer(post_tokenization_steps=['normalize_contractions', 'spell_correction', 'remove_stopwords'])
+    doc_string = open(test_case_folder+"test_normalize_document_file.txt").read()
+    document, alignment = normalizer.normalize_document(Document(doc_string), alignment=True)
+    reparsed = Document(normalizer.normalize_document(Document(doc_string)).raw)
+    assert document.raw == reparsed.raw
+    assert [[(token.get(), token.start_pos, token.end_pos) for token in sentence.tokens] for sentence in document.sentences] == \
+           [[(token.get(), token.start_pos, token.end_pos) for token in sentence.tokens] for sentence in reparsed.sentences]
+    assert len(alignment) > 0
+
 def test_wrong_document_normalization():
     normalizer = Normalizer()
     doc_string = "Thiis is a not nnormalised string that will become a document. This is the aecond sentence   of the document."
@@ -93,3 +208,22 @@ def test_raw_document_normalization():
     case = normalizer.normalize_raw_document(test_case_folder+"test_normalize_document_file.txt")
     expected = open(test_case_folder+"test_normalize_document_expected.txt").read()
     assert case == expected
+
+def test_normalize_files(tmpdir):
+    normalizer = Normalizer()
+    input_directory = tmpdir.mkdir("input")
+    test_case = open(test_case_folder+"test_normalize_document_file.txt").read()
+    input_directory.join("first.txt").write(test_case)
+    input_directory.mkdir("nested").join("second.txt").write("Thiis is a sentence.  Yaaaaaay!!!!!\n")
+    input_directory.join("ignored.csv").write("a,b")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = [normalizer.normalize_raw_document(str(input_directory.join("first.txt"))),
+                    normalizer.normalize_raw_document(str(input_directory.join("nested", "second.txt")))]
+    for processes in [1, 2]:
+        output_directory = tmpdir.join("output{}".format(processes))
+        summary = normalizer.normalize_files(str(input_directory), str(output_directory), processes=processes, max_in_flight=1,
+                                             batch_size=2, show_progress=False)
+        assert summary['files'] == 2
+        assert [output_directory.join("first.txt").read(), output_directory.join("nested", "second.txt").read()] == expected
+        assert not output_directory.join("ignored.csv").exists()
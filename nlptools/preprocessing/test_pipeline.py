@@ -0,0 +1,38 @@
+import pytest
+from pytest import raises
+
+from .pipeline import BatchPipeline
+from .tagging import MLTagger
+
+TEXTS = ["The cars are running. They aren't stopping!", "Cats sleep all day.", "The children played outside. It was fun."]
+
+def test_batch_pipeline_single_process():
+    pipeline = BatchPipeline(post_tokenization_steps=['normalize_contractions'], processes=1)
+    documents = list(pipeline.process(TEXTS))
+    assert len(documents) == 3
+    assert documents[0].raw == "The cars are running. They are not stopping!"
+    tokens = documents[0][0].tokens
+    assert tokens[2] == 'cars'
+    assert tokens[2].PoS == 'NNS'
+    assert tokens[2].lemma == 'car'
+    assert tokens[0].lemma is None
+
+def test_batch_pipeline_multiprocess():
+    pipeline = BatchPipeline(post_tokenization_steps=['normalize_contractions'], processes=2, chunksize=1)
+    expected = list(BatchPipeline(post_tokenization_steps=['normalize_contractions'], processes=1).process(TEXTS))
+    documents = list(pipeline.process(TEXTS))
+    assert [document.raw for document in documents] == [document.raw for document in expected]
+    for document, expected_document in zip(documents, expected):
+        for sentence, expected_sentence in zip(document.sentences, expected_document.sentences):
+            assert [(token.PoS, token.lemma) for token in sentence.tokens] == [(token.PoS, token.lemma) for token in expected_sentence.tokens]
+    assert documents[0][1].previous_sentence == documents[0][0]
+
+def test_batch_pipeline_chunk_tagging():
+    tagger = MLTagger()
+    pipeline = BatchPipeline(normalize=False, lemmatize=False, processes=1, chunksize=2)
+    for document in pipeline.process(TEXTS):
+        for sentence in document.sentences:
+            assert [token.PoS for token in sentence.tokens] == [token.PoS for token in tagger.tag(sentence.get()).tokens]
+
+def test_batch_pipeline_lemmatize_without_tag():
+    raises(AttributeError, BatchPipeline, tag=False)
@@ -1,6 +1,9 @@
+import pickle
+
 import pytest
 
 from .stemming import PorterStemmer
+from ..core.structures import Document, Token
 
 def test_porterstemmer():
     stemmer = PorterStemmer()
@@ -19,3 +22,34 @@ def test_porterstemmer():
 
     for word, stem in cases:
         assert stemmer.stem(word) == stem
+
+def test_porterstemmer_measure():
+    stemmer = PorterStemmer()
+    cases = [('tr', 0), ('ee', 0), ('tree', 0), ('y', 0), ('by', 0), ('trouble', 1), ('oats', 1), ('trees', 1), ('ivy', 1),
+             ('troubles', 2), ('private', 2), ('oaten', 2)]
+    for word, m in cases:
+        assert stemmer._det_m(word) == m
+
+def test_porterstemmer_cache():
+    stemmer = PorterStemmer(cache_size=2)
+    assert stemmer.stem("Running") == stemmer.stem(Token(0, 7, "Running")) == "run"
+    assert stemmer.cache_info().hits == 1
+    stemmer.clear_cache()
+    assert stemmer.cache_info().currsize == 0
+
+def test_stem_sentence_and_document():
+    stemmer = PorterStemmer()
+    sentence = stemmer.stem_sentence("Cats and cats were running")
+    assert [token.stem for token in sentence.tokens[1:-1]] == ["cat", "and", "cat", "were", "run"]
+    assert sentence.tokens[0].stem is None
+    document = stemmer.stem_document(Document("The ponies ran. Ponies are running.", compact=True))
+    assert [token.stem for token in document[1].tokens[1:-1]] == ["poni", "are", "run", "."]
+    assert stemmer.cache_info().currsize == len(set(["Cats", "and", "cats", "were", "running", "The", "ponies", "ran", ".", "Ponies", "are"]))
+
+def test_porterstemmer_pickle():
+    stemmer = PorterStemmer(cache_size=4)
+    assert stemmer.stem("running") == "run"
+    restored = pickle.loads(pickle.dumps(stemmer))
+    assert restored.cache_info().maxsize == 4 and restored.cache_info().currsize == 0
+    assert restored.stem("running") == "run"
+
@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from .tagging import MLTagger
@@ -27,3 +29,44 @@ def test_ud_crf():
     tagged_sentence = tagger.tag(sentence2)
     for token_idx in range(1,len(tagged_sentence)-1):
         assert tagged_sentence.tokens[token_idx].PoS != None
+
+def test_tag_many():
+    tagger = MLTagger()
+    sentences = ["This is a sentence with a total of 11 words.", "This expects at least 7 tags.", "Cats sleep."]
+    expected = [[token.PoS for token in tagger.tag(sentence).tokens] for sentence in sentences]
+    tagged = tagger.tag_many(sentences)
+    assert [[token.PoS for token in sentence.tokens] for sentence in tagged] == expected
+    with tagger:
+        tagged = tagger.tag_many(sentences, processes=2, chunksize=1)
+        assert [[token.PoS for token in sentence.tokens] for sentence in tagged] == expected
+        pool = tagger._pool
+        tagged = tagger.tag_many(sentences, processes=2, chunksize=1)
+        assert [[token.PoS for token in sentence.tokens] for sentence in tagged] == expected
+        assert tagger._pool is pool
+    assert tagger._pool is None
+
+def test_tag_many_ud():
+    tagger = MLTagger(force_ud=True)
+    tagged = tagger.tag_many(["The cars are running."])
+    assert tagged[0].tokens[2].PoS == "NOUN"
+
+def test_feature_cache():
+    tagger = MLTagger(feature_cache_size=2)
+    sentence = "the cat and the dog"
+    tagger.tag(sentence)
+    info = tagger.feature_cache_info()
+    assert info.maxsize == 2
+    assert info.currsize == 2
+    assert info.hits + info.misses == 5
+    features = tagger._extract_features(["the", "cat"], 1)
+    assert features['word'] == 'cat' and features['prev_word'] == 'the' and features['is_last']
+    assert tagger._extract_features(["cat", "the"], 0)['is_first']
+
+def test_tagger_pickle():
+    tagger = MLTagger(feature_cache_size=8)
+    sentence = "This is a sentence with a total of 11 words."
+    tagger.tag(sentence)
+    restored = pickle.loads(pickle.dumps(tagger))
+    assert restored.feature_cache_info().maxsize == 8 and restored.feature_cache_info().currsize == 0
+    assert [token.PoS for token in restored.tag(sentence).tokens] == [token.PoS for token in tagger.tag(sentence).tokens]
+
@@ -1,4 +1,9 @@
-from collections import defaultdict
+import mmap
+import struct
+from array import array
+from collections import OrderedDict, defaultdict, namedtuple
+
+import numpy as np
 
 class TrieNode:
 
@@ -63,3 +68,297 @@ class Trie:
                 new_prefix = word+root.children[children].char
                 words = words + self.findall(new_prefix)
         return words
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUCache:
+    """
+    A dictionary holding at most maxsize items, which drops the least recently used item when full. Unlike functools.lru_cache, it can be
+    filled with values computed elsewhere, for example in batches. Its statistics follow functools.lru_cache.
+    """
+
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """
+        Returns the value of key, marking it as recently used, or default if the key is not cached. Counts a hit or a miss.
+        """
+        try:
+            self._items.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return self._items[key]
+
+    def __setitem__(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._items))
+
+    def clear(self):
+        self._items.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class MappedStringTable:
+    """
+    A read-only string to string table stored in a compact binary file, which is memory-mapped and queried with a binary search, without
+    deserializing it. Processes mapping the same file share its memory pages.
+    File layout (integers are little-endian uint32):
+        magic (8 bytes) | count | key offsets (count+1) | value offsets (count+1) | keys blob | values blob
+    Keys are sorted by their utf-8 bytes.
+    """
+
+    magic = b'NLPSST01'
+    _header = struct.Struct('<8sI')
+    _offset = struct.Struct('<I')
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = self._header.unpack_from(self._map, 0)
+        if magic != self.magic:
+            raise ValueError("{} is not a string table file.".format(path))
+        self._key_offsets = self._header.size
+        self._value_offsets = self._key_offsets + 4 * (self.count + 1)
+        self._keys = self._value_offsets + 4 * (self.count + 1)
+        self._values = self._keys + self._offset_at(self._key_offsets, self.count)
+
+    @classmethod
+    def write(cls, items, path):
+        """
+        Writes a table file from an iterable of (key, value) string pairs. Keys must be unique.
+        """
+        encoded = sorted((key.encode('utf-8'), value.encode('utf-8')) for key, value in items)
+        key_offsets = [0]
+        value_offsets = [0]
+        for key, value in encoded:
+            key_offsets.append(key_offsets[-1] + len(key))
+            value_offsets.append(value_offsets[-1] + len(value))
+        with open(path, 'wb') as f:
+            f.write(cls._header.pack(cls.magic, len(encoded)))
+            f.write(struct.pack('<{}I'.format(len(key_offsets)), *key_offsets))
+            f.write(struct.pack('<{}I'.format(len(value_offsets)), *value_offsets))
+            f.write(b''.join(key for key, value in encoded))
+            f.write(b''.join(value for key, value in encoded))
+
+    def get(self, key, default=None):
+        encoded = key.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._key(low) == encoded:
+            start = self._offset_at(self._value_offsets, low)
+            end = self._offset_at(self._value_offsets, low + 1)
+            return self._map[self._values + start:self._values + end].decode('utf-8')
+        return default
+
+    def close(self):
+        self._map.close()
+
+    def _key(self, index):
+        start = self._offset_at(self._key_offsets, index)
+        end = self._offset_at(self._key_offsets, index + 1)
+        return self._map[self._keys + start:self._keys + end]
+
+    def _offset_at(self, table_position, index):
+        return self._offset.unpack_from(self._map, table_position + 4 * index)[0]
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __len__(self):
+        return self.count
+
+
+class DeleteIndex:
+    """
+    A symmetric delete index over a list of words. Every single character deletion of every word is stored as a 64-bit polynomial hash, in
+    sorted NumPy arrays along with the word and the deleted position, so the words one insertion or one substitution away from a string
+    are found with binary searches instead of generating every edit. Building the index for a few hundred thousand words takes well under a
+    second and tens of megabytes.
+    Attributes
+    ----------
+    words: list of str
+        The indexed words, sorted.
+    """
+
+    _base = np.uint64(1000003)
+
+    def __init__(self, words):
+        self.words = sorted(set(words))
+        hashes, word_ids, positions = [], [], []
+        for length, indices, codes in _codes_by_length(self.words):
+            prefixes = _prefix_hashes(codes)
+            powers = self._base ** np.arange(length, dtype=np.uint64)
+            for position in range(length):
+                hashes.append(_deletion_hash(prefixes, codes, position, powers))
+                word_ids.append(indices)
+                positions.append(np.full(len(indices), position, dtype=np.int32))
+        if hashes:
+            hashes = np.concatenate(hashes)
+            order = np.argsort(hashes)
+            self._hashes = hashes[order]
+            self._word_ids = np.concatenate(word_ids).astype(np.int32)[order]
+            self._positions = np.concatenate(positions)[order]
+        else:
+            self._hashes = np.zeros(0, dtype=np.uint64)
+            self._word_ids = np.zeros(0, dtype=np.int32)
+            self._positions = np.zeros(0, dtype=np.int32)
+
+    def lookup(self, keys):
+        """
+        Finds the words one insertion away from each key. Returns a list of (key index, word, position) triples, one for each word such that
+        deleting its character at position gives keys[key index].
+        Parameters
+        ----------
+        keys: list of str
+            The strings to look up.
+        """
+        keys = list(keys)
+        if not keys or not len(self._hashes):
+            return []
+        hashes = np.zeros(len(keys), dtype=np.uint64)
+        for length, indices, codes in _codes_by_length(keys):
+            hashes[indices] = _prefix_hashes(codes)[:, length]
+        starts = np.searchsorted(self._hashes, hashes)
+        found = self._hashes[np.minimum(starts, len(self._hashes) - 1)] == hashes
+        matches = []
+        for key_index, entry in zip(np.nonzero(found)[0].tolist(), starts[found].tolist()):
+            key = keys[key_index]
+            while entry < len(self._hashes) and self._hashes[entry] == hashes[key_index]:
+                word = self.words[self._word_ids[entry]]
+                position = int(self._positions[entry])
+                # Hashes may collide, so every match is checked.
+                if word[:position] + word[position + 1:] == key:
+                    matches.append((key_index, word, position))
+                entry += 1
+        return matches
+
+    def __len__(self):
+        return len(self.words)
+
+
+def _codes_by_length(strings):
+    """
+    Groups strings by length, yielding (length, indices, codes) where codes is a (strings, length) uint64 matrix of code points.
+    """
+    groups = {}
+    for index, string in enumerate(strings):
+        groups.setdefault(len(string), []).append(index)
+    for length, indices in groups.items():
+        codes = np.frombuffer(''.join(strings[index] for index in indices).encode('utf-32-le'), dtype=np.uint32)
+        yield length, np.array(indices, dtype=np.int64), codes.reshape(len(indices), length).astype(np.uint64)
+
+
+def _prefix_hashes(codes):
+    """
+    The polynomial hash of every prefix of every row of codes. Column j holds the hash of the first j characters. Arithmetic wraps modulo 2**64.
+    """
+    prefixes = np.zeros((codes.shape[0], codes.shape[1] + 1), dtype=np.uint64)
+    for column in range(codes.shape[1]):
+        prefixes[:, column + 1] = prefixes[:, column] * DeleteIndex._base + codes[:, column]
+    return prefixes
+
+
+def _deletion_hash(prefixes, codes, position, powers):
+    """
+    The hash of every row of codes with the character at position deleted, computed from the prefix hashes.
+    """
+    length = codes.shape[1]
+    removed = prefixes[:, position] * (DeleteIndex._base - np.uint64(1)) + codes[:, position]
+    return prefixes[:, length] - removed * powers[length - 1 - position]
+
+
+class CSRMatrix:
+    """
+    A minimal Compressed Sparse Row matrix, with the same layout as scipy.sparse.csr_matrix. Row i holds the values data[indptr[i]:indptr[i+1]]
+    at the columns indices[indptr[i]:indptr[i+1]].
+    Attributes
+    ----------
+    data: numpy.ndarray of float
+        The stored values.
+    indices: numpy.ndarray of int
+        The column of each stored value. Sorted within each row.
+    indptr: numpy.ndarray of int
+        Where each row starts in data and indices. Has one entry per row, plus one.
+    shape: tuple of int
+        The (rows, columns) shape of the matrix.
+    """
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=np.float64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = (int(shape[0]), int(shape[1]))
+        if len(self.indptr) != self.shape[0] + 1 or len(self.data) != len(self.indices) or self.indptr[-1] != len(self.data):
+            raise ValueError("Inconsistent CSR arrays for a matrix of shape {}.".format(self.shape))
+
+    @classmethod
+    def from_rows(cls, rows, n_columns):
+        """
+        Builds a matrix from an iterable of rows, without a dense intermediate. Each row is a dict of column index to value.
+        """
+        data = array('d')
+        indices = array('i')
+        indptr = array('q', [0])
+        for row in rows:
+            for column in sorted(row):
+                indices.append(column)
+                data.append(row[column])
+            indptr.append(len(indices))
+        return cls(data, indices, indptr, (len(indptr) - 1, n_columns))
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def toarray(self):
+        dense = np.zeros(self.shape)
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        dense[rows, self.indices] = self.data
+        return dense
+
+    def todense(self):
+        return np.matrix(self.toarray())
+
+    def to_scipy(self):
+        """
+        Converts the matrix to a scipy.sparse.csr_matrix. Requires SciPy.
+        """
+        try:
+            from scipy.sparse import csr_matrix
+        except ImportError:
+            raise ImportError("SciPy is needed to convert to a scipy.sparse matrix. Please, install it with 'pip install scipy'.")
+        return csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+
+    def __len__(self):
+        return self.shape[0]
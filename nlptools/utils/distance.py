@@ -0,0 +1,169 @@
+_word_size = 64
+
+
+def levenshtein(word1, word2, max_distance=None):
+    """
+    The Levenshtein distance between two strings: the minimum number of character insertions, deletions and substitutions turning one into
+    the other. Uses myers_distance, or banded_distance when max_distance is given and the strings are longer than a machine word.
+    Parameters
+    ----------
+    word1: str
+        First string to be compared.
+    word2: str
+        Second string to be compared.
+    max_distance: int, optional
+        If given, the computation stops as soon as the distance is known to exceed it, and max_distance + 1 is returned instead.
+    """
+    if len(word1) < len(word2):
+        word1, word2 = word2, word1
+    if max_distance is not None and len(word1) > _word_size:
+        return banded_distance(word1, word2, max_distance)
+    return myers_distance(word1, word2, max_distance)
+
+
+def myers_distance(pattern, text, max_distance=None):
+    """
+    The Levenshtein distance between two strings, with Myers' bit-parallel algorithm (in Hyyro's formulation for edit distance). Each column
+    of the dynamic programming table is packed into the bits of an integer, so the cost is linear in the length of the text while the pattern
+    fits in a machine word. Python integers are unbounded, so longer patterns work too, only slower.
+    Parameters
+    ----------
+    pattern: str
+        First string to be compared. Its characters are turned into bit masks.
+    text: str
+        Second string to be compared. The algorithm does one step per character of the text.
+    max_distance: int, optional
+        If given, the computation stops as soon as the distance is known to exceed it, and max_distance + 1 is returned instead.
+    """
+    return _myers(_pattern_masks(pattern), len(pattern), text, max_distance)
+
+
+def banded_distance(word1, word2, max_distance):
+    """
+    The Levenshtein distance between two strings, computing only the cells of the dynamic programming table within max_distance of the
+    diagonal. Takes O(max_distance * length) time.
+    Parameters
+    ----------
+    word1: str
+        First string to be compared.
+    word2: str
+        Second string to be compared.
+    max_distance: int
+        The largest distance of interest. If the distance exceeds it, max_distance + 1 is returned.
+    """
+    if len(word1) > len(word2):
+        word1, word2 = word2, word1
+    short_length, long_length = len(word1), len(word2)
+    cutoff = max_distance + 1
+    if long_length - short_length > max_distance:
+        return cutoff
+    if short_length == 0:
+        return long_length
+    width = 2 * max_distance + 1
+    # Position t of a row i holds the cell of column j = i + t - max_distance.
+    previous = [column if 0 <= column <= long_length else cutoff for column in range(-max_distance, max_distance + 1)]
+    for row in range(1, short_length + 1):
+        character = word1[row - 1]
+        current = [cutoff] * width
+        row_minimum = cutoff
+        for position in range(width):
+            column = row + position - max_distance
+            if column < 0 or column > long_length:
+                continue
+            if column == 0:
+                value = row
+            else:
+                value = previous[position] + (character != word2[column - 1])
+                if position + 1 < width and previous[position + 1] + 1 < value:
+                    value = previous[position + 1] + 1
+                if position > 0 and current[position - 1] + 1 < value:
+                    value = current[position - 1] + 1
+                if value > cutoff:
+                    value = cutoff
+            current[position] = value
+            if value < row_minimum:
+                row_minimum = value
+        if row_minimum > max_distance:
+            return cutoff
+        previous = current
+    return previous[long_length - short_length + max_distance]
+
+
+def distances(query, candidates, max_distance=None):
+    """
+    The Levenshtein distances between a query and many candidates. The query is preprocessed once for all of them.
+    Returns a list of int, in the order of candidates. With max_distance, candidates further away than it get max_distance + 1.
+    Parameters
+    ----------
+    query: str
+        The string every candidate is compared to.
+    candidates: iterable of str
+        The strings to be compared with the query.
+    max_distance: int, optional
+        If given, each computation stops as soon as the distance is known to exceed it.
+    """
+    masks = _pattern_masks(query)
+    banded = max_distance is not None and len(query) > _word_size
+    return [banded_distance(query, candidate, max_distance) if banded else _myers(masks, len(query), candidate, max_distance)
+            for candidate in candidates]
+
+
+def nearest(query, candidates, max_distance):
+    """
+    The candidates within max_distance of the query, as a list of (candidate, distance) pairs sorted by distance, then candidate.
+    Parameters
+    ----------
+    query: str
+        The string every candidate is compared to.
+    candidates: iterable of str
+        The strings to be compared with the query.
+    max_distance: int
+        The largest distance of the returned candidates.
+    """
+    candidates = list(candidates)
+    return sorted(((candidate, distance) for candidate, distance in zip(candidates, distances(query, candidates, max_distance))
+                   if distance <= max_distance), key=lambda pair: (pair[1], pair[0]))
+
+
+def _pattern_masks(pattern):
+    """
+    Maps each character of the pattern to the bit mask of its positions.
+    """
+    masks = {}
+    bit = 1
+    for character in pattern:
+        masks[character] = masks.get(character, 0) | bit
+        bit <<= 1
+    return masks
+
+
+def _myers(masks, pattern_length, text, max_distance):
+    if max_distance is not None and abs(pattern_length - len(text)) > max_distance:
+        return max_distance + 1
+    if pattern_length == 0:
+        return len(text)
+    # Vertical positive and negative deltas of the current column, one bit per pattern character.
+    all_ones = (1 << pattern_length) - 1
+    last = 1 << (pattern_length - 1)
+    positive, negative = all_ones, 0
+    score = pattern_length
+    remaining = len(text)
+    for character in text:
+        equal = masks.get(character, 0)
+        vertical = equal | negative
+        horizontal = (((equal & positive) + positive) ^ positive) | equal
+        horizontal_positive = negative | ~(horizontal | positive)
+        horizontal_negative = positive & horizontal
+        if horizontal_positive & last:
+            score += 1
+        elif horizontal_negative & last:
+            score -= 1
+        remaining -= 1
+        # The score can drop by at most one per remaining character.
+        if max_distance is not None and score - remaining > max_distance:
+            return max_distance + 1
+        horizontal_positive = (horizontal_positive << 1) | 1
+        horizontal_negative <<= 1
+        positive = (horizontal_negative | ~(vertical | horizontal_positive)) & all_ones
+        negative = horizontal_positive & vertical & all_ones
+    return score
@@ -0,0 +1,74 @@
+class WordSet:
+    """
+    A read-only set of words, such as a stopword list, with hashed membership tests. Lexicons are loaded once through the resource registry
+    and shared, see resources.get_resource.
+    """
+
+    def __init__(self, words):
+        """
+        Parameters
+        ----------
+        words: iterable of str
+            The words of the lexicon.
+        """
+        self._words = frozenset(words)
+
+    def find(self, words):
+        """
+        Tests many words at once. Returns a list of boolean, True for the words in the lexicon.
+        """
+        lexicon_words = self._words
+        return [word in lexicon_words for word in words]
+
+    def __contains__(self, word):
+        return word in self._words
+
+    def __iter__(self):
+        return iter(self._words)
+
+    def __len__(self):
+        return len(self._words)
+
+
+class WordMap:
+    """
+    A read-only mapping of words to replacement phrases, such as contractions to their expansions. Lookups are hashed and case-insensitive,
+    and replacements are split into words in advance. A word starting with an uppercase letter gets a replacement starting with one too.
+    Lexicons are loaded once through the resource registry and shared, see resources.get_resource.
+    """
+
+    def __init__(self, mapping):
+        """
+        Parameters
+        ----------
+        mapping: dict of str
+            The lexicon, mapping each word to its replacement phrase.
+        """
+        self._replacements = {}
+        self._capitalized_replacements = {}
+        for word, replacement in mapping.items():
+            self._replacements[word.lower()] = tuple(replacement.split())
+            self._capitalized_replacements[word.lower()] = tuple((replacement[0].upper() + replacement[1:]).split())
+
+    def get(self, word, default=None):
+        """
+        Returns the replacement of a word as a tuple of words, or default if the word is not in the lexicon.
+        """
+        key = word.lower()
+        if key not in self._replacements:
+            return default
+        if word[0].isupper():
+            return self._capitalized_replacements[key]
+        return self._replacements[key]
+
+    def find(self, words):
+        """
+        Looks up many words at once. Returns a list with the replacement of each word, or None for the words not in the lexicon.
+        """
+        return [self.get(word) for word in words]
+
+    def __contains__(self, word):
+        return word.lower() in self._replacements
+
+    def __len__(self):
+        return len(self._replacements)
@@ -0,0 +1,154 @@
+import json
+import os
+import pickle
+import threading
+
+from .data_structures import DeleteIndex, MappedStringTable
+from .lexicons import WordMap, WordSet
+
+preloaded_directory = os.path.join(os.path.dirname(__file__), "../preloaded/")
+
+
+class ResourceRegistry:
+    """
+    A central registry for the resources under nlptools/preloaded. Each resource is loaded lazily, the first time it is requested, and the
+    loaded object is shared by every instance and thread that requests it afterwards. Resources can also be explicitly preloaded and unloaded.
+    Shared resources should be treated as read-only.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._resources = {}
+        self._locks = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name, loader):
+        """
+        Registers a resource.
+        Parameters
+        ----------
+        name: str
+            The resource name.
+        loader: function
+            A function with no arguments that loads and returns the resource.
+        """
+        with self._registry_lock:
+            self._loaders[name] = loader
+            self._locks[name] = threading.Lock()
+            self._resources.pop(name, None)
+
+    def get(self, name):
+        """
+        Returns a resource, loading it if it is not loaded yet.
+        Exceptions
+        ----------
+        KeyError
+            If no resource is registered with that name.
+        """
+        try:
+            return self._resources[name]
+        except KeyError:
+            pass
+        if name not in self._loaders:
+            raise KeyError("Unknown resource '{}'. Available resources are: {}.".format(name, ", ".join(self.names())))
+        with self._locks[name]:
+            # Another thread may have loaded it while this one was waiting.
+            if name not in self._resources:
+                self._resources[name] = self._loaders[name]()
+            return self._resources[name]
+
+    def preload(self, *names):
+        """
+        Loads the given resources (or every registered resource if no name is given) ahead of their first use.
+        """
+        for name in names or self.names():
+            self.get(name)
+
+    def unload(self, *names):
+        """
+        Drops the given resources (or every loaded resource if no name is given) from the registry. They are loaded again on next use.
+        Objects that still hold a reference to a resource keep it alive.
+        """
+        for name in names or list(self._resources):
+            self._resources.pop(name, None)
+
+    def is_loaded(self, name):
+        return name in self._resources
+
+    def names(self):
+        return sorted(self._loaders)
+
+
+def _pickle_loader(relative_path):
+    def load():
+        with open(os.path.join(preloaded_directory, relative_path), 'rb') as f:
+            return pickle.load(f)
+    return load
+
+
+def _string_table_loader(relative_path):
+    def load():
+        return MappedStringTable(os.path.join(preloaded_directory, relative_path))
+    return load
+
+
+def _json_loader(relative_path):
+    def load():
+        with open(os.path.join(preloaded_directory, relative_path), 'r') as f:
+            return json.load(f)
+    return load
+
+
+def _delete_index_loader(word_list):
+    def load():
+        return DeleteIndex(registry.get(word_list))
+    return load
+
+
+def _lexicon_loader(lexicon_class, resource):
+    def load():
+        return lexicon_class(registry.get(resource))
+    return load
+
+
+def _word_list_loader(relative_path):
+    def load():
+        with open(os.path.join(preloaded_directory, relative_path), 'r') as f:
+            return frozenset(line.rstrip('\r\n') for line in f)
+    return load
+
+
+registry = ResourceRegistry()
+registry.register('penn_crf', _pickle_loader("models/pos_tagging/penn_treebank_crf_postagger.sav"))
+registry.register('ud_crf', _pickle_loader("models/pos_tagging/ud_crf_postagger.sav"))
+registry.register('word_lemma_dict', _pickle_loader("dictionaries/lemmas/word_lemma_dict.p"))
+registry.register('word_lemma_table', _string_table_loader("dictionaries/lemmas/word_lemma_table.bin"))
+registry.register('irregular_noun_dict', _pickle_loader("dictionaries/lemmas/irregular_noun_dict.p"))
+registry.register('english_contractions', _json_loader("dictionaries/contractions/english_contractions.json"))
+registry.register('english_numerals', _json_loader("dictionaries/numerals/enlgish_numerals.json"))
+registry.register('english_stopwords', _word_list_loader("lists/words/english_stopwords.txt"))
+registry.register('english_contractions_lexicon', _lexicon_loader(WordMap, 'english_contractions'))
+registry.register('english_stopwords_lexicon', _lexicon_loader(WordSet, 'english_stopwords'))
+registry.register('words_alpha', _word_list_loader("lists/words/words_alpha.txt"))
+registry.register('words_alpha_delete_index', _delete_index_loader('words_alpha'))
+
+
+def get_resource(name):
+    """
+    Returns a shared preloaded resource, loading it on first use. See registry.names() for the available resources.
+    """
+    return registry.get(name)
+
+
+def preload(*names):
+    """
+    Loads the given resources (or all of them) ahead of their first use. Useful before forking worker processes.
+    """
+    registry.preload(*names)
+
+
+def unload(*names):
+    """
+    Drops the given resources (or all of them) from memory. They are loaded again on next use.
+    """
+    registry.unload(*names)
@@ -0,0 +1,50 @@
+ud_tags = frozenset(['ADJ', 'ADP', 'ADV', 'AUX', 'CCONJ', 'DET', 'INTJ', 'NOUN', 'NUM', 'PART', 'PRON', 'PROPN', 'PUNCT', 'SCONJ', 'SYM',
+                     'VERB', 'X'])
+
+
+def penn_to_ud(tag):
+    """
+    Simple function mapping penn treebank tags to UD tags. Imply in data loss. UD is more human readable.
+    Source: https://universaldependencies.org/tagset-conversion/en-penn-uposf.html
+    """
+    if tag in ["NN", "NNS"]:
+        return "NOUN"
+    elif tag in ["NNP", "NNPS"]:
+        return "PROPN"
+    elif "JJ" in tag or tag == "AFX":
+        return "ADJ"
+    elif tag in ["#", "$", "SYM"]:
+        return "SYM"
+    elif tag in "\",-LRB--RRB-.:\'\'" or tag == "HYPH":
+        return "PUNCT"
+    elif tag == "CC":
+        return "CCONJ"
+    elif tag == "CD":
+        return "NUM"
+    elif tag in ["EX", "PRP", "WP"]:
+        return "PRON"
+    elif tag in ["FW", "LS", "NIL"]:
+        return "X"
+    elif tag in ["IN", "RP"]:
+        return "ADP"
+    elif tag in ["DT", "PDT", "PRP$", "WDT", "WP$"]:
+        return "DET"
+    elif tag in ["POS", "TO"]:
+        return "PART"
+    elif "RB" in tag or tag == "WBR":
+        return "ADV"
+    elif tag == "UH":
+        return "INTJ"
+    elif "VB" in tag or tag == "MD":
+        return "VERB"
+    else:
+        return "X"
+
+
+def to_ud(tag):
+    """
+    Returns a UD tag, converting Penn Treebank tags. UD tags and None are returned as they are.
+    """
+    if tag is None or str(tag).upper() in ud_tags:
+        return tag
+    return penn_to_ud(tag)
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from .distance import banded_distance, distances, levenshtein, myers_distance, nearest
+
+def _reference_distance(word1, word2):
+    previous = list(range(len(word2) + 1))
+    for i, character1 in enumerate(word1, 1):
+        current = [i]
+        for j, character2 in enumerate(word2, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (character1 != character2)))
+        previous = current
+    return previous[-1]
+
+def test_levenshtein():
+    cases = [('cat', 'cats'), ('zip', 'zipper'), ('a', 'a'), ('kitten', 'sitting'), ('', 'abc'), ('', '')]
+    expected = [1, 3, 0, 3, 3, 0]
+    for idx in range(len(cases)):
+        assert levenshtein(*cases[idx]) == expected[idx]
+        assert myers_distance(*cases[idx]) == expected[idx]
+        assert myers_distance(*reversed(cases[idx])) == expected[idx]
+
+def test_distances_match_reference():
+    rng = random.Random(0)
+    for _ in range(500):
+        word1 = ''.join(rng.choice('abcd') for _ in range(rng.randrange(0, 80 if rng.random() < 0.2 else 10)))
+        word2 = ''.join(rng.choice('abcd') for _ in range(rng.randrange(0, 80 if rng.random() < 0.2 else 10)))
+        expected = _reference_distance(word1, word2)
+        assert levenshtein(word1, word2) == expected
+        for max_distance in range(4):
+            capped = min(expected, max_distance + 1)
+            assert banded_distance(word1, word2, max_distance) == capped
+            assert myers_distance(word1, word2, max_distance) == capped
+            assert levenshtein(word1, word2, max_distance) == capped
+
+def test_max_distance():
+    assert levenshtein('kitten', 'sitting', 2) == 3
+    assert levenshtein('kitten', 'sitting', 3) == 3
+    assert banded_distance('a' * 100, 'b' * 100, 5) == 6
+    assert levenshtein('a' * 100, 'a' * 99 + 'b', 1) == 1
+
+def test_batch_distances():
+    candidates = ['sitting', 'kitchen', 'mitten', 'kitten', 'bitten', 'written']
+    assert distances('kitten', candidates) == [_reference_distance('kitten', candidate) for candidate in candidates]
+    assert distances('kitten', candidates, 1) == [2, 2, 1, 0, 1, 2]
+    assert nearest('kitten', candidates, 1) == [('kitten', 0), ('bitten', 1), ('mitten', 1)]
+    assert distances('kitten', []) == []
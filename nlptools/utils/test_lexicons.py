@@ -0,0 +1,35 @@
+from ..core.structures import tokenize
+from ..preprocessing.normalization import batch_remove_stopwords, remove_stopwords
+from .lexicons import WordMap, WordSet
+from .resources import get_resource
+
+def test_word_set():
+    stopwords = WordSet(["the", "a", "of"])
+    assert "the" in stopwords and "The" not in stopwords
+    assert stopwords.find(["the", "cat", "of"]) == [True, False, True]
+    assert len(stopwords) == 3
+
+def test_word_map():
+    contractions = WordMap({"i'm": "I am", "isn't": "is not", "o'clock": "of the clock"})
+    assert contractions.get("isn't") == ("is", "not")
+    assert contractions.get("Isn't") == ("Is", "not")
+    assert contractions.get("I'M") == ("I", "am")
+    assert contractions.get("o'clock") == ("of", "the", "clock")
+    assert contractions.get("cat") is None
+    assert contractions.find(["i'm", "here"]) == [("I", "am"), None]
+    assert "ISN'T" in contractions
+
+def test_shared_lexicons():
+    assert get_resource('english_contractions_lexicon') is get_resource('english_contractions_lexicon')
+    assert get_resource('english_contractions_lexicon').get("ain't") == ("are", "not")
+    assert "this" in get_resource('english_stopwords_lexicon')
+
+def test_stopword_removal_lexicon():
+    stopwords = get_resource('english_stopwords_lexicon')
+    assert [token.get() for token in remove_stopwords(tokenize("This cat is on the mat."))] == \
+           ['<SOS>', 'This', 'cat', '', '', '', 'mat', '.', '<EOS>']
+    sentences = ["The end", "A dog barks at a cat"]
+    token_lists = [tokenize(sentence) for sentence in sentences]
+    expected = [["" if token.get() in stopwords else token.get() for token in token_list[1:-1]] for token_list in token_lists]
+    assert batch_remove_stopwords(token_lists) is token_lists
+    assert [[token.get() for token in token_list[1:-1]] for token_list in token_lists] == expected == [['The', 'end'], ['A', 'dog', 'barks', '', '', 'cat']]
@@ -0,0 +1,43 @@
+import threading
+
+import pytest
+from pytest import raises
+
+from .resources import ResourceRegistry, get_resource, registry
+from ..preprocessing.lemmatization import DictionaryLemmatizer
+from ..preprocessing.tagging import MLTagger
+
+def test_registry_lazy_loading():
+    calls = []
+    test_registry = ResourceRegistry()
+    test_registry.register('resource', lambda: calls.append(1) or {'loaded': True})
+    assert not test_registry.is_loaded('resource')
+    assert test_registry.get('resource') is test_registry.get('resource')
+    assert len(calls) == 1
+    test_registry.unload('resource')
+    assert not test_registry.is_loaded('resource')
+    test_registry.preload()
+    assert test_registry.is_loaded('resource')
+    assert len(calls) == 2
+
+def test_registry_threads():
+    calls = []
+    test_registry = ResourceRegistry()
+    test_registry.register('resource', lambda: calls.append(1) or object())
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(test_registry.get('resource'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+def test_registry_unknown_resource():
+    raises(KeyError, get_resource, 'unknown_resource')
+
+def test_preloaded_resources_are_shared():
+    assert MLTagger().model.tagger is MLTagger().model.tagger
+    assert DictionaryLemmatizer().lemma_dict is DictionaryLemmatizer().lemma_dict
+    assert 'the' in get_resource('english_stopwords')
+    assert set(registry.names()) >= {'penn_crf', 'ud_crf', 'word_lemma_dict', 'irregular_noun_dict', 'words_alpha'}
@@ -0,0 +1,14 @@
+import pytest
+
+from .tagsets import penn_to_ud, to_ud, ud_tags
+
+def test_penn_to_ud():
+    cases = ["NNS", "NNP", "JJR", "VBG", "DT", "UH", "CD", "."]
+    expected = ["NOUN", "PROPN", "ADJ", "VERB", "DET", "INTJ", "NUM", "PUNCT"]
+    assert [penn_to_ud(tag) for tag in cases] == expected
+    assert all(penn_to_ud(tag) in ud_tags for tag in cases)
+
+def test_to_ud():
+    assert to_ud("NNS") == "NOUN"
+    assert to_ud("NOUN") == "NOUN"
+    assert to_ud(None) is None
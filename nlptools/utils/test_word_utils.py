@@ -1,5 +1,8 @@
+import pickle
+
 import pytest
 
+from .data_structures import DeleteIndex, LRUCache
 from .word_utils import inflect_noun_singular, levenshtein_distance, SimpleSpellCorrector
 
 def test_inflect_noun_simple():
@@ -84,3 +87,48 @@ def test_simple_spell_checker():
     for case in cases:
         assert sc.correct(case[0]) == case[1]
 """
+
+def test_delete_index():
+    index = DeleteIndex(['hello', 'help', 'hallo', 'a'])
+    keys = ['helo', 'hllo', '', 'xyz']
+    matches = sorted((keys[key_index], word, position) for key_index, word, position in index.lookup(keys))
+    assert matches == [('', 'a', 0), ('helo', 'hello', 2), ('helo', 'hello', 3), ('hllo', 'hallo', 1), ('hllo', 'hello', 1)]
+    assert DeleteIndex([]).lookup(['a']) == []
+    long_word = 'a' * 150 + 'b' + 'a' * 50
+    assert DeleteIndex([long_word]).lookup(['a' * 200]) == [(0, long_word, 150)]
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1
+    cache['c'] = 3
+    assert 'b' not in cache and 'a' in cache and 'c' in cache
+    assert cache.get('b') is None
+    assert cache.cache_info() == (1, 1, 2, 2)
+    cache.clear()
+    assert len(cache) == 0
+
+def test_spell_corrector_two_edits_away():
+    sc = SimpleSpellCorrector()
+    for word in ['bonanaz', 'thoughtfullnes', 'recieveing']:
+        edits = sc._generate_candidates_1_away(word)
+        expected = set(e2 for e1 in edits for e2 in sc._generate_candidates_1_away(e1) if e2 in sc.words)
+        assert sc._existing_2_away(edits) == expected
+
+def test_spell_corrector_cache():
+    sc = SimpleSpellCorrector(cache_size=2)
+    cases = [('cat', 'cat'), ('bonana', 'banana'), ('killz', 'kills'), ('bonanaz', 'bonanza')]
+    for case in cases:
+        assert sc.correct(case[0]) == case[1]
+    assert sc.correct('bonanaz') == 'bonanza'
+    assert sc.cache_info().hits == 1
+    assert sc.cache_info().currsize == 2
+
+def test_spell_corrector_pickle():
+    sc = SimpleSpellCorrector(cache_size=2)
+    assert sc.correct('bonana') == 'banana'
+    restored = pickle.loads(pickle.dumps(sc))
+    assert restored.cache_info().maxsize == 2 and restored.cache_info().currsize == 0
+    assert restored.correct('bonana') == 'banana'
+
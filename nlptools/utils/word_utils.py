@@ -1,7 +1,9 @@
-import pickle, os, sys
-import numpy as np
+import os, sys
+from functools import lru_cache
 
+from .distance import distances, levenshtein
 from .functions import sigmoid
+from .resources import get_resource
 
 
 dict_directory = os.path.join(os.path.dirname(__file__),
@@ -9,7 +11,7 @@ dict_directory = os.path.join(os.path.dirname(__file__),
 words_list_directory = os.path.join(os.path.dirname(__file__), "../preloaded/lists/words/words_alpha.txt")
 
 def inflect_noun_singular(word):
-    irregular_dict = pickle.load(open(dict_directory,'rb'))
+    irregular_dict = get_resource('irregular_noun_dict')
     consonants = "bcdfghjklmnpqrstwxyz"
     vowels = "aeiou"
     word = str(word).lower()
@@ -40,46 +42,19 @@ def inflect_noun_singular(word):
             return word[:-1]
     return word
 
-def levenshtein_distance(word1, word2):
-    """Calculates the difference between two words character-wise. May be slow due to O(m*n) complexity.
-    Source: https://stackabuse.com/levenshtein-distance-and-text-similarity-in-python/
+def levenshtein_distance(word1, word2, max_distance=None):
+    """Calculates the difference between two words character-wise, with the bit-parallel algorithm of distance.levenshtein.
     Parameters:
     ----------
     word1: str,
         first word to be compared
     word2: str,
         second word to be compared
+    max_distance: int, optional
+        If given, the computation stops as soon as the distance is known to exceed it, and max_distance + 1 is returned instead.
     """
 
-    word1 = str(word1)
-    word2 = str(word2)
-    #Create matrix with word-sizes+1 - this allows for comparisons to be made between words.
-    comparison_matrix = np.zeros(shape=(len(word1)+1,len(word2)+1))
-    #Fill the matrix with a 0-m/0-n list of values where m and n are the size of the words.
-    comparison_matrix[:,0] = [m for m in range(len(word1)+1)]
-    comparison_matrix[0,:] = [n for n in range(len(word2)+1)]
-    #Now we iterate over all letters in the words. Line by line, column by column.
-    for x in range(1, len(word1)+1):
-        for y in range(1, len(word2)+1):
-            #Compare both characters at current header position.
-            #If they are equal, get the minimum between left, top, and diagonal neighbors. Top and left means a move, so we add 1.
-            if word1[x-1] == word2[y-1]:
-                up = comparison_matrix[x-1][y]+1
-                upper_diag = comparison_matrix[x-1][y-1]
-                left = comparison_matrix[x, y-1]+1
-                minimum = min(up, upper_diag, left)
-                #Assign the minimum value to the position.
-                comparison_matrix[x][y] = minimum
-                #If they are different, get the minimum between left, top and diagonal adding 1 to every possibility.
-            else:
-                up = comparison_matrix[x-1][y]+1
-                upper_diag = comparison_matrix[x-1][y-1]+1
-                left = comparison_matrix[x, y-1]+1
-                minimum = min(up, upper_diag, left)
-                #Assign the minimum value to the position.
-                comparison_matrix[x][y] = minimum
-    #Return the last value - it is the sum of accumulated differences.
-    return comparison_matrix[-1,-1]
+    return levenshtein(str(word1), str(word2), max_distance)
 
 class AbstractSpellCorrector:
     def correct():
@@ -90,21 +65,57 @@ class SimpleSpellCorrector(AbstractSpellCorrector):
     A spell corrector based on Peter Novrig spell corrector - with slight modifications and including Levenshtein distance algorithm.
     ###BUG: Does not work very well - logic is poor.
     Inspired by Peter Novrig's algorithm:https://norvig.com/spell-correct.html
+    Known words two edits away are found through a symmetric delete index of the word list (see DeleteIndex), instead of generating every
+    string two edits away. Ties between equally scored candidates are broken alphabetically.
 
     """
 
-    def __init__(self):
-        word_list = open(words_list_directory,'r').readlines()
-        self.words = set(word_list)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+
+    def __init__(self, cache_size=65536):
+        """
+        Parameters
+        ----------
+        cache_size: int, optional
+            Number of words whose corrections are kept in a least recently used cache. Defaults to 65536.
+        """
+        self.words = get_resource('words_alpha')
+        self.cache_size = cache_size
+        self._cached_correct = lru_cache(maxsize=cache_size)(self._correct)
+
+    def __getstate__(self):
+        # The correction cache wraps a bound method, which cannot be pickled. It is rebuilt empty on unpickling.
+        state = dict(self.__dict__)
+        del state['_cached_correct']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cached_correct = lru_cache(maxsize=self.cache_size)(self._correct)
 
     def correct(self, word):
+        return self._cached_correct(word)
+
+    def cache_info(self):
+        """
+        Returns the hits, misses, maxsize and currsize statistics of the correction cache.
+        """
+        return self._cached_correct.cache_info()
+
+    def clear_cache(self):
+        self._cached_correct.cache_clear()
+
+    def _correct(self, word):
         if word in self.words:
             return word
         else:
-            return min(self._candidates(word), key= lambda k: self._word_score(word, k))
+            candidates = list(self._candidates(word))
+            scores = [self._word_score(word, candidate, lev_score) for candidate, lev_score in zip(candidates, distances(word, candidates))]
+            return min(zip(scores, candidates))[1]
 
-    def _word_score(self, word1, word2):
-        lev_score = levenshtein_distance(word1, word2)
+    def _word_score(self, word1, word2, lev_score=None):
+        if lev_score is None:
+            lev_score = levenshtein(word1, word2)
         letters1 = {}
         for letter in word1:
             letters1[letter] = letters1.get(letter, 0)+1
@@ -113,7 +124,6 @@ class SimpleSpellCorrector(AbstractSpellCorrector):
             letters2[letter] = letters2.get(letter, 0)+1
         letter_score = self._dict_compare(letters1, letters2)
         size_dif = abs(len(word1)-len(word2))
-        print(lev_score+letter_score+size_dif, word2)
         return lev_score+letter_score+size_dif
 
     def _dict_compare(self, d1, d2):
@@ -126,13 +136,16 @@ class SimpleSpellCorrector(AbstractSpellCorrector):
         return sigmoid(len(added)*2+len(removed)*2+len(modified))
 
     def _candidates(self, word):
-        return (self._existing([word]) or self._existing(self._generate_candidates_1_away(word)) or self._existing(self._generate_candidates_2_away(word)) or [word])
+        if word in self.words:
+            return {word}
+        edits = self._generate_candidates_1_away(word)
+        return self._existing(edits) or self._existing_2_away(edits) or [word]
 
     def _existing(self, words):
         return set(word for word in words if word in self.words)
 
     def _generate_candidates_1_away(self, word):
-        letters = 'abcdefghijklmnopqrstuvwxyz'
+        letters = self.letters
         splits     = [(word[:i], word[i:])    for i in range(len(word) + 1)]
         deletes    = [L + R[1:]               for L, R in splits if R]
         transposes = [L + R[1] + R[0] + R[2:] for L, R in splits if len(R)>1]
@@ -140,5 +153,29 @@ class SimpleSpellCorrector(AbstractSpellCorrector):
         inserts    = [L + c + R               for L, R in splits for c in letters]
         return set(deletes + transposes + replaces + inserts)
 
-    def _generate_candidates_2_away(self, word):
-        return set(e2 for e1 in self._generate_candidates_1_away(word) for e2 in self._generate_candidates_1_away(e1))
+    def _existing_2_away(self, edits):
+        """
+        The known words one edit away from any of the given edits. Deletions and transpositions of each edit are looked up directly, while
+        insertions and substitutions come from the delete index: a known word is one insertion away from an edit if deleting one of its
+        characters gives the edit, and one substitution away if deleting the same position of both gives the same string.
+        """
+        words = self.words
+        found = set()
+        keys = set()
+        for edit in edits:
+            keys.add((edit, -1))
+            for i in range(len(edit)):
+                delete = edit[:i] + edit[i+1:]
+                keys.add((delete, i))
+                if delete in words:
+                    found.add(delete)
+            for i in range(len(edit) - 1):
+                transpose = edit[:i] + edit[i+1] + edit[i] + edit[i+2:]
+                if transpose in words:
+                    found.add(transpose)
+        keys = list(keys)
+        for key_index, word, word_position in get_resource('words_alpha_delete_index').lookup([key for key, position in keys]):
+            position = keys[key_index][1]
+            if position < 0 or word_position == position:
+                found.add(word)
+        return found
@@ -29,5 +29,6 @@ setup(
     include_package_data=True,
     install_requires=["sklearn-crfsuite", "numpy", "tqdm", "symspellpy"],
     entry_points={
+        "console_scripts": ["nlptools-normalize=nlptools.preprocessing.normalization:main"],
     },
 )